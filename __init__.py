@@ -6,16 +6,20 @@ __version__ = "1.0.0"
 __author__ = "StockAI Engine"
 __description__ = "Indicator-based decision engine for institutional trading"
 
-from .engine.decision import decision_engine
+from .engine.decision import decision_engine, decision_engine_series, decision_engine_panel
 from .backtest.simple_backtest import backtest
 from .backtest.report import summarize
 from .data.fetcher import fetch_eod
-from .indicators.technical import add_indicators
+from .indicators.technical import add_indicators, add_indicators_panel, build_panel
 
 __all__ = [
     "decision_engine",
+    "decision_engine_series",
+    "decision_engine_panel",
     "backtest",
     "summarize",
     "fetch_eod",
-    "add_indicators"
+    "add_indicators",
+    "add_indicators_panel",
+    "build_panel"
 ]
@@ -7,8 +7,6 @@ Date: January 1, 2026
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from pydantic import BaseModel, EmailStr
@@ -20,8 +18,8 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (passlib/bcrypt loaded on first use, not at import)
+_pwd_context = None
 
 # Security
 security = HTTPBearer()
@@ -69,11 +67,14 @@ class TokenData(BaseModel):
 # ===== IN-MEMORY USER STORAGE (Replace with database in production) =====
 
 # Temporary storage - replace with database
+# bcrypt hash of "demo123", precomputed so importing this module does not pay a bcrypt round
+DEMO_PASSWORD_HASH = "$2b$12$tvY9uqVtECDNDHCnir1p4On1BxZ7oXocUFeOLYY4fJfB9jP3rXz.6"
+
 USERS_DB: Dict[str, Dict] = {
     "demo@example.com": {
         "user_id": "demo_user_001",
         "email": "demo@example.com",
-        "hashed_password": pwd_context.hash("demo123"),  # Password: demo123
+        "hashed_password": DEMO_PASSWORD_HASH,  # Password: demo123
         "full_name": "Demo User",
         "is_active": True,
         "is_premium": True,
@@ -87,14 +88,24 @@ ACTIVE_TOKENS: Dict[str, Dict] = {}
 
 # ===== HELPER FUNCTIONS =====
 
+def get_pwd_context():
+    """Shared passlib CryptContext, created on first use"""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash password"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -107,6 +118,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     
     return encoded_jwt
@@ -117,13 +130,16 @@ def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
-    
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_token(token: str) -> Dict:
     """Decode and validate JWT token"""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
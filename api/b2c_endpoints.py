@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from enum import Enum
+import asyncio
 import sys
 from pathlib import Path
 
@@ -20,16 +21,10 @@ parent_dir = str(Path(__file__).parent.parent)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from data.fetcher import fetch_eod
-from data.enhanced_fundamentals import (
-    fetch_fundamental_data,
-    calculate_fundamental_score,
-    format_large_number,
-    get_financial_statements
-)
-from indicators.technical import add_indicators
-from engine.decision import decision_engine
-from config import SUPPORTED_STOCKS, USER_INPUT_PARAMS
+# Signal/fundamental engines (pandas, yfinance) and the webhook store are
+# imported inside the functions that use them, keeping app import light.
+from api.executor import run_blocking
+from config import API_CONFIG, SUPPORTED_STOCKS, USER_INPUT_PARAMS
 
 # Security
 security = HTTPBearer()
@@ -190,6 +185,65 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     return {"user_id": "demo_user", "email": "demo@example.com"}
 
 
+def fetch_technical_leg(ticker: str, is_us: bool = False) -> Optional[Dict[str, Any]]:
+    """Blocking technical leg: price history, indicators, decision and latest price change"""
+    from engine.signal_service import latest_signal
+
+    computed = latest_signal(ticker, is_us=is_us)
+    if computed is None:
+        return None
+
+    current_price, prev_close = computed["close"], computed["prev_close"]
+    return {
+        "decision": computed["decision"],
+        "current_price": current_price,
+        "price_change": {
+            "amount": current_price - prev_close,
+            "percentage": ((current_price - prev_close) / prev_close * 100) if prev_close > 0 else 0,
+            "previous_close": prev_close
+        }
+    }
+
+
+def fetch_fundamental_leg(ticker: str) -> Optional[Dict[str, Any]]:
+    """Blocking fundamental leg: yfinance info and the derived fundamental score"""
+    from data.enhanced_fundamentals import fetch_fundamental_data, calculate_fundamental_score
+
+    fundamentals = fetch_fundamental_data(ticker)
+    if not fundamentals:
+        return None
+    return {"fundamentals": fundamentals, "score": calculate_fundamental_score(fundamentals)}
+
+
+async def gather_legs(legs: Dict[str, tuple]) -> tuple:
+    """
+    Run blocking legs concurrently on the shared executor, each with its own time budget.
+
+    Args:
+        legs: {name: (callable, args tuple, timeout seconds)}
+
+    Returns:
+        (results, failures): {name: leg result} for legs that finished, and
+        {name: "timeout" | error message} for legs that did not
+    """
+    names = list(legs)
+    outcomes = await asyncio.gather(
+        *(run_blocking(fn, *args, timeout=timeout) for fn, args, timeout in legs.values()),
+        return_exceptions=True
+    )
+    results, failures = {}, {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            print(f"⏱️ {name} leg exceeded {legs[name][2]}s, responding without it")
+            failures[name] = "timeout"
+        elif isinstance(outcome, Exception):
+            print(f"❌ {name} leg failed: {outcome}")
+            failures[name] = str(outcome)
+        else:
+            results[name] = outcome
+    return results, failures
+
+
 def calculate_risk_assessment(
     technical: Dict[str, Any],
     fundamentals: Optional[Dict[str, Any]],
@@ -473,56 +527,50 @@ def setup_b2c_routes(app: FastAPI):
                 }
             }
             
-            # Fetch technical analysis
+            # Technical and fundamental legs are blocking I/O: run them concurrently off the event loop
+            legs = {}
             if request.include_technical:
                 print(f"📊 Fetching technical data for {ticker}...")
-                df = fetch_eod(ticker, use_5y=False, is_us=stock_config.get("is_us", False))
-                
-                if df is not None and not df.empty:
-                    df_with_indicators = add_indicators(df)
-                    technical_decision = decision_engine(df_with_indicators)
-                    
-                    response_data["technical_analysis"] = technical_decision
-                    response_data["trading_signal"] = {
-                        "signal": technical_decision.get("signal", "HOLD"),
-                        "score": technical_decision.get("score", 0),
-                        "confidence": technical_decision.get("confidence", 50),
-                        "reasons": technical_decision.get("reasons", [])
-                    }
-                    
-                    # Current price from technical data
-                    if len(df) > 0:
-                        current_price = float(df['Close'].iloc[-1])
-                        prev_close = float(df['Close'].iloc[-2]) if len(df) > 1 else current_price
-                        
-                        response_data["current_price"] = current_price
-                        response_data["price_change"] = {
-                            "amount": current_price - prev_close,
-                            "percentage": ((current_price - prev_close) / prev_close * 100) if prev_close > 0 else 0,
-                            "previous_close": prev_close
-                        }
-            
-            # Fetch fundamental analysis
+                legs["technical"] = (fetch_technical_leg, (ticker, stock_config.get("is_us", False)),
+                                     API_CONFIG.get("TECHNICAL_TIMEOUT_SECONDS"))
             if request.include_fundamentals:
                 print(f"📈 Fetching fundamental data for {ticker}...")
-                fundamentals = fetch_fundamental_data(ticker)
-                
-                if fundamentals:
-                    response_data["fundamental_analysis"] = fundamentals
-                    
-                    # Calculate fundamental score
-                    fund_score = calculate_fundamental_score(fundamentals)
-                    response_data["fundamental_score"] = fund_score
-                    
-                    # Update price if not from technical
-                    if response_data["current_price"] == 0:
-                        price_info = fundamentals.get("price_info", {})
-                        response_data["current_price"] = price_info.get("current_price", 0)
-                        response_data["price_change"] = {
-                            "amount": price_info.get("current_price", 0) - price_info.get("previous_close", 0),
-                            "percentage": ((price_info.get("current_price", 0) - price_info.get("previous_close", 0)) / price_info.get("previous_close", 1) * 100) if price_info.get("previous_close", 0) > 0 else 0,
-                            "previous_close": price_info.get("previous_close", 0)
-                        }
+                legs["fundamental"] = (fetch_fundamental_leg, (ticker,),
+                                       API_CONFIG.get("FUNDAMENTAL_TIMEOUT_SECONDS"))
+            results, failures = await gather_legs(legs)
+
+            technical = results.get("technical")
+            if technical:
+                technical_decision = technical["decision"]
+                response_data["technical_analysis"] = technical_decision
+                response_data["trading_signal"] = {
+                    "signal": technical_decision.get("signal", "HOLD"),
+                    "score": technical_decision.get("score", 0),
+                    "confidence": technical_decision.get("confidence", 50),
+                    "reasons": technical_decision.get("reasons", [])
+                }
+                response_data["current_price"] = technical["current_price"]
+                response_data["price_change"] = technical["price_change"]
+
+            fundamental = results.get("fundamental")
+            if fundamental:
+                fundamentals = fundamental["fundamentals"]
+                response_data["fundamental_analysis"] = fundamentals
+                response_data["fundamental_score"] = fundamental["score"]
+
+                # Update price if not from technical
+                if response_data["current_price"] == 0:
+                    price_info = fundamentals.get("price_info", {})
+                    response_data["current_price"] = price_info.get("current_price", 0)
+                    response_data["price_change"] = {
+                        "amount": price_info.get("current_price", 0) - price_info.get("previous_close", 0),
+                        "percentage": ((price_info.get("current_price", 0) - price_info.get("previous_close", 0)) / price_info.get("previous_close", 1) * 100) if price_info.get("previous_close", 0) > 0 else 0,
+                        "previous_close": price_info.get("previous_close", 0)
+                    }
+
+            if failures:
+                response_data["metadata"]["partial"] = True
+                response_data["metadata"]["unavailable"] = failures
             
             # Calculate risk assessment
             if response_data["technical_analysis"]:
@@ -643,22 +691,58 @@ def setup_b2c_routes(app: FastAPI):
         }
         ```
         """
-        # TODO: Implement webhook registration in database
-        # For now, return success response
-        
+        from engine.webhooks import get_webhook_store, start_webhook_dispatcher
+
+        try:
+            record = get_webhook_store().register(
+                request.webhook_url, request.tickers, request.alert_conditions, request.min_confidence
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        start_webhook_dispatcher()
+
         return {
             "status": "success",
             "message": "Webhook registered successfully",
-            "webhook_id": f"wh_{datetime.now().timestamp()}",
-            "webhook_url": request.webhook_url,
-            "monitored_tickers": request.tickers,
-            "alert_conditions": request.alert_conditions,
-            "min_confidence": request.min_confidence,
-            "created_at": datetime.now().isoformat(),
-            "note": "Webhook implementation in progress - notifications will be sent to your endpoint when conditions are met"
+            "webhook_id": record["id"],
+            "webhook_url": record["url"],
+            "monitored_tickers": record["tickers"],
+            "alert_conditions": record["conditions"],
+            "min_confidence": record["min_confidence"],
+            "created_at": record["created_at"],
+            "note": "Events are sent when a freshly computed signal changes (after each market close, or on demand)"
         }
     
     
+    @app.get("/api/v2/webhook/{webhook_id}")
+    async def get_webhook(webhook_id: str):
+        """
+        **Webhook Details** 🔔
+        
+        Registration plus the most recent deliveries that failed permanently
+        (dead letters, after all retries).
+        """
+        from engine.webhooks import get_webhook_store
+
+        store = get_webhook_store()
+        record = store.get(webhook_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail=f"Webhook {webhook_id} not found")
+        return {**record, "dead_letters": store.dead_letters(webhook_id, limit=20)}
+    
+    
+    @app.delete("/api/v2/webhook/{webhook_id}")
+    async def delete_webhook(webhook_id: str):
+        """
+        **Unregister Webhook** 🔕
+        """
+        from engine.webhooks import get_webhook_store
+
+        if not get_webhook_store().unregister(webhook_id):
+            raise HTTPException(status_code=404, detail=f"Webhook {webhook_id} not found")
+        return {"status": "success", "webhook_id": webhook_id}
+    
+    
     return app
 
 
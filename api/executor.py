@@ -0,0 +1,63 @@
+"""
+Bounded executor for blocking work called from async endpoints.
+
+Yahoo requests, the price store and indicator math are synchronous. Running
+them directly inside an `async def` route stalls the uvicorn event loop for
+every connected user; run_blocking hands them to a fixed-size thread pool
+instead, so the loop keeps serving other requests while they run.
+"""
+
+import asyncio
+import functools
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+try:
+    from config import API_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import API_CONFIG
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool sized by API_CONFIG BLOCKING_WORKERS (created on first use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=API_CONFIG.get("BLOCKING_WORKERS", 16),
+                thread_name_prefix="blocking-io",
+            )
+        return _executor
+
+
+async def run_blocking(fn, *args, timeout: Optional[float] = None, **kwargs):
+    """
+    Await a blocking call on the shared pool.
+
+    Args:
+        fn: Synchronous callable
+        *args, **kwargs: Passed to fn
+        timeout: Seconds to wait before giving up (None = no limit)
+
+    Returns:
+        fn's return value
+
+    Raises:
+        asyncio.TimeoutError: fn did not finish within `timeout`. The worker
+            thread cannot be interrupted; it finishes in the background and its
+            result is discarded.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+    if timeout is None:
+        return await future
+    return await asyncio.wait_for(future, timeout)
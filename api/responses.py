@@ -0,0 +1,152 @@
+"""
+Single JSON encoding path for API responses.
+
+Endpoints registered with fast_route() (or returning FastJSONResponse(content)
+directly) skip FastAPI's jsonable_encoder walk and serialize numpy scalars and arrays, pandas
+Timestamps / NaT, datetimes and NaN (as null) in one pass:
+
+- orjson (optional, when installed) handles numpy natively
+- otherwise the C-accelerated stdlib encoder runs with a `default` hook for
+  the non-native types; only payloads that contain NaN/inf or non-string
+  keys pay for a cleanup walk, and only once
+
+numpy and pandas are not imported here: a value can only be a numpy/pandas
+object if that library is already loaded, so the hooks look them up in
+sys.modules and importing the API stays light.
+"""
+
+import functools
+import json
+import math
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _default(obj: Any):
+    """Convert a value the JSON encoders do not know natively."""
+    np, pd = sys.modules.get("numpy"), sys.modules.get("pandas")
+    if np is not None:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    if pd is not None:
+        if obj is pd.NaT:
+            return None
+        if isinstance(obj, (pd.Series, pd.Index)):
+            return obj.tolist()
+        if isinstance(obj, pd.DataFrame):
+            return obj.to_dict(orient="records")
+    if isinstance(obj, (datetime, date)):  # includes pandas.Timestamp
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    if hasattr(obj, "model_dump"):  # pydantic models
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _key(key):
+    if isinstance(key, str):
+        return key
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(key, np.generic):
+        key = key.item()
+    if isinstance(key, (datetime, date)):
+        return key.isoformat()
+    return key if isinstance(key, (int, float, bool)) or key is None else str(key)
+
+
+def _clean(obj):
+    """NaN/inf -> None and JSON-safe keys (fallback path only)."""
+    if isinstance(obj, dict):
+        return {_key(k): _clean(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_clean(v) for v in obj]
+    if isinstance(obj, float):
+        return float(obj) if math.isfinite(obj) else None
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(obj, np.floating):
+            return float(obj) if math.isfinite(obj) else None
+        if isinstance(obj, np.ndarray):
+            return _clean(obj.tolist())
+    try:
+        converted = _default(obj)
+    except TypeError:
+        return obj
+    return _clean(converted) if converted is not obj else converted
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """UTF-8 JSON for API payloads (numpy/pandas aware, NaN as null)."""
+    if orjson is not None:
+        options = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=options)
+        except TypeError:
+            obj = _clean(obj)  # e.g. integer-subclass keys orjson rejects
+            return orjson.dumps(obj, default=_default, option=options)
+    return dumps(obj, indent=indent).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """JSON text for API payloads, NDJSON/SSE lines and saved results."""
+    if orjson is not None:
+        return dumps_bytes(obj, indent=indent).decode("utf-8")
+    kwargs = {"indent": 2} if indent else {"separators": (",", ":")}
+    try:
+        return json.dumps(obj, default=_default, allow_nan=False, ensure_ascii=False, **kwargs)
+    except (ValueError, TypeError):
+        return json.dumps(_clean(obj), default=_default, allow_nan=False, ensure_ascii=False, **kwargs)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_bytes instead of jsonable_encoder + json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+def fast_route(route):
+    """
+    Register an endpoint whose payload is rendered as FastJSONResponse.
+
+    The route gets a wrapper that builds the response, while the decorated
+    name stays the plain function, so direct callers (app_b2c's V1 routes,
+    scripts) keep getting the dict back.
+
+    Example:
+        @fast_route(router.post("/backtest"))
+        def run_backtest(request: BacktestRequest):
+            return {"ok": True, ...}
+    """
+    def register(endpoint):
+        @functools.wraps(endpoint)
+        def respond(*args, **kwargs):
+            content = endpoint(*args, **kwargs)
+            return content if isinstance(content, Response) else FastJSONResponse(content)
+
+        route(respond)
+        return endpoint
+
+    return register
@@ -0,0 +1,166 @@
+"""
+Pushed signal updates over WebSocket and Server-Sent Events.
+
+Clients subscribe to tickers and receive a message whenever a freshly
+computed signal or price differs from the last one (see engine/broadcast.py),
+instead of polling /signal/{ticker} or /portfolio. Tickers the hub has not
+seen yet are seeded from the latest EOD snapshot.
+
+    WS  /ws/signals?tickers=BBCA,BBRI
+        client -> {"action": "subscribe" | "unsubscribe", "tickers": ["TLKM"]}
+        server -> {"type": "signal", "ticker", "signal", "score", ...}
+                  {"type": "subscribed", "tickers": [...]}
+    GET /stream/signals?tickers=BBCA,BBRI    (text/event-stream, "signal" events)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+# Add parent directory to path
+parent_dir = str(Path(__file__).parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config import API_CONFIG
+from engine.broadcast import BroadcastHub, Message, Subscription, get_hub
+
+
+def _split(tickers: str) -> List[str]:
+    return [t for t in (tickers or "").split(",") if t.strip()]
+
+
+def seed_from_snapshot(hub: BroadcastHub, tickers: Iterable[str]):
+    """
+    Publish the EOD snapshot's signal for tickers the hub has no state for.
+
+    Snapshot rows keep the bar date under "date"; it is published as "as_of"
+    like live updates, so the first message is dated and a live recompute of
+    the same bar is recognized as unchanged.
+    """
+    from engine.eod_pipeline import get_eod_pipeline
+
+    snap = get_eod_pipeline().snapshot
+    if not snap:
+        return
+    for ticker in tickers:
+        row = snap["signals"].get(ticker)
+        if row is not None:
+            hub.publish(ticker, {
+                "signal": row.get("signal"),
+                "score": row.get("score"),
+                "confidence": row.get("confidence"),
+                "close": row.get("close"),
+                "prev_close": row.get("prev_close"),
+                "as_of": row.get("as_of") or row.get("date"),
+            })
+
+
+def _subscribe(hub: BroadcastHub, sub: Subscription, tickers: Iterable[str]):
+    seed_from_snapshot(hub, hub.add_tickers(sub, tickers))
+
+
+async def sse_stream(tickers: Iterable[str], is_disconnected: Callable[[], Awaitable[bool]],
+                     hub: BroadcastHub = None, heartbeat: float = None) -> AsyncIterator[str]:
+    """
+    SSE frames for a ticker set until the client disconnects.
+
+    Args:
+        tickers: Tickers to follow
+        is_disconnected: Request.is_disconnected
+        hub: Broadcast hub (default: the process-wide hub)
+        heartbeat: Seconds between keep-alive comments (default API_CONFIG STREAM_HEARTBEAT_SECONDS)
+    """
+    hub = hub or get_hub()
+    heartbeat = heartbeat or API_CONFIG.get("STREAM_HEARTBEAT_SECONDS", 15.0)
+    sub = hub.subscribe()
+    try:
+        _subscribe(hub, sub, tickers)
+        while not await is_disconnected():
+            try:
+                message = await asyncio.wait_for(sub.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield message.sse
+    finally:
+        hub.unsubscribe(sub)
+
+
+def setup_stream_routes(app: FastAPI):
+    """Register /ws/signals and /stream/signals (no-op when API_CONFIG ENABLE_WEBSOCKET is off)."""
+    if not API_CONFIG.get("ENABLE_WEBSOCKET", True):
+        return app
+
+    @app.websocket("/ws/signals")
+    async def signals_websocket(websocket: WebSocket, tickers: str = ""):
+        """
+        **Live Signals (WebSocket)** 📡
+
+        Pushes a message per signal/price change for the subscribed tickers.
+        Send {"action": "subscribe" | "unsubscribe", "tickers": [...]} to change the set.
+        """
+        await websocket.accept()
+        hub = get_hub()
+        sub = hub.subscribe()
+
+        def ack():
+            sub.put(Message(None, {"type": "subscribed", "tickers": sorted(sub.tickers)}, event="subscribed"))
+
+        async def receive():
+            while True:
+                try:
+                    request = await websocket.receive_json()
+                    action, names = request.get("action"), request.get("tickers") or []
+                except (ValueError, AttributeError):
+                    sub.put(Message(None, {"type": "error", "detail": "expected {action, tickers}"}, event="error"))
+                    continue
+                if action == "subscribe":
+                    _subscribe(hub, sub, names)
+                elif action == "unsubscribe":
+                    hub.remove_tickers(sub, names)
+                else:
+                    sub.put(Message(None, {"type": "error", "detail": f"unknown action {action!r}"}, event="error"))
+                    continue
+                ack()
+
+        async def send():
+            while True:
+                message = await sub.get()
+                await websocket.send_text(message.json)
+
+        try:
+            _subscribe(hub, sub, _split(tickers))
+            ack()
+            tasks = [asyncio.create_task(receive()), asyncio.create_task(send())]
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                if not isinstance(task.exception(), WebSocketDisconnect) and task.exception() is not None:
+                    raise task.exception()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            hub.unsubscribe(sub)
+
+    @app.get("/stream/signals")
+    async def signals_event_stream(request: Request, tickers: str):
+        """
+        **Live Signals (Server-Sent Events)** 📡
+
+        `signal` events for the given tickers whenever the signal or price changes.
+
+        **Example:** `GET /stream/signals?tickers=BBCA,BBRI`
+        """
+        return StreamingResponse(
+            sse_stream(_split(tickers), request.is_disconnected),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return app
@@ -6,25 +6,25 @@ Date: January 1, 2026
 Version: 2.0.0
 """
 
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 import sys
 from pathlib import Path
 
 # Add directories to path
-current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+current_dir = str(Path(__file__).parent)
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
 
-# Import original routes from main.py
-from main import app as original_app
-
-# Import new B2C routes
+# Import new B2C routes (V1 handlers import main lazily, on first request)
 from api.b2c_endpoints import setup_b2c_routes
 from api.auth import setup_auth_routes
+from api.streaming import setup_stream_routes
+from api.responses import FastJSONResponse
 
-# Create new enhanced app
-app = FastAPI(
+# Settings for the enhanced app (built by create_app)
+APP_SETTINGS = dict(
     title="Stock AI Engine - B2C Platform",
     description="""
     🎯 **Stock AI Engine API - Production Ready**
@@ -186,22 +186,16 @@ app = FastAPI(
             "name": "V2 - User Management",
             "description": "👤 User preferences and parameter management"
         }
-    ]
+    ],
+    default_response_class=FastJSONResponse
 )
 
-# CORS Configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter()
 
 
 # ===== ROOT ENDPOINTS =====
 
-@app.get("/", tags=["Health & Info"])
+@router.get("/", tags=["Health & Info"])
 async def root():
     """
     **API Root** 🏠
@@ -240,7 +234,7 @@ async def root():
     }
 
 
-@app.get("/health", tags=["Health & Info"])
+@router.get("/health", tags=["Health & Info"])
 async def health_check():
     """
     **Health Check** ❤️
@@ -255,7 +249,18 @@ async def health_check():
     }
 
 
-@app.get("/api-info", tags=["Health & Info"])
+@router.get("/metrics", tags=["Health & Info"])
+async def metrics_info():
+    """
+    **Runtime Metrics** 📈
+    
+    Request coalescing counters (calls, executions, coalesced) per single-flight group
+    """
+    from main import metrics
+    return metrics()
+
+
+@router.get("/api-info", tags=["Health & Info"])
 async def api_info():
     """
     **API Information** ℹ️
@@ -295,7 +300,7 @@ async def api_info():
 # ===== MOUNT V1 ENDPOINTS (Legacy) =====
 
 # Copy V1 routes from original app and add tags
-@app.get("/signal/{ticker}", tags=["V1 - Legacy Endpoints"])
+@router.get("/signal/{ticker}", tags=["V1 - Legacy Endpoints"])
 async def get_signal_v1(ticker: str):
     """
     **[V1] Get Signal** (Legacy)
@@ -304,12 +309,13 @@ async def get_signal_v1(ticker: str):
     
     **Recommended:** Use `/api/v2/stock/info` for comprehensive analysis
     """
-    # Import and call original function
+    # Original function, run off the event loop so concurrent requests can be coalesced
     from main import get_signal
-    return get_signal(ticker)
+    from api.executor import run_blocking
+    return await run_blocking(get_signal, ticker)
 
 
-@app.post("/backtest", tags=["V1 - Legacy Endpoints"])
+@router.post("/backtest", tags=["V1 - Legacy Endpoints"])
 async def run_backtest_v1(request: dict):
     """
     **[V1] Run Backtest** (Legacy)
@@ -318,10 +324,10 @@ async def run_backtest_v1(request: dict):
     """
     from main import run_backtest, BacktestRequest
     req = BacktestRequest(**request)
-    return run_backtest(req)
+    return FastJSONResponse(run_backtest(req))
 
 
-@app.get("/portfolio", tags=["V1 - Legacy Endpoints"])
+@router.get("/portfolio", tags=["V1 - Legacy Endpoints"])
 async def get_portfolio_v1(symbols: str):
     """
     **[V1] Portfolio Signals** (Legacy)
@@ -329,21 +335,47 @@ async def get_portfolio_v1(symbols: str):
     Get signals for multiple stocks - original endpoint
     """
     from main import get_portfolio_signals
-    return get_portfolio_signals(symbols)
+    return FastJSONResponse(get_portfolio_signals(symbols))
 
 
-# ===== SETUP V2 ROUTES =====
+@router.get("/screener", tags=["V1 - Legacy Endpoints"])
+async def screener_v1(signal: str = None, min_score: float = None, max_score: float = None,
+                      sector: str = None, sort: str = "score", order: str = "desc", limit: int = None):
+    """
+    **Stock Screener**
+    
+    Filter all supported stocks by signal, score range and sector from the
+    precomputed signal table (refreshed after market close)
+    """
+    from main import screener
+    return FastJSONResponse(screener(signal=signal, min_score=min_score, max_score=max_score,
+                                     sector=sector, sort=sort, order=order, limit=limit))
+
+
+@router.get("/eod/status", tags=["Health & Info"])
+async def eod_status_v1():
+    """
+    **EOD Pipeline Status** 🕓
 
-# Setup authentication routes
-setup_auth_routes(app)
+    Version, as-of date and per-stage durations of the last after-close run
+    """
+    from main import eod_status
+    return eod_status()
+
+
+@router.get("/eod/signals", tags=["V1 - Legacy Endpoints"])
+async def eod_signals_v1(symbols: str = None):
+    """
+    **Precomputed Signals**
 
-# Setup B2C routes
-setup_b2c_routes(app)
+    Signals from the last after-close run, served from memory
+    """
+    from main import eod_signals
+    return FastJSONResponse(eod_signals(symbols))
 
 
 # ===== ERROR HANDLERS =====
 
-@app.exception_handler(404)
 async def not_found_handler(request, exc):
     return {
         "error": "Not Found",
@@ -353,7 +385,6 @@ async def not_found_handler(request, exc):
     }
 
 
-@app.exception_handler(500)
 async def internal_error_handler(request, exc):
     return {
         "error": "Internal Server Error",
@@ -365,7 +396,6 @@ async def internal_error_handler(request, exc):
 
 # ===== STARTUP EVENT =====
 
-@app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
     print("=" * 60)
@@ -386,6 +416,53 @@ async def startup_event():
     print("=" * 60)
     print("🔗 GitHub: https://github.com/GeraldElroy7/stock-ai-engine")
     print("=" * 60)
+    
+    from engine.webhooks import start_webhook_dispatcher
+    start_webhook_dispatcher()
+
+    from engine.eod_pipeline import start_eod_scheduler
+    start_eod_scheduler()
+
+
+# ===== APP FACTORY =====
+
+def create_app() -> FastAPI:
+    """
+    Build the B2C application: V1 legacy + V2 routes, CORS and startup hooks.
+
+    Background services (webhook dispatcher, EOD scheduler) start in the
+    startup hook, so importing this module has no side effects.
+    """
+    app = FastAPI(**APP_SETTINGS)
+
+    # CORS Configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, specify exact origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Root, health and V1 legacy endpoints
+    app.include_router(router)
+
+    # Setup authentication routes
+    setup_auth_routes(app)
+
+    # Setup B2C routes
+    setup_b2c_routes(app)
+
+    # Setup WebSocket / SSE signal streaming
+    setup_stream_routes(app)
+
+    app.add_exception_handler(404, not_found_handler)
+    app.add_exception_handler(500, internal_error_handler)
+    app.router.add_event_handler("startup", startup_event)
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,198 @@
+"""
+Columnar trade ledger.
+
+A TradeLedger holds closed trades as parallel NumPy arrays (struct of arrays)
+instead of one dict per trade: bar positions of entry and exit, the prices
+and the return in percent (rounded to 2 decimals, like the trade dicts).
+The array backtester writes it directly from its entry/exit positions, and
+backtest.report.summarize reads the return column without building a
+DataFrame, so sweeps over 100k+ trades never materialize per-trade dicts.
+
+to_trades() converts to the classic list of trade dicts when a caller
+(API response, CSV export) needs it.
+
+Ledgers holding both books of the long/short backtester carry a direction
+column (LONG_SIDE / SHORT_SIDE); a short's return is the fall of the price
+from entry. Long-only ledgers leave it unset and their trade dicts keep the
+simple_backtest format.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Array columns, in constructor order
+FIELDS = ["entry_idx", "exit_idx", "entry_price", "exit_price", "return_pct"]
+
+# Trade directions and their labels in trade dicts / frames
+LONG_SIDE, SHORT_SIDE = 1, -1
+DIRECTIONS = {LONG_SIDE: "LONG", SHORT_SIDE: "SHORT"}
+
+
+def _round_pct(entry_price: np.ndarray, exit_price: np.ndarray, direction=None) -> np.ndarray:
+    """Return in percent, rounded like simple_backtest (Python round, not np.round, so ties agree)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        change = (exit_price - entry_price) / entry_price * 100
+        if direction is not None:
+            change = change * direction
+    return np.fromiter((round(pct, 2) for pct in change.tolist()), dtype=np.float64, count=len(change))
+
+
+class TradeLedger:
+    """
+    Closed trades as parallel arrays.
+
+    Args:
+        entry_idx / exit_idx: Bar positions of entry and exit
+        entry_price / exit_price: Fill prices
+        return_pct: Trade return in percent; derived from the prices (rounded to 2 decimals) if omitted
+        entry_dates / exit_dates: Optional bar labels (pd.Index) for the trade dicts' dates
+        symbols: Optional symbol per trade (multi-asset ledgers, e.g. backtest/portfolio.py)
+        direction: Optional LONG_SIDE / SHORT_SIDE per trade (None = all long)
+    """
+
+    __slots__ = FIELDS + ["entry_dates", "exit_dates", "symbols", "direction"]
+
+    def __init__(self, entry_idx=(), exit_idx=(), entry_price=(), exit_price=(), return_pct=None,
+                 entry_dates: Optional[pd.Index] = None, exit_dates: Optional[pd.Index] = None,
+                 symbols=None, direction=None):
+        self.entry_idx = np.asarray(entry_idx, dtype=np.intp)
+        self.exit_idx = np.asarray(exit_idx, dtype=np.intp)
+        self.entry_price = np.asarray(entry_price, dtype=np.float64)
+        self.exit_price = np.asarray(exit_price, dtype=np.float64)
+        self.direction = None if direction is None else np.asarray(direction, dtype=np.int8)
+        if return_pct is None:
+            return_pct = _round_pct(self.entry_price, self.exit_price, self.direction)
+        self.return_pct = np.asarray(return_pct, dtype=np.float64)
+        self.entry_dates = entry_dates
+        self.exit_dates = exit_dates
+        self.symbols = None if symbols is None else np.asarray(symbols, dtype=object)
+
+        n = len(self.entry_idx)
+        if any(len(getattr(self, name)) != n for name in FIELDS) or any(
+                column is not None and len(column) != n for column in (self.symbols, self.direction)):
+            raise ValueError("TradeLedger columns must have the same length")
+
+    @classmethod
+    def from_rows(cls, entries, exits, prices, index=None, direction=None) -> "TradeLedger":
+        """
+        Ledger for entry/exit bar positions into one price series.
+
+        Args:
+            entries / exits: Bar positions (e.g. from vector_backtest.trade_rows)
+            prices: Close prices (one per bar)
+            index: Bar labels used for entry/exit dates (defaults to positions)
+            direction: Optional LONG_SIDE / SHORT_SIDE per trade
+        """
+        entries = np.asarray(entries, dtype=np.intp)
+        exits = np.asarray(exits, dtype=np.intp)
+        prices = np.asarray(prices, dtype=np.float64)
+        entry_dates = exit_dates = None
+        if index is not None:
+            index = pd.Index(index)
+            entry_dates, exit_dates = index[entries], index[exits]
+        return cls(entries, exits, prices[entries], prices[exits],
+                   entry_dates=entry_dates, exit_dates=exit_dates, direction=direction)
+
+    @classmethod
+    def from_trades(cls, trades: List[Dict]) -> "TradeLedger":
+        """Ledger from a list of trade dicts (dates kept as labels; positions are the trade order)."""
+        n = len(trades)
+        column = lambda key: np.fromiter((t[key] for t in trades), dtype=np.float64, count=n)
+        direction = None
+        if any("direction" in t for t in trades):
+            direction = [SHORT_SIDE if t.get("direction") == "SHORT" else LONG_SIDE for t in trades]
+        return cls(np.arange(n), np.arange(n), column("entry_price"), column("exit_price"),
+                   column("return_pct"),
+                   entry_dates=pd.Index([t.get("entry_date") for t in trades], dtype=object),
+                   exit_dates=pd.Index([t.get("exit_date") for t in trades], dtype=object),
+                   direction=direction)
+
+    @classmethod
+    def concat(cls, ledgers: Iterable["TradeLedger"]) -> "TradeLedger":
+        """One ledger holding the trades of several (e.g. per-symbol) ledgers, in order."""
+        ledgers = list(ledgers)
+        if not ledgers:
+            return cls()
+        columns = [np.concatenate([getattr(ledger, name) for ledger in ledgers]) for name in FIELDS]
+        dates = {}
+        if all(ledger.entry_dates is not None for ledger in ledgers):
+            for name in ("entry_dates", "exit_dates"):
+                first, *rest = [getattr(ledger, name) for ledger in ledgers]
+                dates[name] = first.append(rest) if rest else first
+        if all(ledger.symbols is not None for ledger in ledgers):
+            dates["symbols"] = np.concatenate([ledger.symbols for ledger in ledgers])
+        if any(ledger.direction is not None for ledger in ledgers):
+            dates["direction"] = np.concatenate([ledger.directions for ledger in ledgers])
+        return cls(*columns, **dates)
+
+    def __len__(self) -> int:
+        return len(self.entry_idx)
+
+    def __repr__(self) -> str:
+        return f"TradeLedger({len(self)} trades)"
+
+    @property
+    def holding_bars(self) -> np.ndarray:
+        """Bars between entry and exit for every trade."""
+        return self.exit_idx - self.entry_idx
+
+    @property
+    def directions(self) -> np.ndarray:
+        """LONG_SIDE / SHORT_SIDE for every trade (all long when the ledger has no direction column)."""
+        if self.direction is None:
+            return np.full(len(self), LONG_SIDE, dtype=np.int8)
+        return self.direction
+
+    def side(self, direction: int) -> "TradeLedger":
+        """The trades of one direction (LONG_SIDE or SHORT_SIDE)."""
+        keep = self.directions == direction
+        return TradeLedger(
+            *(getattr(self, name)[keep] for name in FIELDS),
+            entry_dates=None if self.entry_dates is None else self.entry_dates[keep],
+            exit_dates=None if self.exit_dates is None else self.exit_dates[keep],
+            symbols=None if self.symbols is None else self.symbols[keep],
+            direction=None if self.direction is None else self.direction[keep],
+        )
+
+    def to_trades(self) -> List[Dict]:
+        """
+        Classic list of trade dicts (entry_date, exit_date, entry_price, exit_price, return_pct),
+        with a leading "symbol" key when the ledger has symbols and a trailing
+        "direction" ("LONG" / "SHORT") when it has directions.
+        """
+        if self.entry_dates is None:
+            entry_dates, exit_dates = self.entry_idx.tolist(), self.exit_idx.tolist()
+        else:
+            entry_dates, exit_dates = list(self.entry_dates), list(self.exit_dates)
+        trades = [
+            {
+                "entry_date": entry_date,
+                "exit_date": exit_date,
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "return_pct": pct,
+            }
+            for entry_date, exit_date, entry_price, exit_price, pct in zip(
+                entry_dates, exit_dates, self.entry_price.tolist(), self.exit_price.tolist(),
+                self.return_pct.tolist())
+        ]
+        if self.direction is not None:
+            for trade, direction in zip(trades, self.direction.tolist()):
+                trade["direction"] = DIRECTIONS[direction]
+        if self.symbols is not None:
+            trades = [{"symbol": symbol, **trade} for symbol, trade in zip(self.symbols.tolist(), trades)]
+        return trades
+
+    def to_frame(self) -> pd.DataFrame:
+        """The ledger as a DataFrame (one column per field, plus dates when known)."""
+        frame = pd.DataFrame({name: getattr(self, name) for name in FIELDS})
+        if self.direction is not None:
+            frame["direction"] = np.where(self.direction == SHORT_SIDE, "SHORT", "LONG")
+        if self.entry_dates is not None:
+            frame.insert(0, "exit_date", np.asarray(self.exit_dates))
+            frame.insert(0, "entry_date", np.asarray(self.entry_dates))
+        if self.symbols is not None:
+            frame.insert(0, "symbol", self.symbols)
+        return frame
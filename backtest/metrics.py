@@ -0,0 +1,233 @@
+"""
+Bar-level equity curve and time-aware risk metrics.
+
+backtest.report.summarize looks at trade returns only. This module marks the
+position to market on every bar instead: the equity curve compounds the
+close-to-close returns while a position is held, charges the transaction
+cost on every fill, and the metrics are annualized from those bar returns:
+
+- Sharpe / Sortino (annualized, risk-free rate 0)
+- max drawdown of the equity curve and its longest underwater stretch
+- exposure (share of bars in the market) and turnover (fills per year)
+
+Everything is a handful of whole-array NumPy operations on (n_bars,) arrays,
+cheap enough to run for every grid point of backtest/sweep.py.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    from config import INSTITUTIONAL_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import INSTITUTIONAL_CONFIG
+
+
+def default_cost_pct() -> float:
+    """Cost per fill in percent (INSTITUTIONAL_CONFIG TRANSACTION_COST_PCT, 0 when costs are off)."""
+    if not INSTITUTIONAL_CONFIG.get("INCLUDE_TRANSACTION_COSTS", True):
+        return 0.0
+    return float(INSTITUTIONAL_CONFIG.get("TRANSACTION_COST_PCT", 0.0))
+
+
+def longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True values."""
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def bar_returns(prices) -> np.ndarray:
+    """Close-to-close returns (fractions); NaN closes carry the last price forward, first bar is 0."""
+    prices = np.asarray(prices, dtype=np.float64)
+    valid = np.isfinite(prices)
+    if not valid.all():
+        last = np.maximum.accumulate(np.where(valid, np.arange(len(prices)), 0))
+        prices = prices[last]
+    returns = np.zeros(len(prices))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns[1:] = prices[1:] / prices[:-1] - 1
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+
+def exposure_series(n: int, entries, exits) -> np.ndarray:
+    """
+    Position held over each bar's return: 1 from the bar after entry through the exit bar.
+
+    A position opened at the entry bar's close earns the returns of bars
+    entry+1 .. exit and is flat again after the exit bar's close.
+    """
+    entries = np.asarray(entries, dtype=np.intp)
+    exits = np.asarray(exits, dtype=np.intp)
+    delta = np.bincount(entries + 1, minlength=n + 1) - np.bincount(exits + 1, minlength=n + 1)
+    return np.cumsum(delta[:n], dtype=np.float64)
+
+
+def _curves(returns: np.ndarray, trade_sets, cost_pct: float):
+    """
+    (equity, exposure, growth, fills) as (len(trade_sets), n) arrays for one price path.
+
+    trade_sets is a sequence of (entries, exits) position arrays, or
+    (entries, exits, direction) with +1 / -1 per trade for long/short books;
+    every row is built with the same bincount/cumsum/cumprod calls.
+    """
+    n, k = len(returns), len(trade_sets)
+    width = n + 1  # one spare column per row for exits on the last bar
+    entries = np.concatenate([np.asarray(t[0], dtype=np.intp) for t in trade_sets])
+    exits = np.concatenate([np.asarray(t[1], dtype=np.intp) for t in trade_sets])
+    offsets = np.repeat(np.arange(k, dtype=np.intp) * width, [len(t[0]) for t in trade_sets])
+    signs = None
+    if any(len(t) > 2 and t[2] is not None for t in trade_sets):
+        signs = np.concatenate([np.ones(len(t[0])) if len(t) < 3 or t[2] is None
+                                else np.asarray(t[2], dtype=np.float64) for t in trade_sets])
+
+    delta = (np.bincount(offsets + entries + 1, weights=signs, minlength=k * width)
+             - np.bincount(offsets + exits + 1, weights=signs, minlength=k * width)).reshape(k, width)
+    exposure = np.cumsum(delta[:, :n], axis=1, dtype=np.float64)
+    fills = (np.bincount(offsets + entries, minlength=k * width)
+             + np.bincount(offsets + exits, minlength=k * width)).reshape(k, width)[:, :n]
+    growth = (1.0 + exposure * returns) * (1.0 - cost_pct / 100 * fills)
+    return np.cumprod(growth, axis=1), exposure, growth, fills
+
+
+def _stats(equity, exposure, growth, fills, periods_per_year) -> Dict[str, np.ndarray]:
+    """Unrounded metrics per row of (k, n) curve arrays."""
+    n = equity.shape[1]
+    years = n / periods_per_year
+    scale = np.sqrt(periods_per_year)
+    returns = growth - 1.0
+    mean, std = returns.mean(axis=1), returns.std(axis=1)
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2, axis=1))
+    final = equity[:, -1]
+
+    # Drawdown against the running peak (the starting capital counts as a peak)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    drawdown = equity / peak - 1.0
+    fill_count = fills.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "total_return_pct": (final - 1.0) * 100,
+            "annual_return_pct": np.where(final > 0, (np.maximum(final, 0) ** (1 / years) - 1.0) * 100, -100.0),
+            "annual_volatility_pct": std * scale * 100,
+            "sharpe_ratio": np.where(std > 0, mean / std * scale, 0.0),
+            "sortino_ratio": np.where(downside > 0, mean / downside * scale, 0.0),
+            "max_drawdown_pct": drawdown.min(axis=1) * 100,
+            "exposure_pct": np.abs(exposure).mean(axis=1) * 100,
+            "fills": fill_count,
+            "turnover_per_year": fill_count / years,
+            "_underwater": drawdown < 0,
+        }
+
+
+class EquityCurve:
+    """
+    Bar-level result of a backtest, as NumPy arrays (one value per bar).
+
+    Attributes:
+        equity: Account value, starting from 1.0, after costs
+        exposure: Position held over each bar's return (0 = flat, 1 = fully long, -1 = fully short)
+        returns: Strategy return per bar (fractions, after costs)
+        fills: Number of fills (entries + exits) on each bar
+        cost_pct: Cost charged per fill, in percent
+        index: Bar labels, when known
+    """
+
+    __slots__ = ["equity", "exposure", "returns", "fills", "cost_pct", "index"]
+
+    def __init__(self, equity, exposure, returns, fills, cost_pct: float = 0.0, index=None):
+        self.equity = equity
+        self.exposure = exposure
+        self.returns = returns
+        self.fills = fills
+        self.cost_pct = cost_pct
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.equity)
+
+    def metrics(self, periods_per_year: Optional[int] = None) -> Dict:
+        """equity_metrics for this curve."""
+        return equity_metrics(self, periods_per_year)
+
+
+def equity_curve(prices, entries, exits, cost_pct: Optional[float] = None, index=None,
+                 direction=None) -> EquityCurve:
+    """
+    Mark trades to market on every bar.
+
+    Args:
+        prices: Close prices (one per bar; NaN allowed)
+        entries / exits: Bar positions of each trade's entry and exit (e.g. TradeLedger.entry_idx / exit_idx)
+        cost_pct: Cost per fill in percent (default INSTITUTIONAL_CONFIG TRANSACTION_COST_PCT)
+        index: Optional bar labels, kept on the curve
+        direction: Optional +1 (long) / -1 (short) per trade (TradeLedger.direction);
+            a short is marked as a -1 exposure, i.e. rebalanced every bar
+
+    Returns:
+        EquityCurve
+    """
+    cost_pct = default_cost_pct() if cost_pct is None else cost_pct
+    equity, exposure, growth, fills = _curves(bar_returns(prices), [(entries, exits, direction)], cost_pct)
+    return EquityCurve(equity[0], exposure[0], growth[0] - 1.0, fills[0], cost_pct, index)
+
+
+def equity_metrics(curve: EquityCurve, periods_per_year: Optional[int] = None) -> Dict:
+    """
+    Time-aware performance metrics of an equity curve.
+
+    Args:
+        curve: EquityCurve from equity_curve
+        periods_per_year: Bars per year (default INSTITUTIONAL_CONFIG TRADING_DAYS_PER_YEAR)
+
+    Returns:
+        dict with total/annual return, annualized volatility, Sharpe and Sortino,
+        max drawdown (%), longest drawdown (bars), exposure (%), fills,
+        turnover per year and the cost per fill used
+    """
+    periods_per_year = periods_per_year or INSTITUTIONAL_CONFIG.get("TRADING_DAYS_PER_YEAR", 252)
+    if len(curve) < 2:
+        return {
+            "total_return_pct": 0, "annual_return_pct": 0, "annual_volatility_pct": 0,
+            "sharpe_ratio": 0, "sortino_ratio": 0, "max_drawdown_pct": 0,
+            "max_drawdown_bars": 0, "exposure_pct": 0, "fills": 0, "turnover_per_year": 0,
+            "cost_pct": curve.cost_pct,
+        }
+    stats = _stats(curve.equity[None, :], curve.exposure[None, :], curve.returns[None, :] + 1.0,
+                   curve.fills[None, :], periods_per_year)
+    report = {key: round(float(values[0]), 2) for key, values in stats.items() if not key.startswith("_")}
+    report["fills"] = int(stats["fills"][0])
+    report["max_drawdown_bars"] = longest_run(stats["_underwater"][0])
+    report["cost_pct"] = curve.cost_pct
+    return report
+
+
+def batch_equity_stats(prices, trade_sets, cost_pct: Optional[float] = None,
+                       periods_per_year: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    equity_metrics for many trade sets on the same price path, in one 2-D pass.
+
+    Used by the parameter sweep: every (stop, target) variant of a symbol's
+    signals is marked to market together.
+
+    Args:
+        prices: Close prices (one per bar)
+        trade_sets: Sequence of (entries, exits) bar positions
+        cost_pct / periods_per_year: As in equity_curve / equity_metrics
+
+    Returns:
+        {metric: array with one unrounded value per trade set} (no drawdown duration)
+    """
+    cost_pct = default_cost_pct() if cost_pct is None else cost_pct
+    periods_per_year = periods_per_year or INSTITUTIONAL_CONFIG.get("TRADING_DAYS_PER_YEAR", 252)
+    stats = _stats(*_curves(bar_returns(prices), list(trade_sets), cost_pct), periods_per_year)
+    del stats["_underwater"]
+    return stats
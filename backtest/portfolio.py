@@ -0,0 +1,265 @@
+"""
+Cross-sectional portfolio backtest.
+
+The per-symbol backtests (backtest/vector_backtest.py) trade every symbol with
+the whole account, so adding up their returns says nothing about a book that
+has to share one pool of capital. This simulator walks the shared date index
+once and trades all symbols together under RISK_CONFIG:
+
+- at most MAX_CONCURRENT_POSITIONS open positions, one per symbol
+- each new position sized at MAX_POSITION_SIZE_PCT of current equity (less
+  when cash runs short); when there are more BUY signals than free slots,
+  the highest scores are taken first
+- stop at entry - STOP_LOSS_MULTIPLIER * ATR and target at
+  entry + TAKE_PROFIT_MULTIPLIER * ATR (ATR of the entry bar), checked on
+  every close; a SELL signal also closes the position
+- circuit breaker: no new entries on a day the account has lost
+  MAX_DAILY_LOSS_PCT or more since the previous close
+
+Fills are at the close and pay TRANSACTION_COST_PCT on each side. Prices,
+ATR, scores and signal codes are aligned (dates x tickers) arrays built once
+with the panel indicators, so each day is a few NumPy operations across the
+universe instead of a Python loop over symbols.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from config import RISK_CONFIG, SIGNAL_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import RISK_CONFIG, SIGNAL_CONFIG
+
+from backtest.ledger import TradeLedger
+from backtest.metrics import EquityCurve, default_cost_pct, equity_metrics
+from backtest.report import summarize
+from backtest.sweep import classify_codes
+from backtest.vector_backtest import BUY, SELL, SKIP
+from engine.decision import decision_scores_panel
+from indicators.technical import add_indicators_panel, build_panel
+
+
+def panel_signals(panel, warmup: int = 50, buy_threshold: Optional[float] = None,
+                  sell_threshold: Optional[float] = None, short_threshold: Optional[float] = None):
+    """
+    Scores and signal codes for every (date, ticker) cell of an indicator panel.
+
+    Each ticker's first `warmup` bars and every date it did not trade are SKIP,
+    as in scripts/run_backtest.prepare_backtest for a single frame.
+
+    Returns:
+        (score, codes) as (dates x tickers) arrays
+    """
+    score = decision_scores_panel(panel)
+    codes = classify_codes(
+        score,
+        SIGNAL_CONFIG.get("BUY_THRESHOLD", 4.0) if buy_threshold is None else buy_threshold,
+        SIGNAL_CONFIG.get("SELL_THRESHOLD", -0.5) if sell_threshold is None else sell_threshold,
+        SIGNAL_CONFIG.get("SHORT_THRESHOLD", -7.0) if short_threshold is None else short_threshold,
+    )
+    traded = np.isfinite(panel["Close"].to_numpy(dtype=np.float64))
+    codes[~traded | (np.cumsum(traded, axis=0) <= warmup)] = SKIP
+    return score, codes
+
+
+def simulate_portfolio(close, atr, codes, score, initial_capital: float = 100_000_000,
+                       cost_pct: Optional[float] = None, risk: Optional[Dict] = None) -> Dict:
+    """
+    Step through aligned (dates x tickers) arrays and trade them as one account.
+
+    Args:
+        close: Close prices (NaN where a ticker did not trade)
+        atr: ATR per cell (sets stop and target distances at entry)
+        codes: Signal codes (vector_backtest BUY / SELL / OTHER / SKIP)
+        score: Decision score per cell, ranks competing BUY signals
+        initial_capital: Starting cash
+        cost_pct: Cost per fill in percent (default INSTITUTIONAL_CONFIG TRANSACTION_COST_PCT)
+        risk: Overrides for RISK_CONFIG keys
+
+    Returns:
+        dict with the trades as position arrays ("entry_idx", "exit_idx", "column",
+        "entry_price", "exit_price"), per-day "equity", "invested", "fills",
+        "positions" and "halted" arrays, and the positions still "open" at the end
+    """
+    risk = {**RISK_CONFIG, **(risk or {})}
+    cost = (default_cost_pct() if cost_pct is None else cost_pct) / 100
+    max_positions = int(risk.get("MAX_CONCURRENT_POSITIONS", 10))
+    position_pct = risk.get("MAX_POSITION_SIZE_PCT", 5.0) / 100
+    stop_mult = risk.get("STOP_LOSS_MULTIPLIER", 2.0)
+    target_mult = risk.get("TAKE_PROFIT_MULTIPLIER", 3.0)
+    max_daily_loss = risk.get("MAX_DAILY_LOSS_PCT", 2.0) / 100
+
+    close = np.asarray(close, dtype=np.float64)
+    n_days, n_symbols = close.shape
+    traded = np.isfinite(close)
+    # Last known price per cell, for marking open positions on days a ticker has no bar
+    last = np.maximum.accumulate(np.where(traded, np.arange(n_days)[:, None], 0), axis=0)
+    marks = np.nan_to_num(close[last, np.arange(n_symbols)])
+
+    with np.errstate(invalid="ignore"):
+        entry_atr = np.where(np.asarray(atr, dtype=np.float64) > 0, atr, np.nan)
+        buyable = (codes == BUY) & traded & np.isfinite(entry_atr)
+    selling = (codes == SELL) & traded
+    buy_days = buyable.any(axis=1)
+    # Ties keep column order
+    rank = np.where(buyable, -np.asarray(score, dtype=np.float64), np.inf)
+
+    # ===== STATE (one slot per ticker) =====
+    shares = np.zeros(n_symbols)
+    entry_price = np.zeros(n_symbols)
+    entry_day = np.full(n_symbols, -1, dtype=np.intp)
+    stop_level = np.zeros(n_symbols)
+    target_level = np.zeros(n_symbols)
+    cash = float(initial_capital)
+    prev_equity = cash
+
+    equity = np.empty(n_days)
+    invested = np.empty(n_days)
+    fills = np.zeros(n_days, dtype=np.int64)
+    positions = np.zeros(n_days, dtype=np.int64)
+    halted = np.zeros(n_days, dtype=bool)
+    trades = {"entry_idx": [], "exit_idx": [], "column": [], "entry_price": [], "exit_price": []}
+
+    for t in range(n_days):
+        held = shares > 0
+        price = close[t]
+
+        # ===== EXITS (stop, target or SELL at the close) =====
+        if held.any():
+            with np.errstate(invalid="ignore"):
+                exiting = held & traded[t] & ((price <= stop_level) | (price >= target_level) | selling[t])
+            if exiting.any():
+                cols = np.flatnonzero(exiting)
+                cash += float((shares[cols] * price[cols]).sum()) * (1 - cost)
+                trades["entry_idx"].append(entry_day[cols])
+                trades["exit_idx"].append(np.full(len(cols), t, dtype=np.intp))
+                trades["column"].append(cols)
+                trades["entry_price"].append(entry_price[cols])
+                trades["exit_price"].append(price[cols])
+                shares[cols] = 0.0
+                held[cols] = False
+                fills[t] += len(cols)
+        else:
+            exiting = None
+
+        value = float(shares @ marks[t])
+        day_equity = cash + value
+
+        # ===== CIRCUIT BREAKER =====
+        halted[t] = day_equity <= prev_equity * (1 - max_daily_loss)
+
+        # ===== ENTRIES (best scores first, into free slots) =====
+        free = max_positions - int(held.sum())
+        if buy_days[t] and free > 0 and not halted[t]:
+            candidates = buyable[t] & ~held
+            if exiting is not None:
+                candidates &= ~exiting
+            cols = np.flatnonzero(candidates)
+            if len(cols) > free:
+                cols = cols[np.argsort(rank[t, cols], kind="stable")[:free]]
+            # Every position gets the same budget until the cash runs out
+            budget = position_pct * day_equity
+            size = np.minimum(budget, cash / (1 + cost) - budget * np.arange(len(cols)))
+            cols, size = cols[size > 0], size[size > 0]
+            if len(cols):
+                fill_price = price[cols]
+                shares[cols] = size / fill_price
+                entry_price[cols] = fill_price
+                entry_day[cols] = t
+                stop_level[cols] = fill_price - stop_mult * entry_atr[t, cols]
+                target_level[cols] = fill_price + target_mult * entry_atr[t, cols]
+                cash -= float(size.sum()) * (1 + cost)
+                value += float(size.sum())
+                fills[t] += len(cols)
+
+        equity[t] = prev_equity = cash + value
+        invested[t] = value
+        positions[t] = int((shares > 0).sum())
+
+    trades = {key: np.concatenate(parts) if parts else np.array([], dtype=np.float64 if "price" in key else np.intp)
+              for key, parts in trades.items()}
+    return {
+        **trades,
+        "equity": equity,
+        "invested": invested,
+        "fills": fills,
+        "positions": positions,
+        "halted": halted,
+        "open": np.flatnonzero(shares > 0),
+    }
+
+
+def portfolio_curve(sim: Dict, initial_capital: float, cost_pct: float, index=None) -> EquityCurve:
+    """
+    EquityCurve of a simulate_portfolio result (equity relative to the starting capital).
+
+    exposure is the invested share of equity at the previous close, i.e. the
+    part of the account riding each day's price moves.
+    """
+    equity = sim["equity"] / initial_capital
+    previous = np.concatenate(([1.0], equity[:-1]))
+    exposure = np.zeros(len(equity))
+    exposure[1:] = sim["invested"][:-1] / sim["equity"][:-1]
+    return EquityCurve(equity, exposure, equity / previous - 1.0, sim["fills"], cost_pct, index)
+
+
+def portfolio_backtest(frames: Dict[str, pd.DataFrame], initial_capital: float = 100_000_000,
+                       warmup: int = 50, cost_pct: Optional[float] = None,
+                       risk: Optional[Dict] = None) -> Dict:
+    """
+    Backtest a universe as one account.
+
+    Args:
+        frames: ticker -> OHLCV DataFrame (as returned by fetch_eod_batch)
+        initial_capital: Starting cash
+        warmup: Bars per ticker before its signals count (as prepare_backtest)
+        cost_pct: Cost per fill in percent (default INSTITUTIONAL_CONFIG TRANSACTION_COST_PCT)
+        risk: Overrides for RISK_CONFIG keys
+
+    Returns:
+        dict with "ledger" (TradeLedger with symbols and dates), "curve"
+        (EquityCurve), "positions" / "halted" (pd.Series per day), "open"
+        (tickers still held at the end) and "report" (summarize of the trades
+        plus the account's equity metrics and risk usage)
+    """
+    cost_pct = default_cost_pct() if cost_pct is None else cost_pct
+    panel = build_panel(frames)
+    if not panel:
+        return {"ledger": TradeLedger(), "curve": None, "positions": None, "halted": None, "open": [],
+                "report": summarize([])}
+    panel = add_indicators_panel(panel)
+    score, codes = panel_signals(panel, warmup=warmup)
+
+    index, tickers = panel["Close"].index, panel["Close"].columns
+    sim = simulate_portfolio(panel["Close"].to_numpy(dtype=np.float64), panel["atr"].to_numpy(dtype=np.float64),
+                             codes, score, initial_capital=initial_capital, cost_pct=cost_pct, risk=risk)
+
+    ledger = TradeLedger(sim["entry_idx"], sim["exit_idx"], sim["entry_price"], sim["exit_price"],
+                         entry_dates=index[sim["entry_idx"]], exit_dates=index[sim["exit_idx"]],
+                         symbols=tickers[sim["column"]])
+    curve = portfolio_curve(sim, initial_capital, cost_pct, index)
+
+    report = summarize(ledger, initial_capital)
+    report["equity"] = equity_metrics(curve)
+    report["final_equity"] = round(float(sim["equity"][-1]), 2)
+    report["symbols"] = len(tickers)
+    report["max_concurrent_positions"] = int(sim["positions"].max())
+    report["avg_concurrent_positions"] = round(float(sim["positions"].mean()), 2)
+    report["halted_days"] = int(sim["halted"].sum())
+    report["open_positions"] = len(sim["open"])
+
+    return {
+        "ledger": ledger,
+        "curve": curve,
+        "positions": pd.Series(sim["positions"], index=index, name="positions"),
+        "halted": pd.Series(sim["halted"], index=index, name="halted"),
+        "open": list(tickers[sim["open"]]),
+        "report": report,
+    }
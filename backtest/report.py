@@ -1,98 +1,78 @@
-import pandas as pd
+import math
+
 import numpy as np
 
+try:
+    from backtest.ledger import DIRECTIONS, LONG_SIDE, SHORT_SIDE
+    from backtest.metrics import longest_run
+except ImportError:  # imported as part of the package
+    from .ledger import DIRECTIONS, LONG_SIDE, SHORT_SIDE
+    from .metrics import longest_run
 
-def summarize(trades, initial_capital=100_000_000):
+_NO_TRADES = {
+    "total_trades": 0,
+    "win_rate": 0,
+    "avg_return_pct": 0,
+    "max_gain_pct": 0,
+    "max_loss_pct": 0,
+    "sharpe_ratio": 0,
+    "max_drawdown_pct": 0,
+    "recovery_factor": 0,
+    "profit_factor": 0,
+    "consecutive_losses": 0,
+    "expectancy": 0,
+    "message": "No trades generated"
+}
+
+
+def trade_returns(trades) -> np.ndarray:
     """
-    Generate comprehensive backtest report with institutional-grade metrics.
-    
-    Metrics include:
-    - Win rate, avg return, max gain/loss (basic)
-    - Sharpe ratio, max drawdown (risk-adjusted)
-    - Recovery factor, profit factor (robustness)
-    - Consecutive losses (psychological limit)
-    - Expectancy (edge verification)
-    
-    Args:
-        trades: List of trade dictionaries with entry/exit prices and returns
-        initial_capital: Starting capital for drawdown calculation
-    
-    Returns:
-        dict with comprehensive performance metrics
+    Per-trade returns in percent from a TradeLedger, a list of trade dicts or an array.
     """
-    if len(trades) == 0:
-        return {
-            "total_trades": 0,
-            "win_rate": 0,
-            "avg_return_pct": 0,
-            "max_gain_pct": 0,
-            "max_loss_pct": 0,
-            "sharpe_ratio": 0,
-            "max_drawdown_pct": 0,
-            "recovery_factor": 0,
-            "profit_factor": 0,
-            "consecutive_losses": 0,
-            "expectancy": 0,
-            "message": "No trades generated"
-        }
-    
-    df = pd.DataFrame(trades)
-    returns = df["return_pct"].values
-    
-    # ===== BASIC METRICS =====
-    total_trades = len(df)
-    wins = (returns > 0).sum()
-    losses = (returns < 0).sum()
-    win_rate = wins / total_trades if total_trades > 0 else 0
-    
-    avg_return = returns.mean()
-    max_gain = returns.max()
-    max_loss = returns.min()
-    
+    if hasattr(trades, "return_pct"):  # TradeLedger
+        return np.asarray(trades.return_pct, dtype=np.float64)
+    if isinstance(trades, np.ndarray):
+        return trades.astype(np.float64, copy=False)
+    trades = list(trades)
+    return np.fromiter((t["return_pct"] for t in trades), dtype=np.float64, count=len(trades))
+
+
+def trade_directions(trades):
+    """
+    LONG_SIDE / SHORT_SIDE per trade, or None when the trades carry no direction
+    (long-only ledger, trade dicts without "direction", plain return arrays).
+    """
+    if hasattr(trades, "return_pct"):  # TradeLedger
+        return trades.direction
+    if isinstance(trades, np.ndarray):
+        return None
+    trades = list(trades)
+    if not any("direction" in t for t in trades):
+        return None
+    return np.fromiter((SHORT_SIDE if t.get("direction") == "SHORT" else LONG_SIDE for t in trades),
+                       dtype=np.int8, count=len(trades))
+
+
+def _report(total_trades, wins, losses, total_profit, std, max_gain, max_loss, max_drawdown,
+            peak, gross_profit, gross_loss, max_consecutive_losses):
+    """Report dict from the aggregate statistics (shared by summarize and RunningSummary)."""
+    win_rate = wins / total_trades
+    avg_return = total_profit / total_trades
+
     # ===== SHARPE RATIO (Risk-adjusted return) =====
     # Assuming risk-free rate = 0 for simplicity
-    if len(returns) > 1:
-        sharpe_ratio = (avg_return / returns.std()) if returns.std() > 0 else 0
-    else:
-        sharpe_ratio = 0
-    
-    # ===== MAX DRAWDOWN =====
-    cumulative_pnl = [0]
-    running_pnl = 0
-    for ret in returns:
-        running_pnl += ret
-        cumulative_pnl.append(running_pnl)
-    
-    cumulative_pnl = np.array(cumulative_pnl)
-    running_max = np.maximum.accumulate(cumulative_pnl)
-    drawdown = cumulative_pnl - running_max
-    max_drawdown = drawdown.min() if len(drawdown) > 0 else 0
-    max_drawdown_pct = (max_drawdown / running_max[-1] * 100) if running_max[-1] != 0 else 0
-    
-    # ===== RECOVERY FACTOR =====
-    total_profit = returns.sum()
+    sharpe_ratio = avg_return / std if total_trades > 1 and std > 0 else 0
+
+    # ===== MAX DRAWDOWN / RECOVERY / PROFIT FACTOR =====
+    max_drawdown_pct = (max_drawdown / peak * 100) if peak != 0 else 0
     recovery_factor = total_profit / abs(max_drawdown) if max_drawdown != 0 else 0
-    
-    # ===== PROFIT FACTOR =====
-    gross_profit = returns[returns > 0].sum() if len(returns[returns > 0]) > 0 else 0
-    gross_loss = abs(returns[returns < 0].sum()) if len(returns[returns < 0]) > 0 else 0
     profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-    
-    # ===== CONSECUTIVE LOSSES =====
-    consecutive_losses = 0
-    max_consecutive_losses = 0
-    for ret in returns:
-        if ret < 0:
-            consecutive_losses += 1
-            max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-        else:
-            consecutive_losses = 0
-    
+
     # ===== EXPECTANCY (Edge verification) =====
-    avg_win = returns[returns > 0].mean() if len(returns[returns > 0]) > 0 else 0
-    avg_loss = returns[returns < 0].mean() if len(returns[returns < 0]) > 0 else 0
+    avg_win = gross_profit / wins if wins > 0 else 0
+    avg_loss = -gross_loss / losses if losses > 0 else 0
     expectancy = (win_rate * avg_win) + ((1 - win_rate) * avg_loss)
-    
+
     return {
         "total_trades": total_trades,
         "wins": wins,
@@ -101,19 +81,164 @@ def summarize(trades, initial_capital=100_000_000):
         "avg_return_pct": round(avg_return, 2),
         "max_gain_pct": round(max_gain, 2),
         "max_loss_pct": round(max_loss, 2),
-        
+
         # Risk-adjusted metrics
         "sharpe_ratio": round(sharpe_ratio, 2),
         "max_drawdown_pct": round(max_drawdown_pct, 2),
         "recovery_factor": round(recovery_factor, 2),
         "profit_factor": round(profit_factor, 2),
-        
+
         # Robustness metrics
         "max_consecutive_losses": max_consecutive_losses,
         "expectancy": round(expectancy, 2),
         "total_profit_pct": round(total_profit, 2),
-        
+
         # Institutional note
         "institution_ready": win_rate >= 0.55 and recovery_factor >= 2.0
     }
 
+
+def summarize(trades, initial_capital=100_000_000):
+    """
+    Generate comprehensive backtest report with institutional-grade metrics.
+
+    Metrics include:
+    - Win rate, avg return, max gain/loss (basic)
+    - Sharpe ratio, max drawdown (risk-adjusted)
+    - Recovery factor, profit factor (robustness)
+    - Consecutive losses (psychological limit)
+    - Expectancy (edge verification)
+
+    All metrics come from one vectorized pass over the return column; a
+    TradeLedger is read as-is, so large sweeps never build per-trade dicts.
+
+    When the trades carry a direction (long/short backtest), the report also
+    has "by_direction": {"LONG": report, "SHORT": report} over each book.
+
+    Args:
+        trades: TradeLedger, list of trade dicts with "return_pct", or an array of returns in percent
+        initial_capital: Starting capital for drawdown calculation
+
+    Returns:
+        dict with comprehensive performance metrics
+    """
+    returns = trade_returns(trades)
+    if returns.size == 0:
+        return dict(_NO_TRADES)
+
+    report = _summarize_returns(returns)
+    directions = trade_directions(trades)
+    if directions is not None:
+        report["by_direction"] = {
+            label: _summarize_returns(returns[directions == side]) if (directions == side).any() else dict(_NO_TRADES)
+            for side, label in DIRECTIONS.items()
+        }
+    return report
+
+
+def _summarize_returns(returns: np.ndarray):
+    """summarize() report for a non-empty array of returns in percent."""
+    win_mask, loss_mask = returns > 0, returns < 0
+    wins, losses = int(np.count_nonzero(win_mask)), int(np.count_nonzero(loss_mask))
+
+    # Cumulative PnL (starting at 0) and its running peak
+    cumulative = np.concatenate(([0.0], np.cumsum(returns)))
+    running_max = np.maximum.accumulate(cumulative)
+
+    return _report(
+        total_trades=int(returns.size),
+        wins=wins,
+        losses=losses,
+        total_profit=returns.sum(),
+        std=returns.std(),
+        max_gain=returns.max(),
+        max_loss=returns.min(),
+        max_drawdown=(cumulative - running_max).min(),
+        peak=running_max[-1],
+        gross_profit=returns[win_mask].sum(),
+        gross_loss=-returns[loss_mask].sum(),
+        max_consecutive_losses=longest_run(loss_mask),
+    )
+
+
+class RunningSummary:
+    """
+    summarize() maintained trade by trade, for live paper trading.
+
+    Each update is O(1) (Welford mean/variance, running peak and drawdown,
+    loss streak); summary() returns the summarize() report over all trades
+    seen so far (equal up to the last rounded digit).
+
+    Example:
+        running = RunningSummary()
+        running.update(2.5)
+        running.update(-1.2)
+        running.summary()["win_rate"]   # 50.0
+    """
+
+    def __init__(self):
+        self.total_trades = 0
+        self.wins = 0
+        self.losses = 0
+        self.total_profit = 0.0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.max_gain = -math.inf
+        self.max_loss = math.inf
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.loss_streak = 0
+        self.max_consecutive_losses = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, return_pct: float) -> "RunningSummary":
+        """Add one closed trade's return in percent."""
+        ret = float(return_pct)
+        self.total_trades += 1
+        delta = ret - self._mean
+        self._mean += delta / self.total_trades
+        self._m2 += delta * (ret - self._mean)
+
+        self.total_profit += ret
+        self.max_gain = max(self.max_gain, ret)
+        self.max_loss = min(self.max_loss, ret)
+        if ret > 0:
+            self.wins += 1
+            self.gross_profit += ret
+        if ret < 0:
+            self.losses += 1
+            self.gross_loss -= ret
+            self.loss_streak += 1
+            self.max_consecutive_losses = max(self.max_consecutive_losses, self.loss_streak)
+        else:
+            self.loss_streak = 0
+
+        self.peak = max(self.peak, self.total_profit)
+        self.max_drawdown = min(self.max_drawdown, self.total_profit - self.peak)
+        return self
+
+    def extend(self, trades) -> "RunningSummary":
+        """Add several trades (TradeLedger, trade dicts or returns)."""
+        for ret in trade_returns(trades).tolist():
+            self.update(ret)
+        return self
+
+    def summary(self):
+        """Report dict in the summarize() format."""
+        if self.total_trades == 0:
+            return dict(_NO_TRADES)
+        return _report(
+            total_trades=self.total_trades,
+            wins=self.wins,
+            losses=self.losses,
+            total_profit=self.total_profit,
+            std=math.sqrt(max(self._m2 / self.total_trades, 0.0)),
+            max_gain=self.max_gain,
+            max_loss=self.max_loss,
+            max_drawdown=self.max_drawdown,
+            peak=self.peak,
+            gross_profit=self.gross_profit,
+            gross_loss=self.gross_loss,
+            max_consecutive_losses=self.max_consecutive_losses,
+        )
@@ -0,0 +1,290 @@
+"""
+Parameter sweep over signal thresholds and stop/target levels.
+
+Each symbol is scored once (add_indicators + decision_scores); every grid
+point then only re-thresholds the cached score series into signal codes and
+replays the long-only rules with trade_rows. Threshold sets that map the
+history to the same codes share one set of backtests, and symbols are spread
+across worker processes.
+
+Per-symbol results are reduced to additive statistics (trade count, wins,
+sums of returns ...) so the universe-wide table is a sum over symbols. Each
+backtest is also marked to market (backtest/metrics.py, net of transaction
+costs) for the per-symbol average annualized Sharpe and exposure.
+"""
+
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from config import BACKTEST_THRESHOLDS, SIGNAL_CONFIG, SWEEP_CONFIG, TRADING_STYLES
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import BACKTEST_THRESHOLDS, SIGNAL_CONFIG, SWEEP_CONFIG, TRADING_STYLES
+
+from backtest.metrics import batch_equity_stats
+from backtest.vector_backtest import BUY, OTHER, SELL, SHORT, SKIP, trade_rows
+from engine.decision import decision_scores
+from indicators.technical import add_indicators
+
+GRID_KEYS = ["buy_threshold", "sell_threshold", "short_threshold", "stop_pct", "target_pct"]
+
+RANK_FIELDS = ["sharpe_ratio", "expectancy", "avg_return_pct", "total_return_pct",
+               "win_rate", "profit_factor", "total_trades", "avg_equity_sharpe"]
+
+# Additive per-symbol statistics, in column order
+_STATS = ["trades", "wins", "losses", "sum", "sum_sq", "gross_profit", "gross_loss", "max_drawdown",
+          "symbols", "equity_sharpe", "exposure_pct", "equity_drawdown"]
+# Statistics pooled with min() instead of a sum
+_MIN_STATS = [_STATS.index("max_drawdown"), _STATS.index("equity_drawdown")]
+
+
+# ===== GRID =====
+
+def default_grid() -> Dict[str, List[float]]:
+    """SWEEP_CONFIG grid plus the configured SIGNAL_CONFIG / TRADING_STYLES thresholds."""
+    buys = set(SWEEP_CONFIG["BUY_THRESHOLDS"]) | {SIGNAL_CONFIG["BUY_THRESHOLD"]}
+    sells = set(SWEEP_CONFIG["SELL_THRESHOLDS"]) | {SIGNAL_CONFIG["SELL_THRESHOLD"]}
+    for style in TRADING_STYLES.values():
+        buys.add(style["buy_threshold"])
+        sells.add(style["sell_threshold"])
+    return {
+        "buy_threshold": sorted(buys),
+        "sell_threshold": sorted(sells),
+        "short_threshold": sorted(set(SWEEP_CONFIG["SHORT_THRESHOLDS"]) | {SIGNAL_CONFIG["SHORT_THRESHOLD"]}),
+        "stop_pct": sorted(SWEEP_CONFIG["STOP_PCTS"]),
+        "target_pct": sorted(SWEEP_CONFIG["TARGET_PCTS"]),
+    }
+
+
+def grid_points(grid: Dict[str, List[float]]) -> List[tuple]:
+    """
+    All (buy, sell, short, stop_pct, target_pct) combinations, in GRID_KEYS order.
+
+    Threshold sets that are not ordered short < sell < buy are dropped: the
+    classifier would never emit the lower signal for them.
+    """
+    return [
+        point for point in itertools.product(*(grid[key] for key in GRID_KEYS))
+        if point[2] < point[1] < point[0]
+    ]
+
+
+def style_labels(buy: float, sell: float, short: float) -> str:
+    """Names of the configured settings (default + TRADING_STYLES) a threshold set reproduces."""
+    if short != SIGNAL_CONFIG["SHORT_THRESHOLD"]:
+        return ""
+    labels = []
+    if (buy, sell) == (SIGNAL_CONFIG["BUY_THRESHOLD"], SIGNAL_CONFIG["SELL_THRESHOLD"]):
+        labels.append("default")
+    labels += [name for name, style in TRADING_STYLES.items()
+               if (buy, sell) == (style["buy_threshold"], style["sell_threshold"])]
+    return ",".join(labels)
+
+
+# ===== PER-SYMBOL =====
+
+def classify_codes(score, buy_threshold, sell_threshold, short_threshold, warmup=0) -> np.ndarray:
+    """
+    Signal codes for the backtester straight from raw scores.
+
+    Same precedence as classify_scores (BUY, then SHORT, then SELL), matching
+    encode_signals of the classified signals; warmup bars are SKIP as in
+    scripts/run_backtest.prepare_backtest.
+    """
+    score = np.asarray(score)
+    codes = np.full(score.shape, OTHER, dtype=np.int8)
+    codes[(score <= sell_threshold) & (score > short_threshold)] = SELL
+    codes[score <= short_threshold] = SHORT
+    codes[score >= buy_threshold] = BUY
+    codes[:min(warmup, len(codes))] = SKIP
+    return codes
+
+
+def trade_stats(returns, equity: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Additive statistics (_STATS order) for one symbol's trade returns in percent.
+
+    Args:
+        returns: Trade returns in percent
+        equity: The backtest's equity metrics (sharpe_ratio, exposure_pct,
+            max_drawdown_pct), for the equity columns (zeros if omitted)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    stats = np.zeros(len(_STATS))
+    stats[_STATS.index("symbols")] = 1
+    if equity is not None:
+        stats[-3:] = equity["sharpe_ratio"], equity["exposure_pct"], equity["max_drawdown_pct"]
+    if returns.size == 0:
+        return stats
+    cumulative = np.concatenate(([0.0], np.cumsum(returns)))
+    drawdown = cumulative - np.maximum.accumulate(cumulative)
+    wins, losses = returns > 0, returns < 0
+    stats[:8] = (
+        returns.size, wins.sum(), losses.sum(), returns.sum(), (returns * returns).sum(),
+        returns[wins].sum(), -returns[losses].sum(), drawdown.min(),
+    )
+    return stats
+
+
+def sweep_scores(score, prices, points, warmup=None) -> np.ndarray:
+    """
+    Evaluate grid points against one cached score series.
+
+    Args:
+        score: Raw decision scores (one per bar)
+        prices: Close prices (one per bar)
+        points: Grid points from grid_points
+        warmup: Leading bars without a signal (defaults to SWEEP_CONFIG WARMUP_BARS)
+
+    Returns:
+        (len(points), len(_STATS)) array of additive statistics
+    """
+    warmup = SWEEP_CONFIG.get("WARMUP_BARS", 50) if warmup is None else warmup
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.zeros((len(points), len(_STATS)))
+
+    # Thresholds only matter through the codes they produce; scores move in
+    # 0.5 steps, so many threshold sets collapse onto the same code array
+    by_codes: Dict[bytes, np.ndarray] = {}
+    rows: Dict[bytes, Dict[tuple, List[int]]] = {}
+    for i, (buy, sell, short, stop_pct, target_pct) in enumerate(points):
+        codes = classify_codes(score, buy, sell, short, warmup)
+        key = codes.tobytes()
+        by_codes.setdefault(key, codes)
+        rows.setdefault(key, {}).setdefault((stop_pct, target_pct), []).append(i)
+
+    with_equity = SWEEP_CONFIG.get("EQUITY_METRICS", True)
+    for key, codes in by_codes.items():
+        variants = rows[key]
+        trade_sets = [trade_rows(codes, prices, stop_pct, target_pct) for stop_pct, target_pct in variants]
+        # Every (stop, target) variant of these codes is marked to market in one 2-D pass
+        equity = batch_equity_stats(prices, trade_sets) if with_equity else None
+        for j, ((entries, exits), indices) in enumerate(zip(trade_sets, variants.values())):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                change = (prices[exits] - prices[entries]) / prices[entries] * 100
+            row_equity = {name: values[j] for name, values in equity.items()} if with_equity else None
+            out[indices] = trade_stats(np.round(change, 2), row_equity)
+    return out
+
+
+def _sweep_symbol(task):
+    """Worker entry point: (symbol, OHLCV frame, points, warmup) -> (symbol, stats or None)."""
+    symbol, df, points, warmup = task
+    if df is None or len(df) <= warmup:
+        return symbol, None
+    df = add_indicators(df.copy())
+    return symbol, sweep_scores(decision_scores(df), df["Close"].to_numpy(dtype=np.float64), points, warmup)
+
+
+# ===== UNIVERSE =====
+
+def _summary_table(points, totals, symbols_traded) -> pd.DataFrame:
+    """Turn summed statistics into the report columns used by backtest.report.summarize."""
+    table = pd.DataFrame(points, columns=GRID_KEYS)
+    table.insert(5, "styles", [style_labels(*p[:3]) for p in points])
+    stats = dict(zip(_STATS, totals.T))
+    trades, wins, losses = stats["trades"], stats["wins"], stats["losses"]
+    symbols = np.maximum(stats["symbols"], 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_rate = np.where(trades > 0, wins / trades, 0.0)
+        mean = np.where(trades > 0, stats["sum"] / trades, 0.0)
+        std = np.sqrt(np.maximum(np.where(trades > 0, stats["sum_sq"] / trades, 0.0) - mean ** 2, 0.0))
+        sharpe = np.where((trades > 1) & (std > 0), mean / std, 0.0)
+        profit_factor = np.where(stats["gross_loss"] > 0, stats["gross_profit"] / stats["gross_loss"], 0.0)
+        avg_win = np.where(wins > 0, stats["gross_profit"] / wins, 0.0)
+        avg_loss = np.where(losses > 0, -stats["gross_loss"] / losses, 0.0)
+    expectancy = win_rate * avg_win + (1 - win_rate) * avg_loss
+
+    table["symbols_traded"] = symbols_traded
+    table["total_trades"] = trades.astype(np.int64)
+    table["win_rate"] = np.round(win_rate * 100, 2)
+    table["avg_return_pct"] = np.round(mean, 2)
+    table["total_return_pct"] = np.round(stats["sum"], 2)
+    table["sharpe_ratio"] = np.round(sharpe, 2)
+    table["profit_factor"] = np.round(profit_factor, 2)
+    table["expectancy"] = np.round(expectancy, 2)
+    table["worst_symbol_drawdown_pct"] = np.round(stats["max_drawdown"], 2)
+    # Bar-level equity (net of costs), averaged over symbols
+    table["avg_equity_sharpe"] = np.round(stats["equity_sharpe"] / symbols, 2)
+    table["avg_exposure_pct"] = np.round(stats["exposure_pct"] / symbols, 2)
+    table["worst_equity_drawdown_pct"] = np.round(stats["equity_drawdown"], 2)
+    return table
+
+
+def rank_results(table: pd.DataFrame, rank_by: Optional[str] = None,
+                 min_trades: Optional[int] = None) -> pd.DataFrame:
+    """
+    Sort a sweep table best-first and number it.
+
+    Grid points with fewer than `min_trades` trades (default
+    BACKTEST_THRESHOLDS MIN_TRADES_FOR_VALIDATION) rank after all others.
+
+    Raises:
+        ValueError: rank_by is not one of RANK_FIELDS
+    """
+    rank_by = rank_by or SWEEP_CONFIG.get("RANK_BY", "sharpe_ratio")
+    if rank_by not in RANK_FIELDS:
+        raise ValueError(f"rank_by must be one of {RANK_FIELDS}")
+    min_trades = BACKTEST_THRESHOLDS.get("MIN_TRADES_FOR_VALIDATION", 20) if min_trades is None else min_trades
+
+    ranked = table.assign(_valid=table["total_trades"] >= min_trades)
+    ranked = ranked.sort_values(["_valid", rank_by, "total_trades"], ascending=False, kind="stable")
+    ranked = ranked.drop(columns="_valid").reset_index(drop=True)
+    ranked.insert(0, "rank", np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+def run_sweep(frames: Dict[str, pd.DataFrame], grid: Optional[Dict[str, List[float]]] = None,
+              workers: Optional[int] = None, warmup: Optional[int] = None,
+              rank_by: Optional[str] = None, min_trades: Optional[int] = None) -> pd.DataFrame:
+    """
+    Backtest every grid point on every symbol and rank the pooled results.
+
+    Args:
+        frames: {symbol: OHLCV DataFrame}
+        grid: {GRID_KEYS name: values}; defaults to default_grid()
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        warmup: Leading bars without a signal (default SWEEP_CONFIG WARMUP_BARS)
+        rank_by / min_trades: Passed to rank_results
+
+    Returns:
+        Ranked DataFrame, one row per grid point
+    """
+    grid = grid or default_grid()
+    warmup = SWEEP_CONFIG.get("WARMUP_BARS", 50) if warmup is None else warmup
+    points = grid_points(grid)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(frames) or 1))
+    tasks = [(symbol, df, points, warmup) for symbol, df in frames.items()]
+
+    print(f"🔎 Sweep: {len(points)} grid points x {len(tasks)} symbols on {workers} worker(s)")
+    totals = np.zeros((len(points), len(_STATS)))
+    symbols_traded = np.zeros(len(points), dtype=np.int64)
+
+    def _collect(results):
+        for symbol, stats in results:
+            if stats is None:
+                print(f"⚠️  {symbol}: not enough data, skipped")
+                continue
+            drawdowns = np.minimum(totals[:, _MIN_STATS], stats[:, _MIN_STATS])
+            totals[:] += stats
+            totals[:, _MIN_STATS] = drawdowns
+            symbols_traded[:] += stats[:, 0] > 0
+
+    if workers == 1:
+        _collect(map(_sweep_symbol, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _collect(pool.map(_sweep_symbol, tasks))
+
+    return rank_results(_summary_table(points, totals, symbols_traded), rank_by, min_trades)
@@ -0,0 +1,254 @@
+"""
+Array-based backtester.
+
+The long book follows the same rules and produces the same trade list as
+backtest.simple_backtest.backtest, but is driven by plain NumPy arrays:
+signals are encoded once into small integer codes, rows without a signal are
+dropped up front, and each position jumps straight to its exit instead of
+visiting every bar:
+
+- entry: first BUY at or after the current row (bisect over BUY rows)
+- exit: the earlier of the next SELL (bisect over SELL rows) and the first
+  bar whose close breaches the stop or target: the first few bars are checked
+  as plain floats, longer holds with a vectorized scan over growing chunks
+
+With short=True a separate short book runs the mirrored rules on the same
+codes: SHORT opens, BUY covers, and the stop / target sit above / below the
+entry with their own percentages. The books are independent (each holds at
+most one position) and their trades are tagged with a direction.
+
+Work is proportional to the number of trades plus the bars spent in a
+position, so a 10-year history is a few hundred array operations; the short
+book only adds the work of its own (rarer) trades.
+
+Trades are recorded in a columnar TradeLedger (backtest/ledger.py);
+backtest_arrays / vector_backtest convert it to the classic trade dicts.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    from backtest.ledger import LONG_SIDE, SHORT_SIDE, TradeLedger
+    from backtest.metrics import equity_curve
+    from backtest.simple_backtest import _normalize_signal
+except ImportError:  # imported as part of the package
+    from .ledger import LONG_SIDE, SHORT_SIDE, TradeLedger
+    from .metrics import equity_curve
+    from .simple_backtest import _normalize_signal
+
+# Signal codes
+SKIP, OTHER, BUY, SELL, SHORT = -1, 0, 1, 2, 3
+
+_CODES = {"BUY": BUY, "SELL": SELL, "SHORT": SHORT}
+
+# Bars checked with scalar floats before switching to vectorized chunks
+_SCALAR_BARS = 16
+_FIRST_CHUNK = 64
+
+
+def encode_signals(signals) -> np.ndarray:
+    """
+    Encode a signal column into int8 codes.
+
+    None -> SKIP (row ignored, as in simple_backtest), "BUY" -> BUY, "SELL" -> SELL,
+    "SHORT" -> SHORT, anything else (HOLD, NaN, ...) -> OTHER. Non-string values go
+    through _normalize_signal first, so list/array cells behave exactly like the reference.
+    The long rules only look at BUY and SELL, so SHORT rows are "other" for them.
+    """
+    if isinstance(signals, pd.Series):
+        values = signals.to_numpy(dtype=object)
+    else:
+        signals = list(signals)
+        values = np.fromiter(signals, dtype=object, count=len(signals))  # keeps list cells as objects
+    codes = np.full(len(values), OTHER, dtype=np.int8)
+    codes[values == "BUY"] = BUY
+    codes[values == "SELL"] = SELL
+    codes[values == "SHORT"] = SHORT
+
+    odd = np.flatnonzero(np.fromiter((v is None or not isinstance(v, str) for v in values),
+                                     dtype=bool, count=len(values)))
+    for i in odd:
+        sig = _normalize_signal(values[i])
+        codes[i] = SKIP if sig is None else _CODES.get(sig, OTHER) if isinstance(sig, str) else OTHER
+    return codes
+
+
+def _first_breach(prices, price_list, start, stop, entry_price, lower, upper):
+    """
+    First row in [start, stop) whose change from entry is at or beyond a bound, else None.
+
+    lower / upper are fractional price changes: (-stop, +target) for a long,
+    (-target, +stop) for a short.
+    """
+    # Most positions close within a few bars: check those with plain floats first
+    head = min(stop, start + _SCALAR_BARS)
+    if entry_price != 0:
+        for j in range(start, head):
+            change = (price_list[j] - entry_price) / entry_price
+            if change <= lower or change >= upper:
+                return j
+        start = head
+
+    chunk = _FIRST_CHUNK
+    lo = start
+    while lo < stop:
+        hi = min(stop, lo + chunk)
+        change = (prices[lo:hi] - entry_price) / entry_price
+        hit = np.flatnonzero((change <= lower) | (change >= upper))
+        if hit.size:
+            return lo + int(hit[0])
+        lo = hi
+        chunk *= 2
+    return None
+
+
+def _compact(codes, prices):
+    """Rows without a signal never affect state; drop them once. Returns (rows, codes, prices, price list)."""
+    codes = np.asarray(codes, dtype=np.int8)
+    prices = np.asarray(prices, dtype=np.float64)
+    rows = np.flatnonzero(codes != SKIP)
+    prices = prices[rows]
+    return rows, codes[rows], prices, prices.tolist()
+
+
+def _walk(opens, closes, prices, price_list, lower, upper):
+    """
+    One book over compacted rows: (entries, exits) as compacted positions.
+
+    opens / closes are sorted lists of the rows whose signal opens / closes the
+    book's position; lower / upper are the exit bounds for _first_breach.
+    """
+    n = len(price_list)
+    entries, exits = [], []
+    pos = 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        while True:
+            k = bisect_left(opens, pos)
+            if k >= len(opens):
+                break
+            entry = opens[k]
+
+            # Exit checks start on the bar after entry; the next closing signal bounds the scan
+            k = bisect_left(closes, entry + 1)
+            next_close = closes[k] if k < len(closes) else n
+            exit_ = _first_breach(prices, price_list, entry + 1, next_close, price_list[entry], lower, upper)
+            if exit_ is None:
+                if next_close >= n:
+                    break  # still open at the end of the data: not reported
+                exit_ = next_close
+
+            entries.append(entry)
+            exits.append(exit_)
+            pos = exit_ + 1
+    return np.array(entries, dtype=np.intp), np.array(exits, dtype=np.intp)
+
+
+def trade_rows(codes, prices, stop_pct: float = 0.05, target_pct: float = 0.10, side: int = LONG_SIDE):
+    """
+    Entry and exit bar positions of every closed trade of one book.
+
+    Args:
+        codes: Signal codes from encode_signals (one per bar)
+        prices: Close prices (one per bar; NaN allowed)
+        stop_pct / target_pct: Stop loss and profit target as fractions (of adverse / favourable moves)
+        side: LONG_SIDE (BUY opens, SELL closes) or SHORT_SIDE (SHORT opens, BUY covers)
+
+    Returns:
+        (entries, exits) int arrays of bar positions in the original arrays
+    """
+    rows, codes, prices, price_list = _compact(codes, prices)
+    if side == LONG_SIDE:
+        open_code, close_code, lower, upper = BUY, SELL, -stop_pct, target_pct
+    else:
+        open_code, close_code, lower, upper = SHORT, BUY, -target_pct, stop_pct
+    entries, exits = _walk(np.flatnonzero(codes == open_code).tolist(), np.flatnonzero(codes == close_code).tolist(),
+                           prices, price_list, lower, upper)
+    return rows[entries], rows[exits]
+
+
+def backtest_ledger(codes, prices, index=None, stop_pct: float = 0.05, target_pct: float = 0.10,
+                    short: bool = False, short_stop_pct: float = 0.05,
+                    short_target_pct: float = 0.10) -> TradeLedger:
+    """
+    Run the backtest rules over encoded signals and close prices.
+
+    Args:
+        codes: Signal codes from encode_signals (one per bar)
+        prices: Close prices (one per bar; NaN allowed)
+        index: Bar labels used for entry/exit dates (defaults to positions)
+        stop_pct: Exit a long when the close is this fraction below entry (0.05 = -5%)
+        target_pct: Exit a long when the close is this fraction above entry (0.10 = +10%)
+        short: Also run the short book (SHORT opens, BUY covers)
+        short_stop_pct: Cover a short when the close is this fraction above entry
+        short_target_pct: Cover a short when the close is this fraction below entry
+
+    Returns:
+        TradeLedger of the closed trades; with short=True it has a direction
+        column and holds both books ordered by entry bar
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if not short:
+        entries, exits = trade_rows(codes, prices, stop_pct, target_pct)
+        return TradeLedger.from_rows(entries, exits, prices, index)
+
+    # Both books walk the same compacted rows; BUY rows open longs and cover shorts
+    rows, compact, compact_prices, price_list = _compact(codes, prices)
+    buys = np.flatnonzero(compact == BUY).tolist()
+    long_entries, long_exits = _walk(buys, np.flatnonzero(compact == SELL).tolist(),
+                                     compact_prices, price_list, -stop_pct, target_pct)
+    short_entries, short_exits = _walk(np.flatnonzero(compact == SHORT).tolist(), buys,
+                                       compact_prices, price_list, -short_target_pct, short_stop_pct)
+
+    direction = np.repeat(np.array([LONG_SIDE, SHORT_SIDE], dtype=np.int8), [len(long_entries), len(short_entries)])
+    entries = rows[np.concatenate([long_entries, short_entries])]
+    exits = rows[np.concatenate([long_exits, short_exits])]
+    order = np.lexsort((exits, entries))
+    return TradeLedger.from_rows(entries[order], exits[order], prices, index, direction=direction[order])
+
+
+def backtest_arrays(codes, prices, index=None, stop_pct: float = 0.05,
+                    target_pct: float = 0.10) -> List[Dict]:
+    """
+    backtest_ledger as a list of trade dicts (entry_date, exit_date, entry_price,
+    exit_price, return_pct), identical to simple_backtest.backtest for the same inputs.
+    """
+    return backtest_ledger(codes, prices, index, stop_pct, target_pct).to_trades()
+
+
+def vector_backtest(df: pd.DataFrame, initial_capital=100_000_000, stop_pct: float = 0.05,
+                    target_pct: float = 0.10, as_ledger: bool = False, equity: bool = False,
+                    cost_pct: float = None, short: bool = False, short_stop_pct: float = 0.05,
+                    short_target_pct: float = 0.10):
+    """
+    Drop-in replacement for simple_backtest.backtest on a DataFrame with "signal" and "Close".
+
+    Args:
+        df: DataFrame with a "signal" column (None = no signal) and "Close"
+        initial_capital: Accepted for signature compatibility (unused, as in backtest)
+        stop_pct / target_pct: Stop loss and profit target of the long book as fractions
+        short / short_stop_pct / short_target_pct: Short book, as in backtest_ledger
+        as_ledger: Return the TradeLedger instead of trade dicts
+        equity: Also return the bar-level EquityCurve (backtest/metrics.py)
+        cost_pct: Cost per fill for the equity curve (default INSTITUTIONAL_CONFIG TRANSACTION_COST_PCT)
+
+    Returns:
+        List of trade dicts identical to simple_backtest.backtest(df) (plus the short
+        trades and a "direction" key when short=True), or a TradeLedger;
+        (trades, EquityCurve) when equity=True
+    """
+    close = df["Close"]
+    if getattr(close, "ndim", 1) > 1:
+        close = close.iloc[:, -1]
+    prices = pd.to_numeric(close, errors="coerce").to_numpy(dtype=np.float64)
+    ledger = backtest_ledger(encode_signals(df["signal"]), prices, df.index,
+                             stop_pct=stop_pct, target_pct=target_pct, short=short,
+                             short_stop_pct=short_stop_pct, short_target_pct=short_target_pct)
+    trades = ledger if as_ledger else ledger.to_trades()
+    if equity:
+        return trades, equity_curve(prices, ledger.entry_idx, ledger.exit_idx, cost_pct, df.index,
+                                    direction=ledger.direction)
+    return trades
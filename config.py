@@ -37,7 +37,8 @@ BACKTEST_THRESHOLDS = {
 # ===== INSTITUTIONAL REQUIREMENTS =====
 INSTITUTIONAL_CONFIG = {
     "INCLUDE_TRANSACTION_COSTS": True,      # Account for fees/slippage
-    "TRANSACTION_COST_PCT": 0.05,           # 0.05% per trade
+    "TRANSACTION_COST_PCT": 0.05,           # 0.05% per fill (entry and exit), charged on the equity curve
+    "TRADING_DAYS_PER_YEAR": 252,           # Annualization of bar-level metrics (backtest/metrics.py)
     "MIN_LIQUIDITY_VOLUME_USD": 100_000,    # Only liquid stocks
     "EXCLUDE_HALTED_STOCKS": True,
     "LOG_ALL_SIGNALS": True,                # Audit trail
@@ -47,8 +48,20 @@ INSTITUTIONAL_CONFIG = {
 DATA_CONFIG = {
     "PRIMARY_SOURCE": "yfinance",
     "FALLBACK_SOURCE": "None",  # Add fallback if needed
-    "LOOKBACK_PERIOD": "10y",    # Historical data window (10 years for comprehensive analysis)
+    "LOOKBACK_PERIOD": "1y",     # Default window for /signal, /portfolio, /analysis and the screener (longer history: STORE_HISTORY_PERIOD / period=)
     "MAX_DATA_POINTS": 2520,     # Approximately 252 trading days * 10 years
+    # Local price store (data/price_store.py): history is downloaded once, then only new bars
+    "PRICE_STORE_DIR": None,            # None = data/price_store/ inside the repo
+    "STORE_HISTORY_PERIOD": "10y",      # Minimum history seeded per symbol; shorter lookbacks are local slices
+    "STORE_REFRESH_MINUTES": 60,        # Re-check upstream for new bars at most this often per symbol
+    # Fundamentals snapshots (data/fundamentals_store.py, SQLite)
+    "FUNDAMENTALS_DB": None,            # None = data/fundamentals.db inside the repo
+    # Concurrent Yahoo fundamentals refresh (data/fetchers/fundamentals_refresher.py)
+    "FUNDAMENTALS_REFRESH_WORKERS": 8,
+    "FUNDAMENTALS_RATE_PER_SECOND": 4.0,   # Token bucket shared by every refresh in the process
+    "FUNDAMENTALS_RATE_BURST": 8,
+    "FUNDAMENTALS_RETRIES": 2,             # Extra attempts per symbol after a failure
+    "FUNDAMENTALS_BACKOFF_SECONDS": 1.0,   # Doubled after every failed attempt (plus jitter)
 }
 
 # ===== SUPPORTED STOCKS =====
@@ -190,10 +203,72 @@ SUPPORTED_STOCKS.update({
 """
 
 # ===== DATA CONFIGURATION =====
-DATA_CONFIG = {
+# Extends DATA_CONFIG above (a second dict literal here used to replace it wholesale)
+DATA_CONFIG.update({
     "TIMEZONE": "Asia/Jakarta",
     "MARKET": "Indonesia (IDX)",
     "DATA_POINTS_TARGET": 250,   # Approximately 250 trading days per year
+})
+
+# ===== SCREENER =====
+SCREENER_CONFIG = {
+    "AUTO_REFRESH": True,          # Rebuild the signal table in the background after market close
+    "REFRESH_AFTER": "16:30",      # Local market time (IDX closes 16:00 WIB; leave room for EOD bars)
+    "TIMEZONE": "Asia/Jakarta",
+    "TABLE_PATH": None,            # None = data/screener_table.json inside the repo
+    "DEFAULT_LIMIT": 50,
+}
+
+# ===== EOD PIPELINE =====
+# After-close precompute (engine/eod_pipeline.py): sync bars -> signals
+# (warms the signal cache) -> screener table -> stale fundamentals, then
+# publish a versioned snapshot for request handlers.
+EOD_CONFIG = {
+    "AUTO_RUN": True,              # Runs the screener rebuild too; off = screener-only refresher
+    "RUN_AFTER": "16:30",          # Local market time (DATA_CONFIG TIMEZONE)
+    "SNAPSHOT_PATH": None,         # None = data/eod_snapshot.json inside the repo
+    "REFRESH_FUNDAMENTALS": True,  # Re-fetch Yahoo fundamentals older than CACHE_AGE_HOURS
+}
+
+# ===== WEBHOOKS =====
+# Signal-change notifications (engine/webhooks.py). Fresh signals are diffed
+# against the last one seen per ticker; matching events are POSTed by an
+# asyncio worker pool on its own thread, so fan-out never blocks scoring.
+WEBHOOK_CONFIG = {
+    "ENABLED": True,
+    "DB_PATH": None,               # None = data/webhooks.db inside the repo
+    "WORKERS": 32,                 # Concurrent deliveries
+    "MAX_CONNECTIONS": 100,        # Pooled keep-alive connections shared by the workers
+    "QUEUE_SIZE": 10000,           # Pending deliveries before fan-out waits
+    "TIMEOUT_SECONDS": 5.0,
+    "MAX_ATTEMPTS": 4,             # Then the delivery is dead-lettered
+    "BACKOFF_SECONDS": 1.0,        # Doubled after every failed attempt
+    "PRICE_ALERT_PCT": 5.0,        # |daily change| that triggers price_alert
+}
+
+# ===== SIGNAL CACHE =====
+# (ticker, lookback, last bar) -> indicator frame + decision, see engine/signal_service.py
+SIGNAL_CACHE_CONFIG = {
+    "ENABLED": True,
+    "TTL_SECONDS": 3600,           # Max entry age (latest_signal also syncs the price store every STORE_REFRESH_MINUTES)
+    "MAX_BYTES": 256 * 1024 * 1024,  # LRU eviction above this estimated size
+    "DISK_DIR": None,              # Shared on-disk tier (e.g. "data/signal_cache"); None = memory only
+    "DISK_TTL_SECONDS": 6 * 3600,
+}
+
+# ===== PARAMETER SWEEP =====
+# Default grid for backtest/sweep.py (scripts/run_sweep.py). SIGNAL_CONFIG and
+# TRADING_STYLES thresholds are always added, so current settings get ranked too.
+SWEEP_CONFIG = {
+    "BUY_THRESHOLDS": [3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0],
+    "SELL_THRESHOLDS": [-3.0, -2.5, -2.0, -1.5, -1.0, -0.5, 0.0],
+    "SHORT_THRESHOLDS": [-7.0, -6.0, -5.0, -4.0],
+    "STOP_PCTS": [0.03, 0.05, 0.08],
+    "TARGET_PCTS": [0.06, 0.10, 0.15, 0.20],
+    "PERIOD": "10y",
+    "WARMUP_BARS": 50,             # Same warmup as scripts/run_backtest.py
+    "RANK_BY": "sharpe_ratio",
+    "EQUITY_METRICS": True,        # Mark every grid point to market (avg_equity_sharpe etc., net of costs)
 }
 
 # ===== INDICATOR SETTINGS =====
@@ -477,6 +552,13 @@ API_CONFIG = {
     "HOST": "0.0.0.0",
     "RATE_LIMIT_PER_MINUTE": 60,
     "REQUIRE_API_KEY": True,
+    # Async endpoints hand blocking work (Yahoo calls, indicators) to a bounded thread pool
+    "BLOCKING_WORKERS": 16,
+    "TECHNICAL_TIMEOUT_SECONDS": 10.0,   # fetch_eod + indicators + decision leg of /api/v2/stock/info
+    "FUNDAMENTAL_TIMEOUT_SECONDS": 6.0,  # yf.Ticker().info leg; slower legs are left out of the response
+    # Pushed signal updates (/ws/signals, /stream/signals), see engine/broadcast.py
+    "STREAM_QUEUE_SIZE": 100,            # Per-client buffer; a slow client loses its oldest updates
+    "STREAM_HEARTBEAT_SECONDS": 15.0,    # SSE keep-alive comment when nothing changed
 }
 
 # ===== REVENUE SHARING MODEL =====
@@ -5,7 +5,6 @@ Author: Stock AI Engine Team
 Date: January 1, 2026
 """
 
-import yfinance as yf
 import pandas as pd
 from typing import Dict, Optional, Any
 from datetime import datetime
@@ -31,6 +30,8 @@ def fetch_fundamental_data(ticker: str) -> Optional[Dict[str, Any]]:
         # Add .JK suffix for Indonesian stocks
         symbol = f"{ticker}.JK" if not ticker.endswith('.JK') else ticker
         
+        import yfinance as yf
+
         stock = yf.Ticker(symbol)
         info = stock.info
         
@@ -187,6 +188,8 @@ def get_financial_statements(ticker: str) -> Optional[Dict[str, pd.DataFrame]]:
     """
     try:
         symbol = f"{ticker}.JK" if not ticker.endswith('.JK') else ticker
+        import yfinance as yf
+
         stock = yf.Ticker(symbol)
         
         statements = {
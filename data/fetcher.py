@@ -1,4 +1,3 @@
-import yfinance as yf
 import pandas as pd
 import sys
 from pathlib import Path
@@ -15,55 +14,159 @@ except (ImportError, ModuleNotFoundError):
     except (ImportError, ModuleNotFoundError):
         DATA_CONFIG = {"LOOKBACK_PERIOD": "1y"}
 
-def fetch_eod(ticker, use_5y=False, is_us=False):
-    """
-    Fetch end-of-day data for a ticker with error handling and timeout.
-    
-    Args:
-        ticker: Stock symbol (e.g., "BBCA" for IDX, "COIN" for US)
-        use_5y: If True, fetch 5 years for pattern recognition; else use config LOOKBACK_PERIOD
-        is_us: If True, fetch as US stock (no .JK suffix); else assume IDX stock
-    
-    Returns:
-        DataFrame with OHLCV data or None if failed
-    """
-    try:
-        lookback = "5y" if use_5y else DATA_CONFIG.get("LOOKBACK_PERIOD", "1y")
-        
-        # Auto-detect: if US stock, don't add .JK; if IDX, add .JK
-        symbol = ticker if is_us else f"{ticker}.JK"
-        
-        print(f"  Fetching data for {ticker} ({lookback})...", end=" ", flush=True)
+from data.price_store import PriceSource, PriceStore
+
+
+class YahooSource(PriceSource):
+    """Yahoo Finance daily bars (auto-adjusted) via yf.download."""
+
+    name = "yfinance"
+
+    def fetch(self, symbol, start=None, period=None):
+        kwargs = {"start": pd.Timestamp(start).strftime("%Y-%m-%d")} if start is not None else {"period": period or "1y"}
+        print(f"  Fetching data for {symbol} ({kwargs.get('period') or 'since ' + kwargs['start']})...", end=" ", flush=True)
+        import yfinance as yf  # heavy; loaded on first fetch
+
         df = yf.download(
             symbol,
-            period=lookback,
             interval="1d",
             auto_adjust=True,
             progress=False,
-            timeout=30
+            timeout=30,
+            **kwargs
         )
-        
+
         if df is None or df.empty:
             print("❌ No data")
             return None
-        
+
         print("✓")
-        
+
         # Fix for MultiIndex columns returned by yfinance
         # The returned df has columns like ('Close', 'BBCA.JK'), ('High', 'BBCA.JK'), etc.
         if isinstance(df.columns, pd.MultiIndex):
             # Flatten MultiIndex columns to single level
             df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
+        return df
+
+    def fetch_many(self, symbols, start=None, period=None):
+        if len(symbols) == 1:
+            return {symbols[0]: self.fetch(symbols[0], start=start, period=period)}
+
+        kwargs = {"start": pd.Timestamp(start).strftime("%Y-%m-%d")} if start is not None else {"period": period or "1y"}
+        print(f"  Fetching data for {len(symbols)} symbols ({kwargs.get('period') or 'since ' + kwargs['start']})...", end=" ", flush=True)
+        import yfinance as yf
+
+        df = yf.download(
+            symbols,
+            interval="1d",
+            auto_adjust=True,
+            progress=False,
+            timeout=30,
+            group_by="ticker",
+            threads=True,
+            **kwargs
+        )
+        if df is None or df.empty:
+            print("❌ No data")
+            return {}
+        print("✓")
+
+        # Grouped download: columns are (ticker, field); split into one frame per ticker
+        frames = {}
+        tickers = set(df.columns.get_level_values(0)) if isinstance(df.columns, pd.MultiIndex) else set()
+        for symbol in symbols:
+            if symbol in tickers:
+                sub = df[symbol].dropna(how="all")
+                frames[symbol] = sub if not sub.empty else None
+            else:
+                frames[symbol] = None
+        return frames
+
+
+_store = None
+
+
+def get_price_store():
+    """Process-wide PriceStore used by fetch_eod (created on first use)."""
+    global _store
+    if _store is None:
+        _store = PriceStore(
+            root=DATA_CONFIG.get("PRICE_STORE_DIR"),
+            source=YahooSource(),
+            history_period=DATA_CONFIG.get("STORE_HISTORY_PERIOD", "10y"),
+            refresh_minutes=DATA_CONFIG.get("STORE_REFRESH_MINUTES", 60),
+        )
+    return _store
+
+
+def set_price_store(store):
+    """Swap the store used by fetch_eod (e.g. a PriceStore over a FrameSource in tests)."""
+    global _store
+    _store = store
+
+
+def market_symbol(ticker, is_us=False):
+    """Upstream symbol for a ticker: IDX stocks get the .JK suffix, US stocks are used as-is."""
+    return ticker if is_us else f"{ticker}.JK"
+
+
+def fetch_eod(ticker, use_5y=False, is_us=False, period=None):
+    """
+    Fetch end-of-day data for a ticker with error handling and timeout.
+
+    Bars are served from the local price store; the network is only used to
+    seed a new symbol or append bars newer than the last stored date.
+    
+    Args:
+        ticker: Stock symbol (e.g., "BBCA" for IDX, "COIN" for US)
+        use_5y: If True, fetch 5 years for pattern recognition; else use config LOOKBACK_PERIOD
+        is_us: If True, fetch as US stock (no .JK suffix); else assume IDX stock
+        period: Explicit lookback (e.g. "10y"); overrides use_5y and LOOKBACK_PERIOD
+    
+    Returns:
+        DataFrame with OHLCV data or None if failed
+    """
+    try:
+        lookback = period or ("5y" if use_5y else DATA_CONFIG.get("LOOKBACK_PERIOD", "1y"))
         
-        # Ensure we have the required columns
-        required = ["Open", "High", "Low", "Close", "Volume"]
-        for col in required:
-            if col not in df.columns:
-                print(f"❌ Missing column: {col}")
-                return None
+        # Auto-detect: if US stock, don't add .JK; if IDX, add .JK
+        symbol = market_symbol(ticker, is_us)
         
+        df = get_price_store().get(symbol, lookback)
+        if df is None or df.empty:
+            return None
         return df
     
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         return None
+
+
+def fetch_eod_batch(tickers, use_5y=False, is_us=False, period=None):
+    """
+    Fetch end-of-day data for many tickers with one grouped upstream request.
+
+    Symbols already up to date in the price store are served locally; the rest
+    are downloaded together (one round trip for seeds, one for new bars).
+
+    Args:
+        tickers: List of stock symbols (e.g., ["BBCA", "BBRI"])
+        use_5y: If True, fetch 5 years; else use config LOOKBACK_PERIOD
+        is_us: If True, fetch as US stocks (no .JK suffix); else IDX stocks
+        period: Explicit lookback (e.g. "10y"); overrides use_5y and LOOKBACK_PERIOD
+
+    Returns:
+        (frames, errors): {ticker: OHLCV DataFrame} and {ticker: failure reason}
+    """
+    lookback = period or ("5y" if use_5y else DATA_CONFIG.get("LOOKBACK_PERIOD", "1y"))
+    symbols = {market_symbol(ticker, is_us): ticker for ticker in dict.fromkeys(tickers)}
+    try:
+        frames, errors = get_price_store().get_many(list(symbols), lookback)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return {}, {ticker: str(e) for ticker in symbols.values()}
+    return (
+        {symbols[s]: df for s, df in frames.items()},
+        {symbols[s]: reason for s, reason in errors.items()},
+    )
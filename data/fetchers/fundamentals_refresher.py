@@ -0,0 +1,147 @@
+"""
+Concurrent Yahoo fundamentals refresh.
+
+Each yf.Ticker(...).info + quarterly_financials round trip takes seconds,
+so symbols are fetched on a bounded thread pool. A token bucket shared by
+the whole process keeps the request rate under Yahoo's limits, failures are
+retried with exponential backoff, and results are yielded as they complete
+so callers can stream them.
+"""
+
+import logging
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from config import DATA_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import DATA_CONFIG
+
+try:
+    from data.fetchers import yahoo_fundamentals
+except ImportError:  # imported as part of the package
+    from . import yahoo_fundamentals
+
+logger = logging.getLogger(__name__)
+
+
+# ===== RATE LIMIT =====
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity (requests allowed back to back)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_bucket: Optional[TokenBucket] = None
+_bucket_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Process-wide Yahoo fundamentals rate limiter (DATA_CONFIG FUNDAMENTALS_RATE_*)."""
+    global _bucket
+    with _bucket_lock:
+        if _bucket is None:
+            _bucket = TokenBucket(DATA_CONFIG.get("FUNDAMENTALS_RATE_PER_SECOND", 4.0),
+                                  DATA_CONFIG.get("FUNDAMENTALS_RATE_BURST", 8))
+        return _bucket
+
+
+# ===== REFRESH =====
+
+def _fetch_with_retry(symbol, limiter, retries, backoff) -> Dict:
+    started = time.perf_counter()
+    result = {}
+    for attempt in range(1, retries + 2):
+        limiter.acquire()
+        result = yahoo_fundamentals.fetch_fundamentals_yahoo(symbol, use_cache=False)
+        if "error" not in result:
+            break
+        if attempt <= retries:
+            delay = backoff * 2 ** (attempt - 1)
+            logger.info(f"{symbol}: attempt {attempt} failed ({result['error']}), retrying in {delay:.1f}s")
+            time.sleep(delay * random.uniform(1.0, 1.25))
+    return {
+        "symbol": symbol,
+        "status": "error" if "error" in result else "ok",
+        "attempts": attempt,
+        "seconds": round(time.perf_counter() - started, 3),
+        "data": result,
+    }
+
+
+def refresh_fundamentals(symbols: List[str], workers: Optional[int] = None, use_cache: bool = True,
+                         limiter: Optional[TokenBucket] = None, retries: Optional[int] = None,
+                         backoff: Optional[float] = None) -> Iterator[Dict]:
+    """
+    Refresh fundamentals for many symbols concurrently, yielding each as it completes.
+
+    Args:
+        symbols: Stock symbols (duplicates are fetched once)
+        workers: Concurrent fetches (default DATA_CONFIG FUNDAMENTALS_REFRESH_WORKERS)
+        use_cache: Serve snapshots younger than CACHE_AGE_HOURS from the store (one query)
+        limiter: Rate limiter (default: the process-wide token bucket)
+        retries / backoff: Extra attempts per symbol and the first retry delay in seconds
+
+    Yields:
+        {"symbol", "status" ("cached" | "ok" | "error"), "attempts", "seconds", "data"}
+        Cached symbols come first; the rest in completion order. Closing the
+        generator early cancels fetches that have not started.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    workers = workers or DATA_CONFIG.get("FUNDAMENTALS_REFRESH_WORKERS", 8)
+    limiter = limiter or get_rate_limiter()
+    retries = DATA_CONFIG.get("FUNDAMENTALS_RETRIES", 2) if retries is None else retries
+    backoff = DATA_CONFIG.get("FUNDAMENTALS_BACKOFF_SECONDS", 1.0) if backoff is None else backoff
+
+    cached = yahoo_fundamentals._get_cached_many(symbols) if use_cache else {}
+    for symbol in symbols:
+        if symbol in cached:
+            yield {"symbol": symbol, "status": "cached", "attempts": 0, "seconds": 0.0, "data": cached[symbol]}
+
+    pending = [s for s in symbols if s not in cached]
+    if not pending:
+        return
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(pending)), thread_name_prefix="fundamentals")
+    try:
+        futures = {pool.submit(_fetch_with_retry, s, limiter, retries, backoff): s for s in pending}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"symbol": futures[future], "status": "error", "attempts": 0, "seconds": 0.0,
+                       "data": {"error": str(e), "symbol": futures[future]}}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
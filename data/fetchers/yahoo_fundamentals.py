@@ -1,53 +1,48 @@
 """
 Auto-fetch real fundamental data from Yahoo Finance API.
-Saves to data/fund_data/ with local caching.
+Snapshots are cached in the fundamentals store (data/fundamentals_store.py).
 """
 
 import os
-import json
-import yfinance as yf
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import logging
 
+try:
+    from data.fundamentals_store import LIVE_PERIOD, get_fundamentals_store
+except ImportError:  # imported as part of the package
+    from ..fundamentals_store import LIVE_PERIOD, get_fundamentals_store
+
 logger = logging.getLogger(__name__)
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), "fund_data")
+DATA_DIR = os.path.join(os.path.dirname(__file__), "fund_data")  # legacy JSON cache, migrated on first use
 CACHE_AGE_HOURS = 24  # Refresh fundamentals daily
 
 
-def _get_cached_data(symbol: str) -> Optional[Dict]:
-    """Load cached fundamental data if recent enough."""
-    cache_file = os.path.join(DATA_DIR, f"{symbol}_cache.json")
-    if not os.path.exists(cache_file):
-        return None
-    
+def _get_cached_many(symbols: List[str]) -> Dict[str, Dict]:
+    """Cached fundamentals younger than CACHE_AGE_HOURS for many symbols (one query)."""
     try:
-        with open(cache_file, "r") as f:
-            data = json.load(f)
-        
-        # Check if cache is fresh
-        last_updated = datetime.fromisoformat(data.get("_cached_at", "2000-01-01"))
-        age = datetime.now() - last_updated
-        
-        if age < timedelta(hours=CACHE_AGE_HOURS):
-            logger.debug(f"{symbol}: Using cached fundamentals (age={age.total_seconds()/3600:.1f}h)")
-            return data
+        since = datetime.now() - timedelta(hours=CACHE_AGE_HOURS)
+        snapshots = get_fundamentals_store().get_many(symbols, [LIVE_PERIOD], since=since)
     except Exception as e:
-        logger.warning(f"Could not read cache for {symbol}: {e}")
-    
-    return None
+        logger.warning(f"Could not read fundamentals cache: {e}")
+        return {}
+    return {symbol: periods[LIVE_PERIOD] for symbol, periods in snapshots.items()}
+
+
+def _get_cached_data(symbol: str) -> Optional[Dict]:
+    """Load cached fundamental data if recent enough."""
+    data = _get_cached_many([symbol]).get(symbol)
+    if data:
+        logger.debug(f"{symbol}: Using cached fundamentals (cached_at={data['_cached_at']})")
+    return data
 
 
 def _save_cached_data(symbol: str, data: Dict):
     """Save fundamental data with cache timestamp."""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    cache_file = os.path.join(DATA_DIR, f"{symbol}_cache.json")
-    
     data["_cached_at"] = datetime.now().isoformat()
     try:
-        with open(cache_file, "w") as f:
-            json.dump(data, f, indent=2)
+        get_fundamentals_store().put(symbol, LIVE_PERIOD, data, cached_at=data["_cached_at"])
         logger.info(f"Saved cache for {symbol}")
     except Exception as e:
         logger.warning(f"Could not save cache for {symbol}: {e}")
@@ -74,6 +69,8 @@ def fetch_fundamentals_yahoo(ticker: str, use_cache: bool = True) -> Dict:
         logger.info(f"Fetching fundamentals for {ticker} from Yahoo Finance...")
         
         # Download with .JK suffix for IDX stocks
+        import yfinance as yf
+
         stock = yf.Ticker(f"{ticker}.JK")
         
         # Get info dict (latest metrics)
@@ -168,20 +165,25 @@ def fetch_fundamentals_indonesia_idx(ticker: str) -> Optional[Dict]:
     return None
 
 
-def auto_fetch_and_cache_portfolio(symbols: list) -> Dict[str, Dict]:
+def auto_fetch_and_cache_portfolio(symbols: list, workers: Optional[int] = None) -> Dict[str, Dict]:
     """
     Auto-fetch fundamentals for a portfolio of symbols.
-    Returns dict of symbol -> fundamentals.
+
+    Fresh snapshots come from one store query; the rest are fetched
+    concurrently (rate limited, with retries) by refresh_fundamentals.
+
+    Returns dict of symbol -> fundamentals (in input order).
     """
-    results = {}
-    for symbol in symbols:
-        try:
-            results[symbol] = fetch_fundamentals_yahoo(symbol, use_cache=True)
-        except Exception as e:
-            logger.error(f"Failed for {symbol}: {e}")
-            results[symbol] = {"error": str(e)}
-    
-    return results
+    try:
+        from data.fetchers.fundamentals_refresher import refresh_fundamentals
+    except ImportError:  # imported as part of the package
+        from .fundamentals_refresher import refresh_fundamentals
+
+    fetched = {item["symbol"]: item["data"] for item in refresh_fundamentals(symbols, workers=workers)}
+    for symbol, data in fetched.items():
+        if "error" in data:
+            logger.error(f"Failed for {symbol}: {data['error']}")
+    return {symbol: fetched[symbol] for symbol in symbols}
 
 
 if __name__ == "__main__":
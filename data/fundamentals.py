@@ -1,37 +1,17 @@
-import os
-import json
-from typing import Dict
+from typing import Dict, List
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), "fund_data")
+try:
+    from data.fundamentals_store import CURATED_DIR, get_fundamentals_store
+except ImportError:  # imported as part of the package
+    from .fundamentals_store import CURATED_DIR, get_fundamentals_store
 
+DATA_DIR = str(CURATED_DIR)
+
+# Curated snapshot periods, most preferred first
+FILE_PERIODS = ["2025Q2", "base"]
 
-def fetch_fundamentals(symbol: str) -> Dict:
-    """
-    Fetch fundamental metrics for a symbol.
-    
-    Looks for JSON files in data/fund_data/:
-    1. First tries {symbol}_2025Q2.json (latest 2025 Q2 data)
-    2. Falls back to {symbol}.json (historical or backup)
-    3. Returns mock if not found
-    
-    Returns Dict with fundamentals history (newest first).
-    """
-    try:
-        # Try 2025 Q2 data first (most recent)
-        path_2025 = os.path.join(DATA_DIR, f"{symbol}_2025Q2.json")
-        if os.path.exists(path_2025):
-            with open(path_2025, "r", encoding="utf-8") as f:
-                return json.load(f)
-        
-        # Fallback to main file
-        path = os.path.join(DATA_DIR, f"{symbol}.json")
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception:
-        pass
 
-    # Fallback mock values
+def _mock(symbol: str) -> Dict:
     return {
         "symbol": symbol,
         "fundamentals": [
@@ -47,3 +27,43 @@ def fetch_fundamentals(symbol: str) -> Dict:
         "note": "mocked - provide real fundamentals in data/fund_data/{symbol}_2025Q2.json"
     }
 
+
+def fetch_fundamentals_many(symbols: List[str]) -> Dict[str, Dict]:
+    """
+    Fundamentals for a whole portfolio with one store query.
+
+    Same precedence as fetch_fundamentals for every symbol. JSON files added to,
+    edited in or deleted from data/fund_data/ are synced on every call.
+
+    Returns:
+        {symbol: fundamentals dict}
+    """
+    try:
+        store = get_fundamentals_store()
+        store.import_json_dir(CURATED_DIR)
+        snapshots = store.get_many(symbols, FILE_PERIODS)
+    except Exception:
+        snapshots = {}
+
+    results = {}
+    for symbol in symbols:
+        by_period = snapshots.get(symbol, {})
+        found = next((by_period[p] for p in FILE_PERIODS if p in by_period), None)
+        if found is not None:
+            found = {k: v for k, v in found.items() if k != "_cached_at"}
+        results[symbol] = found if found is not None else _mock(symbol)
+    return results
+
+
+def fetch_fundamentals(symbol: str) -> Dict:
+    """
+    Fetch fundamental metrics for a symbol.
+
+    Reads curated snapshots from the fundamentals store (imported from data/fund_data/):
+    1. First tries the 2025Q2 snapshot ({symbol}_2025Q2.json, latest 2025 Q2 data)
+    2. Falls back to the base snapshot ({symbol}.json, historical or backup)
+    3. Returns mock if not found
+
+    Returns Dict with fundamentals history (newest first).
+    """
+    return fetch_fundamentals_many([symbol])[symbol]
@@ -0,0 +1,263 @@
+"""
+Embedded fundamentals store (SQLite, WAL mode).
+
+One row per (symbol, period) snapshot, with `_cached_at` as an indexed
+column, replacing the per-symbol JSON files:
+
+- period "live":  Yahoo Finance snapshot (was data/fetchers/fund_data/{symbol}_cache.json)
+- period "2025Q2" / "base": curated files (data/fund_data/{symbol}_2025Q2.json / {symbol}.json)
+
+Portfolio reads are one `WHERE symbol IN (...)` query. Existing JSON caches
+are imported once when the database is created. The curated directory is
+still the place to drop and edit files: each read scans it once and compares
+every file's (mtime, size) with the signature recorded at the last import,
+so only new or edited files are parsed again, and the snapshots of deleted
+files are removed.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from config import DATA_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import DATA_CONFIG
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).parent / "fundamentals.db"
+CURATED_DIR = Path(__file__).parent / "fund_data"
+YAHOO_CACHE_DIR = Path(__file__).parent / "fetchers" / "fund_data"
+
+LIVE_PERIOD = "live"
+BASE_PERIOD = "base"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    symbol     TEXT NOT NULL,
+    period     TEXT NOT NULL,
+    cached_at  TEXT NOT NULL,
+    source     TEXT,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (symbol, period)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_cached_at ON snapshots (cached_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _period_from_filename(stem: str):
+    """(symbol, period) for a JSON cache file name, or None for unrelated files."""
+    if stem.endswith("_cache"):
+        return stem[:-len("_cache")], LIVE_PERIOD
+    symbol, sep, period = stem.rpartition("_")
+    if sep and symbol and period[:4].isdigit():
+        return symbol, period
+    return stem, BASE_PERIOD
+
+
+class FundamentalsStore:
+    """
+    Fundamentals snapshots keyed by (symbol, period).
+
+    Args:
+        path: SQLite database file (created on first use)
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else DEFAULT_PATH
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    # ----- connection -----
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread connection (WAL lets readers run alongside the writer)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn, key: str, value: str):
+        conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ----- read -----
+
+    def get(self, symbol: str, period: str, since: Optional[datetime] = None) -> Optional[Dict]:
+        """One snapshot (with `_cached_at`), or None if missing or cached before `since`."""
+        return self.get_many([symbol], [period], since=since).get(symbol, {}).get(period)
+
+    def get_many(self, symbols: Iterable[str], periods: Optional[Iterable[str]] = None,
+                 since: Optional[datetime] = None) -> Dict[str, Dict[str, Dict]]:
+        """
+        Snapshots for many symbols in one query.
+
+        Args:
+            symbols: Symbols to read
+            periods: Restrict to these periods (None = all)
+            since: Only snapshots cached at or after this time (uses the cached_at index)
+
+        Returns:
+            {symbol: {period: data}}; symbols without rows are absent
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        sql = f"SELECT symbol, period, cached_at, data FROM snapshots WHERE symbol IN ({','.join('?' * len(symbols))})"
+        params: List = list(symbols)
+        if periods is not None:
+            periods = list(periods)
+            sql += f" AND period IN ({','.join('?' * len(periods))})"
+            params += periods
+        if since is not None:
+            sql += " AND cached_at >= ?"
+            params.append(since.isoformat())
+
+        out: Dict[str, Dict[str, Dict]] = {}
+        for symbol, period, cached_at, data in self._conn().execute(sql, params):
+            snapshot = json.loads(data)
+            snapshot["_cached_at"] = cached_at
+            out.setdefault(symbol, {})[period] = snapshot
+        return out
+
+    # ----- write -----
+
+    def put(self, symbol: str, period: str, data: Dict, cached_at: Optional[str] = None,
+            source: Optional[str] = None):
+        """Insert or replace one snapshot."""
+        self.put_many([(symbol, period, data, cached_at, source)])
+
+    def put_many(self, rows):
+        """Insert or replace (symbol, period, data, cached_at, source) rows in one transaction."""
+        now = datetime.now().isoformat()
+        records = []
+        for symbol, period, data, cached_at, source in rows:
+            cached_at = cached_at or data.get("_cached_at") or now
+            payload = {k: v for k, v in data.items() if k != "_cached_at"}
+            records.append((symbol, period, cached_at, source or data.get("source"), json.dumps(payload)))
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (symbol, period, cached_at, source, data) VALUES (?, ?, ?, ?, ?)",
+                records,
+            )
+
+    # ----- JSON import -----
+
+    def import_json_dir(self, directory, force: bool = False) -> int:
+        """
+        Sync a directory of *.json snapshots into the store.
+
+        File names map to (symbol, period): {symbol}_cache.json -> "live",
+        {symbol}_{YYYYQn}.json -> that period, {symbol}.json -> "base".
+        Files whose (mtime_ns, size) differ from the last import are
+        re-imported (all files with force=True); snapshots of files that
+        have been deleted since the last import are removed.
+
+        Returns:
+            Number of snapshots imported (0 when nothing changed or the directory is missing)
+        """
+        directory = Path(directory)
+        try:
+            with os.scandir(directory) as it:
+                files = {}
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            return 0
+        meta_key = f"json_files:{directory.resolve()}"
+        previous = json.loads(self._meta(meta_key) or "{}")
+        changed = sorted(name for name, signature in files.items() if force or previous.get(name) != signature)
+        removed = sorted(name for name in previous if name not in files)
+        if not changed and not removed:
+            return 0
+
+        rows = []
+        for path in (directory / name for name in changed):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping {path.name}: {e}")
+                continue
+            if not isinstance(data, dict):
+                continue
+            symbol, period = _period_from_filename(path.stem)
+            cached_at = data.get("_cached_at") or datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+            rows.append((symbol, period, data, cached_at, data.get("source") or "json"))
+
+        conn = self._conn()
+        self.put_many(rows)
+        with conn:
+            conn.executemany("DELETE FROM snapshots WHERE symbol = ? AND period = ?",
+                             [_period_from_filename(Path(name).stem) for name in removed])
+            self._set_meta(conn, meta_key, json.dumps(files, sort_keys=True))
+        if rows or removed:
+            logger.info(f"Imported {len(rows)} and removed {len(removed)} fundamentals snapshots from {directory}")
+        return len(rows)
+
+    def migrate(self) -> int:
+        """One-time import of the legacy Yahoo cache directory (no-op once done)."""
+        if self._meta("migrated_yahoo_cache"):
+            return 0
+        imported = self.import_json_dir(YAHOO_CACHE_DIR, force=True)
+        conn = self._conn()
+        with conn:
+            self._set_meta(conn, "migrated_yahoo_cache", datetime.now().isoformat())
+        return imported
+
+
+_store: Optional[FundamentalsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_fundamentals_store() -> FundamentalsStore:
+    """Process-wide store at DATA_CONFIG FUNDAMENTALS_DB (legacy JSON caches migrated on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FundamentalsStore(DATA_CONFIG.get("FUNDAMENTALS_DB"))
+            _store.migrate()
+        return _store
+
+
+def set_fundamentals_store(store: Optional[FundamentalsStore]):
+    """Replace the process-wide store (tests, alternate databases)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    store = get_fundamentals_store()
+    curated = store.import_json_dir(CURATED_DIR, force=True)
+    print(f"✅ Fundamentals store: {store.path} ({curated} curated snapshots imported)")
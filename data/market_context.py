@@ -0,0 +1,64 @@
+"""
+Request-scoped market data for one symbol.
+
+/analysis and /agent/analyze need both the configured lookback (for
+decision_engine) and a 5-year window (for analyze_5year_pattern). Instead of
+downloading and running add_indicators twice on overlapping data, the context
+fetches the longest window once, computes indicators once, and hands out tail
+slices for each lookback.
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+parent_dir = str(Path(__file__).parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config import DATA_CONFIG
+from data.fetcher import fetch_eod
+from data.price_store import period_days, slice_period
+from indicators.technical import add_indicators
+
+PATTERN_PERIOD = "5y"  # Window used for 5-year pattern recognition
+
+
+class MarketDataContext:
+    """
+    Lazily loaded price + indicator frames for a single symbol and request.
+
+    Args:
+        ticker: Stock symbol (e.g., "BBCA")
+        is_us: If True, fetch as US stock (no .JK suffix)
+        periods: Lookbacks the request will ask for; the longest is fetched
+    """
+
+    def __init__(self, ticker: str, is_us: bool = False, periods=None):
+        self.ticker = ticker
+        self.is_us = is_us
+        self.lookback = DATA_CONFIG.get("LOOKBACK_PERIOD", "1y")
+        periods = list(periods or [self.lookback, PATTERN_PERIOD])
+        self.longest = max(periods, key=period_days)
+        self._prices = None
+        self._indicators = None
+        self._loaded = False
+
+    def prices(self, period: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Raw OHLCV bars for `period` (default: configured lookback), or None if unavailable."""
+        if not self._loaded:
+            self._loaded = True
+            self._prices = fetch_eod(self.ticker, is_us=self.is_us, period=self.longest)
+        if self._prices is None or self._prices.empty:
+            return None
+        return slice_period(self._prices, period or self.lookback)
+
+    def frame(self, period: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Indicator frame for `period` (default: configured lookback), computed once per context."""
+        if self.prices() is None:
+            return None
+        if self._indicators is None:
+            self._indicators = add_indicators(self._prices.copy())
+        return slice_period(self._indicators, period or self.lookback)
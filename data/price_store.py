@@ -0,0 +1,388 @@
+"""
+Local columnar OHLCV store with incremental append.
+
+Each symbol is one memory-mapped NumPy file (structured array: date + OHLCV)
+plus a small JSON sidecar with sync metadata. History is downloaded once;
+after that only the bars after the last stored date are requested, and every
+lookback ("1y", "5y", "10y", ...) is served by slicing locally.
+
+Upstream data comes from a pluggable PriceSource, so tests can run against
+FrameSource (in-memory / CSV fixtures) instead of the network.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+RECORD_DTYPE = np.dtype([("date", "<M8[ns]")] + [(c, "<f8") for c in COLUMNS])
+DEFAULT_ROOT = Path(__file__).parent / "price_store"
+
+# Relative tolerance when checking that the overlapping bar still matches.
+# Adjusted prices are rewritten upstream after dividends/splits; a mismatch
+# means the stored history is stale and must be re-seeded.
+_ADJUSTMENT_TOLERANCE = 1e-6
+
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+
+# ===== PERIOD HELPERS =====
+
+@lru_cache(maxsize=64)
+def period_offset(period: str) -> Optional[pd.DateOffset]:
+    """Convert a yfinance-style period ("5d", "6mo", "1y", "max") to a DateOffset (None = all history)."""
+    if period in (None, "max"):
+        return None
+    if period == "ytd":
+        raise ValueError("'ytd' has no fixed length; slice by date instead")
+    for suffix in ("mo", "wk", "d", "y"):
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return pd.DateOffset(**{_PERIOD_UNITS[suffix]: int(period[:-len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+@lru_cache(maxsize=64)
+def period_days(period: str) -> float:
+    """Approximate length of a period in days, for comparing lookbacks."""
+    offset = period_offset(period)
+    if offset is None:
+        return float("inf")
+    anchor = pd.Timestamp("2000-01-01")
+    return float(((anchor + offset) - anchor).days)
+
+
+def slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Return the tail of df covering `period`, measured back from its last bar."""
+    offset = period_offset(period)
+    if offset is None or df.empty:
+        return df
+    cutoff = df.index[-1] - offset
+    return df.iloc[df.index.searchsorted(cutoff, side="left"):]
+
+
+# ===== SOURCES =====
+
+class PriceSource:
+    """
+    Upstream provider of daily OHLCV bars.
+
+    Implementations return a DataFrame with a DatetimeIndex and the columns
+    Open/High/Low/Close/Volume, or None when no data is available.
+    """
+
+    name = "base"
+
+    def fetch(self, symbol: str, start: Optional[pd.Timestamp] = None,
+              period: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Fetch bars on/after `start`, or the trailing `period` when start is None."""
+        raise NotImplementedError
+
+    def fetch_many(self, symbols, start: Optional[pd.Timestamp] = None,
+                   period: Optional[str] = None) -> Dict[str, Optional[pd.DataFrame]]:
+        """Fetch several symbols; sources with a grouped download endpoint should override this."""
+        return {symbol: self.fetch(symbol, start=start, period=period) for symbol in symbols}
+
+
+class FrameSource(PriceSource):
+    """
+    Local fixture source backed by DataFrames (or a directory of {symbol}.csv files).
+
+    Every call is recorded in `calls` (per symbol) and `batches` (per
+    fetch_many round trip) so tests can assert what was requested.
+    """
+
+    name = "frames"
+
+    def __init__(self, frames: Optional[Dict[str, pd.DataFrame]] = None, csv_dir: Optional[str] = None):
+        self.frames = dict(frames or {})
+        self.csv_dir = Path(csv_dir) if csv_dir else None
+        self.calls = []
+        self.batches = []
+
+    def _frame(self, symbol):
+        if symbol not in self.frames and self.csv_dir is not None:
+            path = self.csv_dir / f"{symbol}.csv"
+            if path.exists():
+                self.frames[symbol] = pd.read_csv(path, index_col=0, parse_dates=True)
+        return self.frames.get(symbol)
+
+    def fetch(self, symbol, start=None, period=None):
+        self.calls.append({"symbol": symbol, "start": start, "period": period})
+        df = self._frame(symbol)
+        if df is None:
+            return None
+        if start is not None:
+            return df[df.index >= pd.Timestamp(start)]
+        return slice_period(df, period) if period else df
+
+    def fetch_many(self, symbols, start=None, period=None):
+        self.batches.append({"symbols": list(symbols), "start": start, "period": period})
+        return super().fetch_many(symbols, start=start, period=period)
+
+
+# ===== STORE =====
+
+class PriceStore:
+    """
+    Persistent per-symbol OHLCV store.
+
+    Args:
+        root: Directory holding {symbol}.npy and {symbol}.json files
+        source: PriceSource used to seed and extend history
+        history_period: Minimum period downloaded when a symbol is first seen
+        refresh_minutes: Upstream is re-checked for new bars at most this often
+    """
+
+    def __init__(self, root=None, source: Optional[PriceSource] = None,
+                 history_period: str = "10y", refresh_minutes: float = 60):
+        self.root = Path(root) if root else DEFAULT_ROOT
+        self.source = source
+        self.history_period = history_period
+        self.refresh_minutes = refresh_minutes
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+        self._mmaps: Dict[str, tuple] = {}
+
+    # ----- paths & metadata -----
+
+    def _data_path(self, symbol):
+        return self.root / f"{symbol}.npy"
+
+    def _meta_path(self, symbol):
+        return self.root / f"{symbol}.json"
+
+    def _lock(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.RLock())
+
+    def meta(self, symbol: str) -> Dict:
+        """Sync metadata for a symbol ({} if never stored)."""
+        try:
+            with open(self._meta_path(symbol), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def last_date(self, symbol: str) -> Optional[str]:
+        """ISO date of the last stored bar, without touching the price data."""
+        return self.meta(symbol).get("last_date")
+
+    # ----- read / write -----
+
+    def _records(self, symbol):
+        """Memory-mapped record array for a symbol, reopened only when the file changes."""
+        path = self._data_path(symbol)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._mmaps.get(symbol)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        records = np.load(path, mmap_mode="r")
+        self._mmaps[symbol] = (mtime, records)
+        return records
+
+    def read(self, symbol: str, period: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Load stored bars for a symbol (all history, or the trailing `period`), or None."""
+        records = self._records(symbol)
+        if records is None or len(records) == 0:
+            return None
+        offset = period_offset(period)
+        if offset is not None:
+            cutoff = (pd.Timestamp(records["date"][-1]) - offset).to_datetime64()
+            records = records[int(np.searchsorted(records["date"], cutoff, side="left")):]
+
+        values = np.empty((len(records), len(COLUMNS)))
+        for i, c in enumerate(COLUMNS):
+            values[:, i] = records[c]
+        index = pd.DatetimeIndex(records["date"], name="Date")
+        return pd.DataFrame(values, index=index, columns=COLUMNS)
+
+    def write(self, symbol: str, df: pd.DataFrame, **meta):
+        """Replace the stored history for a symbol (atomic file swap)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        records = np.empty(len(df), dtype=RECORD_DTYPE)
+        records["date"] = df.index.values.astype("datetime64[ns]")
+        for c in COLUMNS:
+            records[c] = df[c].to_numpy(dtype=np.float64)
+
+        tmp = self._data_path(symbol).with_suffix(".npy.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, records)
+        self._mmaps.pop(symbol, None)  # release our mapping before swapping the file
+        os.replace(tmp, self._data_path(symbol))
+
+        self._write_meta(symbol, {
+            **self.meta(symbol),
+            **meta,
+            "rows": len(df),
+            "last_date": df.index[-1].strftime("%Y-%m-%d") if len(df) else None,
+        })
+
+    def _write_meta(self, symbol, meta):
+        tmp = self._meta_path(symbol).with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path(symbol))
+
+    def _touch(self, symbol):
+        self._write_meta(symbol, {**self.meta(symbol), "checked_at": time.time()})
+
+    # ----- sync -----
+
+    def needs_sync(self, symbol: str, period: Optional[str] = None) -> bool:
+        """True if the symbol is missing, seeded too short for `period`, or not checked recently."""
+        meta = self.meta(symbol)
+        if not meta or not self._data_path(symbol).exists():
+            return True
+        if period and period_days(period) > period_days(meta.get("seeded_period", "0d")):
+            return True
+        return time.time() - meta.get("checked_at", 0) > self.refresh_minutes * 60
+
+    def _seed_period(self, period):
+        if period and period_days(period) > period_days(self.history_period):
+            return period
+        return self.history_period
+
+    def _fetch_many(self, symbols, errors, **kwargs):
+        """Call source.fetch_many and normalize each frame; failures are recorded in `errors`."""
+        try:
+            raw = self.source.fetch_many(symbols, **kwargs)
+        except Exception as e:
+            errors.update({symbol: str(e) for symbol in symbols})
+            return {}
+        frames = {}
+        for symbol in symbols:
+            try:
+                df = _normalize(raw.get(symbol))
+            except Exception as e:
+                errors[symbol] = str(e)
+                continue
+            if df is not None and not df.empty:
+                frames[symbol] = df
+        return frames
+
+    def _append(self, symbol, stored, new) -> bool:
+        """Append bars newer than the stored history; False if the history was re-adjusted upstream."""
+        last = stored.index[-1]
+        if new is not None and last in new.index and not _same_bar(stored.loc[last], new.loc[last]):
+            logger.info(f"{symbol}: upstream history was re-adjusted, re-seeding store")
+            return False
+        new = new[new.index > last] if new is not None else None
+        if new is None or new.empty:
+            self._touch(symbol)
+        else:
+            self.write(symbol, pd.concat([stored, new]), checked_at=time.time())
+        return True
+
+    def sync_many(self, symbols, period: Optional[str] = None) -> Dict[str, str]:
+        """
+        Bring symbols up to date from the source with as few requests as possible.
+
+        Symbols that need seeding (first use, or a longer period than seeded)
+        share one fetch_many(period=...) call; symbols that only need new bars
+        share one fetch_many(start=earliest last date) call.
+
+        Returns:
+            {symbol: error message} for symbols whose sync failed
+        """
+        errors: Dict[str, str] = {}
+        seed_period = self._seed_period(period)
+        with ExitStack() as stack:
+            for symbol in sorted(set(symbols)):
+                stack.enter_context(self._lock(symbol))
+
+            seeds, stored = [], {}
+            for symbol in dict.fromkeys(symbols):
+                if not self.needs_sync(symbol, period):
+                    continue
+                df = self.read(symbol)
+                seeded = self.meta(symbol).get("seeded_period", "0d")
+                if df is None or df.empty or period_days(seed_period) > period_days(seeded):
+                    seeds.append(symbol)
+                else:
+                    stored[symbol] = df
+
+            if stored:
+                start = min(df.index[-1] for df in stored.values())
+                fetched = self._fetch_many(list(stored), errors, start=start)
+                for symbol, df in stored.items():
+                    if symbol not in errors and not self._append(symbol, df, fetched.get(symbol)):
+                        seeds.append(symbol)
+
+            if seeds:
+                fetched = self._fetch_many(seeds, errors, period=seed_period)
+                for symbol in seeds:
+                    if symbol not in fetched:
+                        errors.setdefault(symbol, "no data")
+                        continue
+                    errors.pop(symbol, None)
+                    self.write(symbol, fetched[symbol], checked_at=time.time(), seeded_period=seed_period,
+                               source=getattr(self.source, "name", "unknown"))
+        return errors
+
+    def get_many(self, symbols, period: Optional[str] = None):
+        """
+        Return bars for several symbols, syncing all stale ones in one batch.
+
+        Symbols whose sync fails but that have stored data are served stale.
+
+        Returns:
+            (frames, errors): {symbol: DataFrame} and {symbol: reason} for symbols without data
+        """
+        stale = [symbol for symbol in symbols if self.needs_sync(symbol, period)]
+        sync_errors = self.sync_many(stale, period) if stale else {}
+
+        frames, errors = {}, {}
+        for symbol in symbols:
+            df = self.read(symbol, period)
+            if df is None or df.empty:
+                errors[symbol] = sync_errors.get(symbol, "no data")
+                continue
+            if symbol in sync_errors:
+                logger.warning(f"{symbol}: price sync failed ({sync_errors[symbol]}), serving stored data")
+            frames[symbol] = df
+        return frames, errors
+
+    def get(self, symbol: str, period: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Return OHLCV bars for `period`, syncing from the source only when needed.
+
+        Falls back to stale stored data if the source fails.
+        """
+        frames, _ = self.get_many([symbol], period)
+        return frames.get(symbol)
+
+
+def _normalize(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Coerce a source frame to the store layout: naive sorted DatetimeIndex, float OHLCV columns."""
+    if df is None or df.empty:
+        return df
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
+    missing = [c for c in COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+    df = df[COLUMNS].astype(np.float64)
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index.normalize().rename("Date")
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return df.dropna(subset=["Close"])
+
+
+def _same_bar(a: pd.Series, b: pd.Series) -> bool:
+    return bool(np.isclose(a["Close"], b["Close"], rtol=_ADJUSTMENT_TOLERANCE, atol=0))
@@ -0,0 +1,227 @@
+"""
+Broadcast hub for pushed signal updates (WebSocket / SSE).
+
+A signal_service listener feeds every fresh computation to the hub. The hub
+drops updates whose signal, score, confidence, price and bar are unchanged,
+serializes the rest once (JSON text plus the ready-made SSE frame) and
+queues that same message object for every subscriber of the ticker.
+
+Subscribers live on an asyncio loop (the server's). publish() may be called
+from any thread: it schedules one callback per loop, never per subscriber.
+A slow subscriber's bounded queue drops its oldest message instead of
+holding up everyone else.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    from config import API_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import API_CONFIG
+
+MESSAGE_FIELDS = ["signal", "score", "confidence", "close", "as_of"]
+
+
+class Message:
+    """One update, serialized once for every transport."""
+
+    __slots__ = ("ticker", "data", "json", "sse")
+
+    def __init__(self, ticker: str, data: Dict, event: str = "signal"):
+        self.ticker = ticker
+        self.data = data
+        self.json = json.dumps(data)
+        self.sse = f"event: {event}\ndata: {self.json}\n\n"
+
+
+class Subscription:
+    """
+    A client's ticker set and bounded message queue (create with BroadcastHub.subscribe).
+
+    Iterate with `await sub.get()`; close with hub.unsubscribe(sub).
+    """
+
+    def __init__(self, hub: "BroadcastHub", loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.hub = hub
+        self.loop = loop
+        self.tickers: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, message: Message):
+        """Queue a message (loop thread only), dropping the oldest when full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self) -> Message:
+        return await self.queue.get()
+
+
+def signal_message(ticker: str, state: Dict) -> Message:
+    """Message for a signal state {signal, score, confidence, close, prev_close, as_of}."""
+    prev_close = state.get("prev_close")
+    change_pct = (state["close"] / prev_close - 1) * 100 if prev_close else None
+    return Message(ticker, {
+        "type": "signal",
+        "ticker": ticker,
+        **{k: state.get(k) for k in MESSAGE_FIELDS},
+        "prev_close": prev_close,
+        "change_pct": round(change_pct, 2) if change_pct is not None else None,
+        "published_at": datetime.now().isoformat(),
+    })
+
+
+class BroadcastHub:
+    """
+    Per-ticker fan-out of serialized updates to async subscribers.
+
+    Args:
+        queue_size: Messages buffered per subscriber before the oldest is dropped
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subs: Dict[str, Set[Subscription]] = {}
+        self._last: Dict[str, Message] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.unchanged = 0
+        self.deliveries = 0
+
+    # ----- subscriptions (loop thread) -----
+
+    def subscribe(self, tickers: Iterable[str] = ()) -> Subscription:
+        """New subscription on the running loop, with the latest known message per ticker queued."""
+        sub = Subscription(self, asyncio.get_running_loop(), self.queue_size)
+        self.add_tickers(sub, tickers)
+        return sub
+
+    def add_tickers(self, sub: Subscription, tickers: Iterable[str]) -> List[str]:
+        """Subscribe to more tickers; returns the ones with no known state yet."""
+        unknown = []
+        with self._lock:
+            for ticker in {t.strip().upper() for t in tickers if t.strip()} - sub.tickers:
+                sub.tickers.add(ticker)
+                self._subs.setdefault(ticker, set()).add(sub)
+                if ticker in self._last:
+                    sub.put(self._last[ticker])
+                else:
+                    unknown.append(ticker)
+        return sorted(unknown)
+
+    def remove_tickers(self, sub: Subscription, tickers: Iterable[str]):
+        with self._lock:
+            for ticker in {t.strip().upper() for t in tickers} & sub.tickers:
+                sub.tickers.discard(ticker)
+                subs = self._subs.get(ticker)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[ticker]
+
+    def unsubscribe(self, sub: Subscription):
+        self.remove_tickers(sub, list(sub.tickers))
+
+    # ----- publishing (any thread) -----
+
+    def latest(self, ticker: str) -> Optional[Message]:
+        return self._last.get(ticker)
+
+    def publish(self, ticker: str, state: Dict) -> bool:
+        """
+        Broadcast a signal state if it differs from the last one for the ticker.
+
+        Returns:
+            False when nothing changed (no message sent)
+        """
+        key = tuple(state.get(k) for k in MESSAGE_FIELDS)
+        with self._lock:
+            last = self._last.get(ticker)
+            if last is not None and tuple(last.data.get(k) for k in MESSAGE_FIELDS) == key:
+                self.unchanged += 1
+                return False
+            if last is not None and state.get("as_of") and (last.data.get("as_of") or "") > state["as_of"]:
+                self.unchanged += 1  # stale recompute of an older bar
+                return False
+            message = signal_message(ticker, state)
+            self._last[ticker] = message
+            self.published += 1
+            by_loop: Dict[asyncio.AbstractEventLoop, List[Subscription]] = {}
+            for sub in self._subs.get(ticker, ()):
+                by_loop.setdefault(sub.loop, []).append(sub)
+
+        for loop, subs in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(self._deliver, subs, message)
+            except RuntimeError:  # loop closed (server shut down)
+                pass
+        return True
+
+    def _deliver(self, subs: List[Subscription], message: Message):
+        for sub in subs:
+            sub.put(message)
+        self.deliveries += len(subs)
+
+    def publish_signal(self, ticker: str, computed: Dict):
+        """signal_service listener: publish a fresh compute_signal result."""
+        decision = computed["decision"]
+        self.publish(ticker, {
+            "signal": decision["signal"],
+            "score": float(decision["score"]),
+            "confidence": float(decision["confidence"]),
+            "close": float(computed["close"]),
+            "prev_close": float(computed["prev_close"]),
+            "as_of": computed["as_of"],
+        })
+
+    def stats(self) -> Dict:
+        with self._lock:
+            subscriptions = {sub for subs in self._subs.values() for sub in subs}
+            return {
+                "subscribers": len(subscriptions),
+                "tickers": len(self._subs),
+                "published": self.published,
+                "unchanged": self.unchanged,
+                "deliveries": self.deliveries,
+                "dropped": sum(sub.dropped for sub in subscriptions),
+            }
+
+
+_hub: Optional[BroadcastHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_hub() -> BroadcastHub:
+    """Process-wide hub, registered as a signal_service listener on first use."""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            from engine.signal_service import add_signal_listener
+
+            _hub = BroadcastHub(API_CONFIG.get("STREAM_QUEUE_SIZE", 100))
+            add_signal_listener(_hub.publish_signal)
+        return _hub
+
+
+def set_hub(hub: Optional[BroadcastHub]):
+    """Replace the process-wide hub (tests)."""
+    global _hub
+    from engine.signal_service import add_signal_listener, remove_signal_listener
+
+    with _hub_lock:
+        if _hub is not None:
+            remove_signal_listener(_hub.publish_signal)
+        _hub = hub
+        if hub is not None:
+            add_signal_listener(hub.publish_signal)
@@ -0,0 +1,185 @@
+"""
+Tiered TTL + LRU cache.
+
+Tier 1 is an in-process OrderedDict in LRU order, bounded by an estimated
+size in bytes. Tier 2 (optional) is a directory of pickles shared by every
+process on the host, consulted on a memory miss and written on every put.
+Both tiers expire entries after their TTL.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+
+def estimate_size(obj, _depth=0) -> int:
+    """Approximate memory footprint in bytes (DataFrames and arrays by their buffers)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if _depth < 6:
+        if isinstance(obj, dict):
+            size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in obj.items())
+        elif isinstance(obj, (list, tuple, set)):
+            size += sum(estimate_size(v, _depth + 1) for v in obj)
+    return size
+
+
+class TieredCache:
+    """
+    LRU cache with per-entry TTL, a byte budget and an optional disk tier.
+
+    Args:
+        max_bytes: Evict least recently used entries above this estimated size
+        ttl: Seconds an entry stays valid in memory (None = no expiry)
+        disk_dir: Directory for the shared pickle tier (None = memory only)
+        disk_ttl: Seconds a disk entry stays valid (defaults to ttl)
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None,
+                 disk_dir=None, disk_ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_ttl = ttl if disk_ttl is None else disk_ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ----- memory tier -----
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _store(self, key, value, size, stored_at):
+        if key in self._entries:
+            self._drop(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size, stored_at)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    # ----- disk tier -----
+
+    def _disk_path(self, key) -> Path:
+        return self.disk_dir / f"{hashlib.sha1(repr(key).encode('utf-8')).hexdigest()}.pkl"
+
+    def _disk_get(self, key):
+        path = self._disk_path(key)
+        try:
+            if self.disk_ttl is not None and time.time() - os.stat(path).st_mtime > self.disk_ttl:
+                return _MISSING
+            with open(path, "rb") as f:
+                stored_key, value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return _MISSING
+        return value if stored_key == key else _MISSING
+
+    def _disk_put(self, key, value):
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"⚠️  Cache disk write failed: {e}")
+
+    # ----- public API -----
+
+    def get(self, key: Hashable, default=None) -> Any:
+        """Cached value for key (memory, then disk), or default."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, stored_at = entry
+                if self.ttl is None or now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._drop(key)
+                self.expirations += 1
+
+        if self.disk_dir is not None:
+            value = self._disk_get(key)
+            if value is not _MISSING:
+                with self._lock:
+                    self._store(key, value, estimate_size(value), now)
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None):
+        """Store value in memory (and on disk when the disk tier is enabled)."""
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            self._store(key, value, size, time.time())
+        if self.disk_dir is not None:
+            self._disk_put(key, value)
+
+    def pop(self, key: Hashable):
+        """Remove key from both tiers (no-op if absent)."""
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+        if self.disk_dir is not None:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Empty the memory tier (the disk tier expires on its own)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate_pct": round((self.hits + self.disk_hits) / lookups * 100, 2) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "ttl_seconds": self.ttl,
+                "disk_dir": str(self.disk_dir) if self.disk_dir else None,
+            }
@@ -226,3 +226,340 @@ def decision_engine(df):
 
 
 
+# ===== VECTORIZED (WHOLE-HISTORY) DECISION ENGINE =====
+# decision_engine() only ever looks at the last row, so scoring row i of a
+# frame is the same as scoring df.iloc[:i+1]. The tables below encode each
+# scoring block as a small state code per row; the scalar branches above are
+# reproduced with boolean masks in the same order so results are identical.
+
+_TREND_STATES = [None, "strong_up", "moderate_up", "weak_up", "strong_down", "moderate_down", "weak_down", "mixed"]
+_TREND_POINTS = np.array([0.0, 3.0, 2.0, 1.0, -3.0, -2.0, -1.0, 0.0])
+_TREND_REASONS = [
+    None,
+    "STRONG_UPTREND: Price > EMA20 > EMA50 > EMA200",
+    "UPTREND: Price > EMA20 > EMA50",
+    "WEAK_UPTREND: Price > EMA50",
+    "STRONG_DOWNTREND: Price < EMA20 < EMA50 < EMA200",
+    "DOWNTREND: Price < EMA20 < EMA50",
+    "WEAK_DOWNTREND: Price < EMA50",
+    None,
+]
+
+_RSI_STATES = [None, None, "overbought", "oversold"]
+_RSI_POINTS = np.array([0.0, 1.0, -1.0, 1.0])
+_RSI_REASONS = [
+    None,
+    "RSI_NEUTRAL: 30-70 range (no overbought/oversold)",
+    "RSI_OVERBOUGHT: >= 70 (potential reversal)",
+    "RSI_OVERSOLD: <= 30 (potential bounce)",
+]
+
+_MACD_STATES = [None, "bullish", "bearish", "neutral"]
+_MACD_POINTS = np.array([0.0, 2.0, -2.0, 0.0])
+_MACD_REASONS = [
+    None,
+    "MACD_BULLISH: MACD above signal line (uptrend)",
+    "MACD_BEARISH: MACD below signal line (downtrend)",
+    "MACD_NEUTRAL: Transitioning",
+]
+
+_BB_STATES = [None, "above_upper", "below_lower", "in_range"]
+_BB_POINTS = np.array([0.0, 0.5, 0.5, 0.0])
+_BB_REASONS = [
+    None,
+    "BREAKOUT_UP: Price above upper Bollinger Band",
+    "OVERSOLD_BB: Price below lower Bollinger Band",
+    None,
+]
+
+_VOLUME_STATES = [None, "high", "above_avg", "low", "normal"]
+_VOLUME_POINTS = np.array([0.0, 1.5, 0.5, -0.5, 0.0])
+_VOLUME_REASONS = [
+    None,
+    "HIGH_VOLUME: {:.2f}x avg (strong conviction)",
+    "ABOVE_AVG_VOLUME: {:.2f}x avg",
+    "LOW_VOLUME: {:.2f}x avg (weak signal)",
+    None,
+]
+
+_SIGNAL_META = {
+    "BUY": ("uptrend_entry", "long"),
+    "SHORT": ("downtrend_entry", "short"),
+    "SELL": ("exit_or_avoid", "neutral"),
+    "HOLD": ("wait", "neutral"),
+}
+
+
+# Indicator columns read by the scoring core
+_SCORE_COLUMNS = ["Close", "ema20", "ema50", "ema200", "rsi", "macd", "macd_signal",
+                  "bb_upper", "bb_lower", "atr", "volume_ratio"]
+
+
+def _column(df, name):
+    """Return a column as a float64 array, or None when the column is missing."""
+    if name not in df.columns:
+        return None
+    col = df[name]
+    if hasattr(col, "ndim") and col.ndim > 1:
+        col = col.iloc[:, 0]
+    return pd.to_numeric(col, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _select(conditions, shape):
+    """Map ordered masks to codes 1..N (first match wins), 0 where none match."""
+    return np.select(conditions, list(range(1, len(conditions) + 1)), default=0).reshape(shape).astype(np.int8)
+
+
+def _score_arrays(cols, shape):
+    """
+    Vectorized scoring core shared by decision_engine_series and panel scoring.
+
+    Args:
+        cols: dict of indicator name -> float array of the given shape, or None if absent
+        shape: shape of the score array (n_rows,) or (n_rows, n_symbols)
+
+    Returns:
+        (score, codes) where score is the clamped score array and codes is a dict
+        of per-block state codes (trend, rsi, macd, bb, volume)
+    """
+    close = cols.get("Close")
+
+    with np.errstate(invalid="ignore"):
+        ema20, ema50, ema200 = cols.get("ema20"), cols.get("ema50"), cols.get("ema200")
+        if all(v is not None for v in (close, ema20, ema50, ema200)):
+            trend = _select([
+                (close > ema20) & (ema20 > ema50) & (ema50 > ema200),
+                (close > ema20) & (ema20 > ema50),
+                close > ema50,
+                (close < ema20) & (ema20 < ema50) & (ema50 < ema200),
+                (close < ema20) & (ema20 < ema50),
+                close < ema50,
+                np.ones(shape, dtype=bool),
+            ], shape)
+        else:
+            trend = np.zeros(shape, dtype=np.int8)
+
+        rsi = cols.get("rsi")
+        if rsi is not None:
+            rsi_code = _select([(rsi > 30) & (rsi < 70), rsi >= 70, rsi <= 30], shape)
+        else:
+            rsi_code = np.zeros(shape, dtype=np.int8)
+
+        macd, macd_signal = cols.get("macd"), cols.get("macd_signal")
+        if macd is not None and macd_signal is not None:
+            macd_diff = np.where(macd_signal != 0, macd - macd_signal, 0.0)
+            macd_code = _select([
+                (macd > macd_signal) & (macd_diff > 0),
+                (macd < macd_signal) & (macd_diff < 0),
+                np.ones(shape, dtype=bool),
+            ], shape)
+        else:
+            macd_code = np.zeros(shape, dtype=np.int8)
+
+        bb_upper, bb_lower = cols.get("bb_upper"), cols.get("bb_lower")
+        if bb_upper is not None and bb_lower is not None and close is not None:
+            bb_code = _select([close > bb_upper, close < bb_lower, np.ones(shape, dtype=bool)], shape)
+        else:
+            bb_code = np.zeros(shape, dtype=np.int8)
+
+        vol_ratio = cols.get("volume_ratio")
+        if vol_ratio is not None:
+            volume_code = _select([
+                vol_ratio > 1.5, vol_ratio > 1.2, vol_ratio < 0.7, np.ones(shape, dtype=bool)
+            ], shape)
+        else:
+            volume_code = np.zeros(shape, dtype=np.int8)
+
+    score = (
+        _TREND_POINTS[trend] + _RSI_POINTS[rsi_code] + _MACD_POINTS[macd_code]
+        + _BB_POINTS[bb_code] + _VOLUME_POINTS[volume_code]
+    )
+    score = np.clip(score, -10, 10)
+    codes = {"trend": trend, "rsi": rsi_code, "macd": macd_code, "bb": bb_code, "volume": volume_code}
+    return score, codes
+
+
+def classify_scores(score, buy_threshold=None, sell_threshold=None, short_threshold=None):
+    """
+    Map an array of scores to BUY/SELL/HOLD/SHORT using the decision_engine rules.
+
+    Thresholds default to SIGNAL_CONFIG. Returns an object array of signal strings.
+    """
+    buy_threshold = SIGNAL_CONFIG.get("BUY_THRESHOLD", 4.0) if buy_threshold is None else buy_threshold
+    sell_threshold = SIGNAL_CONFIG.get("SELL_THRESHOLD", -0.5) if sell_threshold is None else sell_threshold
+    short_threshold = SIGNAL_CONFIG.get("SHORT_THRESHOLD", -7.0) if short_threshold is None else short_threshold
+
+    score = np.asarray(score)
+    return np.select(
+        [score >= buy_threshold, score <= short_threshold, score <= sell_threshold],
+        np.array(["BUY", "SHORT", "SELL"], dtype=object),
+        default="HOLD",
+    ).astype(object)
+
+
+def _exact_round(values, ndigits):
+    """Python round() applied through the (few) unique values, so results match decision_engine exactly."""
+    uniq, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(float(v), ndigits) for v in uniq])
+    return rounded[inverse].reshape(np.shape(values))
+
+
+def _row_reasons(codes, vol_ratio, signals, scores):
+    """Build the per-row reasons lists in the same order as decision_engine."""
+    reasons = []
+    for i, (t, r, m, b, v) in enumerate(zip(
+        codes["trend"].tolist(), codes["rsi"].tolist(), codes["macd"].tolist(),
+        codes["bb"].tolist(), codes["volume"].tolist()
+    )):
+        row = []
+        if _TREND_REASONS[t]:
+            row.append(_TREND_REASONS[t])
+        if _RSI_REASONS[r]:
+            row.append(_RSI_REASONS[r])
+        if _MACD_REASONS[m]:
+            row.append(_MACD_REASONS[m])
+        if _BB_REASONS[b]:
+            row.append(_BB_REASONS[b])
+        if _VOLUME_REASONS[v]:
+            row.append(_VOLUME_REASONS[v].format(float(vol_ratio[i])))
+        if signals[i] == "SHORT":
+            row.append(f"SHORT_SIGNAL: Extreme downtrend (score {scores[i]:.1f}), profit from decline")
+        reasons.append(row)
+    return reasons
+
+
+def _row_meta(cols, codes, signals):
+    """Build the per-row meta dicts with the same keys and key order as decision_engine."""
+    names = ["Close", "ema20", "ema50", "ema200", "rsi", "macd", "macd_signal", "atr", "volume_ratio"]
+    keys = ["close", "ema20", "ema50", "ema200", "rsi", "macd", "macd_signal", "atr", "vol_ratio"]
+    n = len(signals)
+    values = [cols[name].tolist() if cols.get(name) is not None else [None] * n for name in names]
+    close_vals, atr_vals = values[0], values[7]
+    states = [
+        ("trend_strength", _TREND_STATES, codes["trend"].tolist()),
+        ("rsi_state", _RSI_STATES, codes["rsi"].tolist()),
+        ("macd_state", _MACD_STATES, codes["macd"].tolist()),
+        ("bb_state", _BB_STATES, codes["bb"].tolist()),
+        ("volume_state", _VOLUME_STATES, codes["volume"].tolist()),
+    ]
+
+    metas = []
+    for i in range(n):
+        meta = {key: vals[i] for key, vals in zip(keys, values)}
+        for key, table, block_codes in states:
+            state = table[block_codes[i]]
+            if state:
+                meta[key] = state
+
+        atr = atr_vals[i]
+        if atr is not None:
+            meta["atr"] = atr
+            meta["stop_loss_distance"] = atr
+            close = close_vals[i]
+            if close is not None and atr > 0:
+                meta["stop_loss_pct"] = round((atr / close) * 100, 2)
+
+        meta["signal_type"], meta["position_direction"] = _SIGNAL_META[signals[i]]
+        metas.append(meta)
+    return metas
+
+
+def decision_scores(df) -> np.ndarray:
+    """
+    Raw (unrounded) decision_engine score for every row of df.
+
+    This is the value classify_scores compares against the thresholds, so
+    callers can try many threshold sets without rescoring the history.
+    """
+    cols = {name: _column(df, name) for name in _SCORE_COLUMNS}
+    return _score_arrays(cols, (len(df),))[0]
+
+
+def decision_scores_panel(panel) -> np.ndarray:
+    """
+    Raw decision_engine score for every (date, ticker) cell of an add_indicators_panel panel.
+
+    Returns a (dates x tickers) float array; column j equals decision_scores
+    of ticker j's own frame on the dates where it has a Close.
+    """
+    shape = panel["Close"].shape
+    cols = {name: panel[name].to_numpy(dtype=np.float64) if name in panel else None for name in _SCORE_COLUMNS}
+    return _score_arrays(cols, shape)[0]
+
+
+def decision_engine_series(df, reasons=True, meta=False):
+    """
+    Vectorized decision_engine over every row of a DataFrame.
+
+    Row i of the result is identical to decision_engine(df.iloc[:i+1]), but the
+    whole history is scored in one pass with NumPy masks instead of one slice
+    and one Python evaluation per bar. Use this for backtests and screens.
+
+    Args:
+        df: DataFrame with OHLCV data and all technical indicators
+        reasons: If True, include a "reasons" column (list of reason strings per row)
+        meta: If True, include a "meta" column (decision_engine meta dict per row)
+
+    Returns:
+        DataFrame indexed like df with signal, score, confidence
+        (+ reasons / meta when requested)
+    """
+    cols = {name: _column(df, name) for name in _SCORE_COLUMNS}
+
+    raw_score, codes = _score_arrays(cols, (len(df),))
+    score = _exact_round(raw_score, 2)
+    confidence = _exact_round((raw_score + 10) / 20, 2)
+    signals = classify_scores(raw_score)
+
+    out = pd.DataFrame({"signal": signals, "score": score, "confidence": confidence}, index=df.index)
+    if reasons:
+        out["reasons"] = _row_reasons(codes, cols["volume_ratio"], signals, raw_score)
+    if meta:
+        out["meta"] = _row_meta(cols, codes, signals)
+    return out
+
+
+def decision_engine_panel(panel, reasons=False, meta=False):
+    """
+    Vectorized decision_engine for a whole universe at once.
+
+    Scores each ticker's latest bar (its last row with a Close) from a panel
+    produced by add_indicators_panel. Row t of the result is identical to
+    decision_engine(add_indicators(frame_t)) for that ticker's own frame.
+
+    Args:
+        panel: dict of indicator name -> DataFrame (dates x tickers)
+        reasons: If True, include a "reasons" column
+        meta: If True, include a "meta" column
+
+    Returns:
+        DataFrame indexed by ticker with date, signal, score, confidence
+        (+ reasons / meta when requested); tickers without data are dropped
+    """
+    close = panel["Close"]
+    values = close.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    has_data = valid.any(axis=0)
+    # Last row with a Close per ticker
+    last = len(values) - 1 - valid[::-1].argmax(axis=0)
+    cols_idx = np.flatnonzero(has_data)
+    rows = last[cols_idx]
+
+    cols = {}
+    for name in _SCORE_COLUMNS:
+        frame = panel.get(name)
+        cols[name] = frame.to_numpy(dtype=np.float64)[rows, cols_idx] if frame is not None else None
+
+    raw_score, codes = _score_arrays(cols, (len(cols_idx),))
+    signals = classify_scores(raw_score)
+    out = pd.DataFrame({
+        "date": close.index[rows],
+        "signal": signals,
+        "score": _exact_round(raw_score, 2),
+        "confidence": _exact_round((raw_score + 10) / 20, 2),
+    }, index=close.columns[cols_idx])
+    if reasons:
+        out["reasons"] = _row_reasons(codes, cols["volume_ratio"], signals, raw_score)
+    if meta:
+        out["meta"] = _row_meta(cols, codes, signals)
+    return out
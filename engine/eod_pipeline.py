@@ -0,0 +1,301 @@
+"""
+End-of-day pipeline run in the background after the IDX close.
+
+One run brings the whole SUPPORTED_STOCKS universe up to date, stage by stage:
+
+1. prices       - sync new bars into the price store (grouped requests)
+2. signals      - latest_signal for every ticker, which warms the signal cache
+3. screener     - rebuild the screener SignalTable
+4. fundamentals - re-fetch Yahoo fundamentals older than CACHE_AGE_HOURS
+
+Signals are scored with add_indicators over the lookback window, exactly as
+the request path does, so the snapshot and the cache agree with /signal.
+The incremental IndicatorState (indicators/incremental.py) is not used
+here: it runs over the whole stored history, and indicators seeded from a
+different first bar would score differently from the request path.
+
+The result is published as a versioned snapshot (swapped in atomically and
+persisted to JSON), so request handlers answer from memory and the run
+report shows where the time went.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    from config import DATA_CONFIG, EOD_CONFIG, SCREENER_CONFIG, SUPPORTED_STOCKS
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import DATA_CONFIG, EOD_CONFIG, SCREENER_CONFIG, SUPPORTED_STOCKS
+
+from engine.screener import AfterCloseRefresher, SignalTable, get_signal_table, start_background_refresh
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent.parent / "data" / "eod_snapshot.json"
+SNAPSHOT_FORMAT = 1
+STAGES = ["prices", "signals", "screener", "fundamentals"]
+
+
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, np.datetime64)):
+        return str(obj)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+class EODPipeline:
+    """
+    After-close precompute of prices, indicators, signals, screener and fundamentals.
+
+    Args:
+        universe: {symbol: {"is_us", ...}}; defaults to SUPPORTED_STOCKS
+        period: Lookback for prices and signals; defaults to DATA_CONFIG LOOKBACK_PERIOD
+        table: Screener table to rebuild (None = the process-wide table)
+        path: JSON file the snapshot is persisted to
+        refresh_fundamentals: Run the fundamentals stage (default EOD_CONFIG REFRESH_FUNDAMENTALS)
+    """
+
+    def __init__(self, universe: Optional[Dict] = None, period: Optional[str] = None,
+                 table: Optional[SignalTable] = None, path=None,
+                 refresh_fundamentals: Optional[bool] = None):
+        self.universe = SUPPORTED_STOCKS if universe is None else universe
+        self.period = period or DATA_CONFIG.get("LOOKBACK_PERIOD", "1y")
+        self.table = table
+        self.path = Path(path or EOD_CONFIG.get("SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH)
+        self.refresh_fundamentals = (EOD_CONFIG.get("REFRESH_FUNDAMENTALS", True)
+                                     if refresh_fundamentals is None else refresh_fundamentals)
+        self._snapshot: Optional[Dict] = None
+        self._loaded = False
+        self._run_lock = threading.Lock()
+
+    # ----- persistence -----
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == SNAPSHOT_FORMAT:
+                self._snapshot = data
+        except (OSError, ValueError):
+            pass
+
+    def _save(self, snapshot):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, default=_json_default)
+        os.replace(tmp, self.path)
+
+    @property
+    def snapshot(self) -> Optional[Dict]:
+        """Latest published snapshot (None before the first run)."""
+        self._load()
+        return self._snapshot
+
+    @property
+    def generated_at(self) -> Optional[datetime]:
+        snap = self.snapshot
+        return datetime.fromisoformat(snap["generated_at"]) if snap else None
+
+    def signal(self, ticker: str) -> Optional[Dict]:
+        """Precomputed signal for one ticker from the latest snapshot, or None."""
+        snap = self.snapshot
+        return snap["signals"].get(ticker) if snap else None
+
+    # ----- stages -----
+
+    def _groups(self) -> Dict[bool, List[str]]:
+        groups = {}
+        for symbol, info in self.universe.items():
+            groups.setdefault(bool(info.get("is_us", False)), []).append(symbol)
+        return groups
+
+    def _prices(self, errors):
+        from data.fetcher import get_price_store, market_symbol
+
+        store = get_price_store()
+        count = 0
+        for is_us, symbols in self._groups().items():
+            by_store = {market_symbol(s, is_us): s for s in symbols}
+            failed = store.sync_many(list(by_store), self.period)
+            for store_symbol, reason in failed.items():
+                errors[by_store[store_symbol]] = reason
+            count += len(by_store) - len(failed)
+        return count
+
+    def _signals(self, errors, signals):
+        from engine.signal_service import latest_signal
+
+        for is_us, symbols in self._groups().items():
+            for symbol in symbols:
+                try:
+                    computed = latest_signal(symbol, is_us, self.period)
+                except Exception as e:
+                    errors[symbol] = str(e)
+                    continue
+                if computed is None:
+                    errors[symbol] = "no data"
+                    continue
+                decision = computed["decision"]
+                signals[symbol] = {
+                    "signal": decision["signal"],
+                    "score": decision["score"],
+                    "confidence": decision["confidence"],
+                    "reasons": decision["reasons"],
+                    "meta": decision["meta"],
+                    "date": computed["as_of"],
+                    "close": computed["close"],
+                    "prev_close": computed["prev_close"],
+                }
+        return len(signals)
+
+    def _screener(self, errors):
+        table = self.table or get_signal_table()
+        snapshot = table.refresh()
+        errors.update(snapshot.get("errors", {}) if snapshot else {})
+        return len(snapshot["rows"]) if snapshot else 0
+
+    def _fundamentals(self, errors, fundamentals):
+        from data.fetchers.fundamentals_refresher import refresh_fundamentals
+
+        fetched = 0
+        for item in refresh_fundamentals(list(self.universe)):
+            data = item["data"]
+            if item["status"] == "error":
+                errors[item["symbol"]] = data.get("error", "error")
+                continue
+            fetched += item["status"] == "ok"
+            fundamentals[item["symbol"]] = {
+                "status": item["status"],
+                "latest": (data.get("fundamentals") or [None])[0],
+                "source": data.get("source"),
+            }
+        return fetched
+
+    def _run_stage(self, name: str, fn: Callable, report: List[Dict], all_errors: Dict, *args):
+        errors: Dict[str, str] = {}
+        started = time.perf_counter()
+        try:
+            count = fn(errors, *args)
+            ok = True
+        except Exception as e:
+            count, ok = 0, False
+            errors["*"] = str(e)
+        seconds = round(time.perf_counter() - started, 3)
+        report.append({"stage": name, "ok": ok, "seconds": seconds, "count": count, "errors": len(errors)})
+        for symbol, reason in errors.items():
+            all_errors.setdefault(symbol, {})[name] = reason
+        print(f"{'✅' if ok else '❌'} EOD {name}: {count} in {seconds}s ({len(errors)} errors)")
+
+    # ----- run -----
+
+    def refresh(self) -> Dict:
+        """Run every stage and publish a new snapshot; concurrent callers wait for the running one."""
+        with self._run_lock:
+            started = time.perf_counter()
+            report: List[Dict] = []
+            errors: Dict[str, Dict[str, str]] = {}
+            signals: Dict[str, Dict] = {}
+            fundamentals: Dict[str, Dict] = {}
+
+            self._run_stage("prices", self._prices, report, errors)
+            self._run_stage("signals", self._signals, report, errors, signals)
+            self._run_stage("screener", self._screener, report, errors)
+            if self.refresh_fundamentals:
+                self._run_stage("fundamentals", self._fundamentals, report, errors, fundamentals)
+
+            previous = self.snapshot
+            if not signals and previous:
+                print(f"⚠️  EOD run produced no signals ({len(errors)} errors), keeping snapshot v{previous['version']}")
+                return previous
+            snapshot = {
+                "format": SNAPSHOT_FORMAT,
+                "version": (previous["version"] if previous else 0) + 1,
+                "generated_at": datetime.now().astimezone().isoformat(),
+                "as_of": max((s["date"] for s in signals.values()), default=None),
+                "run_seconds": round(time.perf_counter() - started, 3),
+                "stages": report,
+                "signals": dict(sorted(signals.items())),
+                "fundamentals": dict(sorted(fundamentals.items())),
+                "errors": errors,
+            }
+            self._save(snapshot)
+            self._snapshot = snapshot
+            print(f"✅ EOD snapshot v{snapshot['version']}: {len(signals)} signals, "
+                  f"{len(errors)} symbols with errors, {snapshot['run_seconds']}s")
+            return snapshot
+
+    def status(self) -> Dict:
+        """Snapshot header and stage report, without the per-symbol payload."""
+        snap = self.snapshot
+        if snap is None:
+            return {"version": None, "generated_at": None, "as_of": None, "stages": []}
+        return {
+            "version": snap["version"],
+            "generated_at": snap["generated_at"],
+            "as_of": snap["as_of"],
+            "run_seconds": snap["run_seconds"],
+            "stages": snap["stages"],
+            "signals": len(snap["signals"]),
+            "fundamentals": len(snap["fundamentals"]),
+            "errors": snap["errors"],
+        }
+
+
+# ===== SCHEDULER =====
+
+_pipeline: Optional[EODPipeline] = None
+_scheduler: Optional[AfterCloseRefresher] = None
+_singleton_lock = threading.Lock()
+
+
+def get_eod_pipeline() -> EODPipeline:
+    """Process-wide pipeline whose snapshot the API endpoints read."""
+    global _pipeline
+    with _singleton_lock:
+        if _pipeline is None:
+            _pipeline = EODPipeline()
+        return _pipeline
+
+
+def set_eod_pipeline(pipeline: Optional[EODPipeline]):
+    """Replace the process-wide pipeline (tests, alternate universes)."""
+    global _pipeline
+    with _singleton_lock:
+        _pipeline = pipeline
+
+
+def start_eod_scheduler():
+    """
+    Start the after-close pipeline once per process.
+
+    Runs immediately if the snapshot predates the last close. The pipeline
+    rebuilds the screener table, so with EOD_CONFIG AUTO_RUN off this falls
+    back to the screener-only refresher.
+    """
+    global _scheduler
+    if not EOD_CONFIG.get("AUTO_RUN", True):
+        return start_background_refresh()
+    pipeline = get_eod_pipeline()
+    with _singleton_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = AfterCloseRefresher(
+                pipeline, name="eod-pipeline",
+                refresh_after=EOD_CONFIG.get("RUN_AFTER", SCREENER_CONFIG.get("REFRESH_AFTER", "16:30")),
+                timezone=DATA_CONFIG.get("TIMEZONE", "Asia/Jakarta"),
+            )
+            _scheduler.start()
+        return _scheduler
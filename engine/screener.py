@@ -0,0 +1,335 @@
+"""
+Whole-universe screener backed by a precomputed signal table.
+
+The table holds the latest decision_engine output for every ticker in
+SUPPORTED_STOCKS. It is rebuilt in one batched pass (grouped fetch, panel
+indicators, panel scoring) by a background job after market close and
+persisted to JSON, so /screener requests only filter and sort ~100 rows.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+try:
+    from config import DATA_CONFIG, SCREENER_CONFIG, SUPPORTED_STOCKS
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import DATA_CONFIG, SCREENER_CONFIG, SUPPORTED_STOCKS
+
+DEFAULT_TABLE_PATH = Path(__file__).parent.parent / "data" / "screener_table.json"
+
+SORT_FIELDS = ["score", "confidence", "symbol", "sector", "close", "change_pct", "rsi", "volume_ratio"]
+TABLE_VERSION = 1
+
+
+# ===== BUILD =====
+
+def _sector(symbol: str, info: Dict) -> str:
+    if info.get("sector"):
+        return info["sector"]
+    from idx_stocks_complete import ALL_IDX_STOCKS  # full IDX listing, used only for missing sectors
+    return ALL_IDX_STOCKS.get(symbol, {}).get("sector", "Other")
+
+
+def _num(value, ndigits=2):
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else round(value, ndigits)
+
+
+def build_signal_table(universe: Optional[Dict] = None, period: Optional[str] = None):
+    """
+    Score every ticker in the universe in one batched pass.
+
+    Args:
+        universe: {symbol: {"is_us", "name", "sector"}}; defaults to SUPPORTED_STOCKS
+        period: Lookback fed to the indicators; defaults to DATA_CONFIG LOOKBACK_PERIOD
+                (the same history /signal uses, so rows match /signal)
+
+    Returns:
+        (rows, errors): list of row dicts, and {symbol: reason} for tickers without data
+    """
+    from data.fetcher import fetch_eod_batch
+    from engine.decision import decision_engine_panel
+    from indicators.technical import add_indicators_panel, build_panel
+
+    universe = SUPPORTED_STOCKS if universe is None else universe
+    period = period or DATA_CONFIG.get("LOOKBACK_PERIOD", "1y")
+
+    frames, errors = {}, {}
+    for is_us in (False, True):
+        group = [s for s, info in universe.items() if bool(info.get("is_us", False)) == is_us]
+        if group:
+            got, failed = fetch_eod_batch(group, is_us=is_us, period=period)
+            frames.update(got)
+            errors.update(failed)
+    if not frames:
+        return [], errors
+
+    panel = add_indicators_panel(build_panel(frames))
+    decisions = decision_engine_panel(panel)
+
+    def latest(name, symbol, date):
+        frame = panel.get(name)
+        return _num(frame.at[date, symbol], 4 if name == "Close" else 2) if frame is not None else None
+
+    rows = []
+    for symbol, decision in decisions.iterrows():
+        info = universe.get(symbol, {})
+        rows.append({
+            "symbol": symbol,
+            "name": info.get("name", symbol),
+            "sector": _sector(symbol, info),
+            "is_us": bool(info.get("is_us", False)),
+            "signal": decision["signal"],
+            "score": float(decision["score"]),
+            "confidence": float(decision["confidence"]),
+            "date": decision["date"].strftime("%Y-%m-%d"),
+            "close": latest("Close", symbol, decision["date"]),
+            "change_pct": latest("daily_return_pct", symbol, decision["date"]),
+            "rsi": latest("rsi", symbol, decision["date"]),
+            "volume_ratio": latest("volume_ratio", symbol, decision["date"]),
+        })
+    return rows, errors
+
+
+# ===== TABLE =====
+
+class SignalTable:
+    """
+    Materialized latest-signal table with atomic refresh and in-memory queries.
+
+    Args:
+        path: JSON file the table is persisted to (loaded lazily on first use)
+        builder: Callable returning (rows, errors); defaults to build_signal_table
+    """
+
+    def __init__(self, path=None, builder=None):
+        self.path = Path(path or SCREENER_CONFIG.get("TABLE_PATH") or DEFAULT_TABLE_PATH)
+        self.builder = builder or build_signal_table
+        self._snapshot: Optional[Dict] = None
+        self._loaded = False
+        self._refresh_lock = threading.Lock()
+
+    # ----- persistence -----
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == TABLE_VERSION:
+                self._snapshot = data
+        except (OSError, ValueError):
+            pass
+
+    def _save(self, snapshot):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, self.path)
+
+    @property
+    def snapshot(self) -> Optional[Dict]:
+        self._load()
+        return self._snapshot
+
+    @property
+    def generated_at(self) -> Optional[datetime]:
+        snap = self.snapshot
+        return datetime.fromisoformat(snap["generated_at"]) if snap else None
+
+    # ----- refresh -----
+
+    def refresh(self) -> Dict:
+        """Rebuild the table and swap it in; concurrent callers wait for the running build."""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            rows, errors = self.builder()
+            if not rows and self.snapshot:
+                print(f"⚠️  Screener refresh produced no rows ({len(errors)} errors), keeping previous table")
+                return self._snapshot
+            snapshot = {
+                "version": TABLE_VERSION,
+                "generated_at": datetime.now().astimezone().isoformat(),
+                "as_of": max((r["date"] for r in rows), default=None),
+                "build_seconds": round(time.perf_counter() - started, 3),
+                "rows": sorted(rows, key=lambda r: r["symbol"]),
+                "errors": errors,
+            }
+            self._save(snapshot)
+            self._snapshot = snapshot
+            print(f"✅ Screener table: {len(rows)} symbols, {len(errors)} errors, {snapshot['build_seconds']}s")
+            return snapshot
+
+    # ----- query -----
+
+    def query(self, signal: Optional[str] = None, min_score: Optional[float] = None,
+              max_score: Optional[float] = None, sector: Optional[str] = None,
+              sort: str = "score", order: str = "desc", limit: Optional[int] = None) -> Dict:
+        """
+        Filter and sort the latest table.
+
+        Args:
+            signal: One or more signals, comma-separated (e.g. "BUY" or "BUY,HOLD")
+            min_score / max_score: Inclusive score range
+            sector: One or more sectors, comma-separated, case-insensitive
+            sort: One of SORT_FIELDS
+            order: "asc" or "desc"
+            limit: Maximum rows returned
+
+        Returns:
+            dict with as_of, generated_at, total, count and results
+
+        Raises:
+            LookupError: the table has not been built yet
+            ValueError: unknown sort field or order
+        """
+        snap = self.snapshot
+        if snap is None:
+            raise LookupError("Screener table has not been built yet")
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of {SORT_FIELDS}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+
+        signals = {s.strip().upper() for s in signal.split(",") if s.strip()} if signal else None
+        sectors = {s.strip().lower() for s in sector.split(",") if s.strip()} if sector else None
+
+        rows = [
+            r for r in snap["rows"]
+            if (signals is None or r["signal"] in signals)
+            and (min_score is None or r["score"] >= min_score)
+            and (max_score is None or r["score"] <= max_score)
+            and (sectors is None or r["sector"].lower() in sectors)
+        ]
+        # Stored rows are in symbol order and sort() is stable, so ties stay alphabetical;
+        # missing values go last in either order
+        present = [r for r in rows if r[sort] is not None]
+        missing = [r for r in rows if r[sort] is None]
+        present.sort(key=lambda r: r[sort], reverse=(order == "desc"))
+        rows = present + missing
+        if limit is not None:
+            rows = rows[:max(limit, 0)]
+
+        return {
+            "as_of": snap["as_of"],
+            "generated_at": snap["generated_at"],
+            "total": len(snap["rows"]),
+            "count": len(rows),
+            "results": rows,
+        }
+
+
+# ===== BACKGROUND REFRESH =====
+
+def next_refresh_time(now: datetime, refresh_after: str = None, timezone: str = None) -> datetime:
+    """Next weekday at REFRESH_AFTER (market-local time) strictly after `now`."""
+    tz = ZoneInfo(timezone or SCREENER_CONFIG.get("TIMEZONE", "Asia/Jakarta"))
+    hour, minute = map(int, (refresh_after or SCREENER_CONFIG.get("REFRESH_AFTER", "16:30")).split(":"))
+    local = now.astimezone(tz)
+    candidate = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= local:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def last_refresh_time(now: datetime, refresh_after: str = None, timezone: str = None) -> datetime:
+    """Most recent weekday REFRESH_AFTER at or before `now`."""
+    tz = ZoneInfo(timezone or SCREENER_CONFIG.get("TIMEZONE", "Asia/Jakarta"))
+    hour, minute = map(int, (refresh_after or SCREENER_CONFIG.get("REFRESH_AFTER", "16:30")).split(":"))
+    candidate = now.astimezone(tz).replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate > now:
+        candidate -= timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate -= timedelta(days=1)
+    return candidate
+
+
+class AfterCloseRefresher(threading.Thread):
+    """
+    Daemon thread: refresh on start if the target predates the last close, then daily after close.
+
+    Args:
+        target: Object with refresh() and a generated_at datetime (None before the first build)
+        name: Thread name (also used in log lines)
+        refresh_after / timezone: Market-local run time (defaults from SCREENER_CONFIG)
+    """
+
+    def __init__(self, target, name: str = "screener-refresher", refresh_after: str = None,
+                 timezone: str = None):
+        super().__init__(name=name, daemon=True)
+        self.target = target
+        self.refresh_after = refresh_after
+        self.timezone = timezone
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _refresh(self):
+        try:
+            self.target.refresh()
+        except Exception as e:
+            print(f"❌ {self.name} failed: {e}")
+
+    def run(self):
+        now = datetime.now().astimezone()
+        generated = self.target.generated_at
+        if generated is None or generated < last_refresh_time(now, self.refresh_after, self.timezone):
+            self._refresh()
+        while not self._stop_event.is_set():
+            now = datetime.now().astimezone()
+            wait = (next_refresh_time(now, self.refresh_after, self.timezone) - now).total_seconds()
+            if self._stop_event.wait(max(wait, 1)):
+                break
+            self._refresh()
+
+
+class ScreenerRefresher(AfterCloseRefresher):
+    """After-close refresher for the signal table alone."""
+
+    def __init__(self, table: SignalTable):
+        super().__init__(table, name="screener-refresher")
+        self.table = table
+
+
+_table: Optional[SignalTable] = None
+_refresher: Optional[ScreenerRefresher] = None
+_singleton_lock = threading.Lock()
+
+
+def get_signal_table() -> SignalTable:
+    """Process-wide signal table used by the /screener endpoint."""
+    global _table
+    with _singleton_lock:
+        if _table is None:
+            _table = SignalTable()
+        return _table
+
+
+def start_background_refresh() -> Optional[ScreenerRefresher]:
+    """Start the after-close refresher once per process (no-op when AUTO_REFRESH is off)."""
+    global _refresher
+    if not SCREENER_CONFIG.get("AUTO_REFRESH", True):
+        return None
+    table = get_signal_table()
+    with _singleton_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = ScreenerRefresher(table)
+            _refresher.start()
+        return _refresher
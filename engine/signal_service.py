@@ -0,0 +1,195 @@
+"""
+Latest-signal computation shared by the API endpoints.
+
+/signal/{ticker}, /portfolio and /api/v2/stock/info all need fetch_eod ->
+add_indicators -> decision_engine for one ticker. Results are keyed by
+(ticker, market, lookback, last stored bar):
+
+- a TieredCache (SIGNAL_CACHE_CONFIG) serves repeated requests without
+  touching pandas; a new bar changes the key, and the superseded entry is
+  dropped when the new one is stored
+- latest_signal brings a stored symbol up to date before building the key
+  (upstream is asked at most every STORE_REFRESH_MINUTES), so a cache hit is
+  never older than that, not only bounded by TTL_SECONDS or the EOD run
+- on a miss, a single-flight group makes a burst of identical requests for
+  a hot ticker cost one computation
+- every fresh computation at the default lookback is handed to the signal
+  listeners (webhook dispatcher, streaming hub), which must not block
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from config import DATA_CONFIG, SIGNAL_CACHE_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import DATA_CONFIG, SIGNAL_CACHE_CONFIG
+
+from data.fetcher import fetch_eod, get_price_store, market_symbol
+from engine.cache import TieredCache
+from engine.decision import decision_engine
+from engine.singleflight import get_group
+from indicators.technical import add_indicators
+
+SIGNAL_GROUP = "signal"
+
+_cache: Optional[TieredCache] = None
+_cache_lock = threading.Lock()
+_current_keys: Dict[tuple, tuple] = {}  # (ticker, is_us, lookback) -> key of the cached entry
+_listeners: List[Callable[[str, Dict], None]] = []
+
+
+def get_signal_cache() -> Optional[TieredCache]:
+    """Process-wide signal cache (None when SIGNAL_CACHE_CONFIG ENABLED is off)."""
+    global _cache
+    if not SIGNAL_CACHE_CONFIG.get("ENABLED", True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            disk_dir = SIGNAL_CACHE_CONFIG.get("DISK_DIR")
+            if disk_dir and not Path(disk_dir).is_absolute():
+                disk_dir = Path(__file__).parent.parent / disk_dir
+            _cache = TieredCache(
+                max_bytes=SIGNAL_CACHE_CONFIG.get("MAX_BYTES", 256 * 1024 * 1024),
+                ttl=SIGNAL_CACHE_CONFIG.get("TTL_SECONDS"),
+                disk_dir=disk_dir,
+                disk_ttl=SIGNAL_CACHE_CONFIG.get("DISK_TTL_SECONDS"),
+            )
+        return _cache
+
+
+def set_signal_cache(cache: Optional[TieredCache]):
+    """Replace the process-wide cache (tests, custom sizing)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+        _current_keys.clear()
+
+
+def add_signal_listener(listener: Callable[[str, Dict], None]):
+    """
+    Call listener(ticker, computed) after every fresh computation at the default lookback.
+
+    Listeners run on the computing thread: hand the work off, never block.
+    """
+    with _cache_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_signal_listener(listener: Callable[[str, Dict], None]):
+    with _cache_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def _notify_listeners(ticker: str, computed: Dict):
+    for listener in list(_listeners):
+        try:
+            listener(ticker, computed)
+        except Exception as e:
+            print(f"⚠️  Signal listener {getattr(listener, '__name__', listener)} failed: {e}")
+
+
+def signal_key(ticker: str, is_us: bool = False, period: Optional[str] = None) -> tuple:
+    """
+    Cache and coalescing key: (ticker, is_us, lookback, as-of bar date).
+
+    The as-of date is the last bar in the price store (a metadata read, no
+    price data), so a computation started before a new bar lands is never
+    shared with requests that arrive after it.
+    """
+    lookback = period or DATA_CONFIG.get("LOOKBACK_PERIOD", "1y")
+    return (ticker, bool(is_us), lookback, get_price_store().last_date(market_symbol(ticker, is_us)))
+
+
+def compute_signal(ticker: str, is_us: bool = False, period: Optional[str] = None) -> Optional[Dict]:
+    """
+    fetch_eod -> add_indicators -> decision_engine for one ticker.
+
+    Returns:
+        {"ticker", "as_of", "close", "prev_close", "frame" (indicator DataFrame), "decision"},
+        or None without data
+    """
+    df = fetch_eod(ticker, is_us=is_us, period=period or DATA_CONFIG.get("LOOKBACK_PERIOD", "1y"))
+    if df is None or df.empty:
+        return None
+    df = add_indicators(df)
+    close = df["Close"].to_numpy(dtype=float)
+    return {
+        "ticker": ticker,
+        "as_of": df.index[-1].strftime("%Y-%m-%d"),
+        "close": float(close[-1]),
+        "prev_close": float(close[-2]) if len(close) > 1 else float(close[-1]),
+        "frame": df,
+        "decision": decision_engine(df),
+    }
+
+
+def _compute_and_cache(ticker, is_us, period):
+    computed = compute_signal(ticker, is_us, period)
+    lookback = period or DATA_CONFIG.get("LOOKBACK_PERIOD", "1y")
+    if computed is not None and lookback == DATA_CONFIG.get("LOOKBACK_PERIOD", "1y"):
+        _notify_listeners(ticker, computed)  # other lookbacks score differently and would flap
+    cache = get_signal_cache()
+    if computed is None or cache is None:
+        return computed
+
+    # The fetch may have synced a new bar: file the result under the bar it was computed on
+    series = (ticker, bool(is_us), lookback)
+    key = series + (computed["as_of"],)
+    with _cache_lock:
+        previous = _current_keys.get(series)
+        _current_keys[series] = key
+    if previous is not None and previous != key:
+        cache.pop(previous)
+    cache.put(key, computed)
+    return computed
+
+
+def _sync_stored(ticker: str, is_us: bool, period: Optional[str]):
+    """
+    Append new bars for a symbol the store already holds, if it is due a re-check.
+
+    needs_sync is a metadata read and the price store asks upstream at most every
+    refresh_minutes per symbol. Symbols never stored are seeded by fetch_eod inside
+    the single-flight call instead, so a burst of first requests seeds once.
+    """
+    store = get_price_store()
+    symbol = market_symbol(ticker, is_us)
+    lookback = period or DATA_CONFIG.get("LOOKBACK_PERIOD", "1y")
+    if store.last_date(symbol) is not None and store.needs_sync(symbol, lookback):
+        store.sync_many([symbol], lookback)
+
+
+def cached_signal(ticker: str, is_us: bool = False, period: Optional[str] = None) -> Optional[Dict]:
+    """
+    Cached latest_signal result for the last stored bar, or None (never computes).
+
+    Does not sync the price store: a hit can lag upstream until latest_signal,
+    fetch_eod or the EOD run appends the new bar, and at most TTL_SECONDS.
+    """
+    cache = get_signal_cache()
+    return cache.get(signal_key(ticker, is_us, period)) if cache is not None else None
+
+
+def latest_signal(ticker: str, is_us: bool = False, period: Optional[str] = None) -> Optional[Dict]:
+    """
+    compute_signal for the current bar: from the cache, else coalesced across
+    concurrent identical requests and cached.
+
+    The returned dict (and its frame) may be shared with other callers: read only.
+    """
+    _sync_stored(ticker, is_us, period)
+    key = signal_key(ticker, is_us, period)
+    cache = get_signal_cache()
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+    return get_group(SIGNAL_GROUP).do(key, _compute_and_cache, ticker, is_us, period)
@@ -0,0 +1,117 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one execution: the first
+caller runs the function, the others block until it finishes and receive
+the same result (or the same exception). Nothing is cached afterwards; the
+next call after completion runs again.
+
+Endpoints run in worker threads (sync FastAPI routes and api.executor), so
+coordination is plain threading.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls per key.
+
+    Args:
+        name: Label used in stats()
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0        # every do() call
+        self.executions = 0   # calls that actually ran fn
+        self.coalesced = 0    # calls served by another caller's execution
+        self.errors = 0       # executions that raised
+        self.max_waiters = 0  # largest number of callers sharing one execution
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) once for all concurrent callers with the same key.
+
+        Returns:
+            fn's result, shared by every caller (treat it as read-only)
+
+        Raises:
+            Whatever fn raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict:
+        """Counters plus the number of keys currently in flight."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalesced_pct": round(self.coalesced / self.calls * 100, 2) if self.calls else 0.0,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "max_waiters": self.max_waiters,
+            }
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_group(name: str) -> SingleFlight:
+    """Process-wide SingleFlight for `name` (created on first use)."""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+
+def flight_stats() -> Dict[str, Dict]:
+    """stats() of every group, keyed by name."""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,561 @@
+"""
+Webhook notifications for signal changes.
+
+- WebhookStore: SQLite registrations indexed by ticker, the last signal seen
+  per ticker (so diffs survive restarts) and a dead-letter table
+- diff_signal / match_events: compare a fresh decision_engine result with the
+  previous one and decide which subscribers get which events
+- WebhookDispatcher: an asyncio loop on a daemon thread, fed by a
+  signal_service listener. notify() only hands the fresh signal to the loop;
+  diffing, fan-out and delivery (pooled httpx client, retries with backoff,
+  dead-lettering) all happen there, so thousands of subscribers never slow
+  down scoring.
+"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import httpx
+except ImportError:  # optional: only needed to deliver
+    httpx = None
+
+try:
+    from config import WEBHOOK_CONFIG
+except (ImportError, ModuleNotFoundError):
+    parent_dir = str(Path(__file__).parent.parent)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from config import WEBHOOK_CONFIG
+
+DEFAULT_PATH = Path(__file__).parent.parent / "data" / "webhooks.db"
+
+EVENTS = ["signal_change", "price_alert", "min_confidence"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhooks (
+    id              TEXT PRIMARY KEY,
+    url             TEXT NOT NULL,
+    conditions      TEXT NOT NULL,
+    min_confidence  REAL NOT NULL,
+    created_at      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS webhook_tickers (
+    ticker      TEXT NOT NULL,
+    webhook_id  TEXT NOT NULL,
+    PRIMARY KEY (ticker, webhook_id)
+);
+CREATE TABLE IF NOT EXISTS last_signals (
+    ticker      TEXT PRIMARY KEY,
+    data        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    webhook_id  TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    attempts    INTEGER NOT NULL,
+    error       TEXT,
+    failed_at   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dead_letters_webhook ON dead_letters (webhook_id);
+"""
+
+
+# ===== STORE =====
+
+class WebhookStore:
+    """
+    Webhook registrations, last-seen signals and dead letters.
+
+    Args:
+        path: SQLite database file (created on first use)
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else DEFAULT_PATH
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread connection (WAL lets the dispatcher read while the API writes)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return conn
+
+    # ----- registrations -----
+
+    def register(self, url: str, tickers: Iterable[str], conditions: Iterable[str],
+                 min_confidence: float = 0.0) -> Dict:
+        """
+        Store a webhook subscribed to tickers.
+
+        Args:
+            url: Endpoint that receives POSTed events
+            tickers: Tickers to monitor (upper-cased)
+            conditions: Subset of EVENTS
+            min_confidence: 0-100; signal_change events below it are not sent
+
+        Returns:
+            The stored registration
+
+        Raises:
+            ValueError: unknown condition or no tickers
+        """
+        tickers = sorted({t.strip().upper() for t in tickers if t.strip()})
+        conditions = list(dict.fromkeys(conditions))
+        unknown = [c for c in conditions if c not in EVENTS]
+        if unknown:
+            raise ValueError(f"Unknown alert conditions {unknown}; choose from {EVENTS}")
+        if not tickers:
+            raise ValueError("At least one ticker is required")
+
+        record = {
+            "id": f"wh_{uuid.uuid4().hex[:16]}",
+            "url": url,
+            "tickers": tickers,
+            "conditions": conditions,
+            "min_confidence": float(min_confidence),
+            "created_at": datetime.now().isoformat(),
+        }
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO webhooks (id, url, conditions, min_confidence, created_at) VALUES (?, ?, ?, ?, ?)",
+                (record["id"], url, json.dumps(conditions), record["min_confidence"], record["created_at"]),
+            )
+            conn.executemany("INSERT INTO webhook_tickers (ticker, webhook_id) VALUES (?, ?)",
+                             [(t, record["id"]) for t in tickers])
+        return record
+
+    def get(self, webhook_id: str) -> Optional[Dict]:
+        conn = self._conn()
+        row = conn.execute("SELECT id, url, conditions, min_confidence, created_at FROM webhooks WHERE id = ?",
+                           (webhook_id,)).fetchone()
+        if row is None:
+            return None
+        tickers = [t for (t,) in conn.execute(
+            "SELECT ticker FROM webhook_tickers WHERE webhook_id = ? ORDER BY ticker", (webhook_id,))]
+        return {"id": row[0], "url": row[1], "tickers": tickers, "conditions": json.loads(row[2]),
+                "min_confidence": row[3], "created_at": row[4]}
+
+    def unregister(self, webhook_id: str) -> bool:
+        """Delete a webhook; False if it did not exist."""
+        conn = self._conn()
+        with conn:
+            deleted = conn.execute("DELETE FROM webhooks WHERE id = ?", (webhook_id,)).rowcount
+            conn.execute("DELETE FROM webhook_tickers WHERE webhook_id = ?", (webhook_id,))
+        return bool(deleted)
+
+    def subscribers(self, ticker: str) -> List[Dict]:
+        """Webhooks monitoring a ticker (one indexed query)."""
+        rows = self._conn().execute(
+            "SELECT w.id, w.url, w.conditions, w.min_confidence FROM webhook_tickers t "
+            "JOIN webhooks w ON w.id = t.webhook_id WHERE t.ticker = ?", (ticker,))
+        return [{"id": r[0], "url": r[1], "conditions": json.loads(r[2]), "min_confidence": r[3]} for r in rows]
+
+    # ----- last signal per ticker -----
+
+    def last_signal(self, ticker: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT data FROM last_signals WHERE ticker = ?", (ticker,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_last_signal(self, ticker: str, state: Dict):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO last_signals (ticker, data) VALUES (?, ?)",
+                         (ticker, json.dumps(state)))
+
+    # ----- dead letters -----
+
+    def add_dead_letter(self, delivery: Dict, error: str):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO dead_letters (webhook_id, url, payload, attempts, error, failed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (delivery["webhook_id"], delivery["url"], json.dumps(delivery["payload"]),
+                 delivery["attempts"], error, datetime.now().isoformat()),
+            )
+
+    def dead_letters(self, webhook_id: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Most recent dead-lettered deliveries, optionally for one webhook."""
+        sql = "SELECT webhook_id, url, payload, attempts, error, failed_at FROM dead_letters"
+        params: List = []
+        if webhook_id is not None:
+            sql += " WHERE webhook_id = ?"
+            params.append(webhook_id)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return [{"webhook_id": r[0], "url": r[1], "payload": json.loads(r[2]), "attempts": r[3],
+                 "error": r[4], "failed_at": r[5]} for r in self._conn().execute(sql, params)]
+
+
+# ===== DIFF =====
+
+def signal_state(ticker: str, computed: Dict) -> Dict:
+    """The fields of a compute_signal result that events are derived from."""
+    decision = computed["decision"]
+    return {
+        "ticker": ticker,
+        "as_of": computed["as_of"],
+        "signal": decision["signal"],
+        "score": float(decision["score"]),
+        "confidence": float(decision["confidence"]),
+        "close": float(computed["close"]),
+        "prev_close": float(computed["prev_close"]),
+    }
+
+
+def diff_signal(previous: Optional[Dict], current: Dict) -> Optional[Dict]:
+    """
+    Compare a fresh signal state with the previous one for the same ticker.
+
+    Returns:
+        Change record for match_events, or None on the first observation, for a
+        result older than the previous one, or when nothing event-worthy moved
+    """
+    if previous is None or current["as_of"] < previous["as_of"]:
+        return None
+    new_bar = current["as_of"] > previous["as_of"]
+    change_pct = (current["close"] / current["prev_close"] - 1) * 100 if current["prev_close"] else 0.0
+    if (current["signal"] == previous["signal"] and not new_bar
+            and current["confidence"] <= previous["confidence"]):
+        return None
+    return {
+        "ticker": current["ticker"],
+        "as_of": current["as_of"],
+        "new_bar": new_bar,
+        "old_signal": previous["signal"],
+        "new_signal": current["signal"],
+        "old_confidence": previous["confidence"],
+        "confidence": current["confidence"],
+        "score": current["score"],
+        "price": current["close"],
+        "change_pct": round(change_pct, 2),
+    }
+
+
+def match_events(change: Dict, subscriber: Dict, price_alert_pct: float) -> List[str]:
+    """Events from EVENTS that a subscriber should receive for a change."""
+    conditions = subscriber["conditions"]
+    threshold = subscriber["min_confidence"]
+    confidence = change["confidence"] * 100
+    events = []
+    if ("signal_change" in conditions and change["new_signal"] != change["old_signal"]
+            and confidence >= threshold):
+        events.append("signal_change")
+    if "price_alert" in conditions and change["new_bar"] and abs(change["change_pct"]) >= price_alert_pct:
+        events.append("price_alert")
+    if "min_confidence" in conditions and change["old_confidence"] * 100 < threshold <= confidence:
+        events.append("min_confidence")
+    return events
+
+
+def event_payload(change: Dict, subscriber: Dict, event: str) -> Dict:
+    """JSON body POSTed to a subscriber (confidence as 0-100, like min_confidence)."""
+    return {
+        "event_id": f"{subscriber['id']}:{change['ticker']}:{change['as_of']}:{event}",
+        "webhook_id": subscriber["id"],
+        "ticker": change["ticker"],
+        "event": event,
+        "old_signal": change["old_signal"],
+        "new_signal": change["new_signal"],
+        "confidence": round(change["confidence"] * 100, 1),
+        "score": change["score"],
+        "price": change["price"],
+        "change_pct": change["change_pct"],
+        "as_of": change["as_of"],
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+# ===== DISPATCHER =====
+
+class WebhookDispatcher:
+    """
+    Diff, fan-out and delivery on a dedicated asyncio loop.
+
+    Args:
+        store: WebhookStore (default: the process-wide store)
+        workers: Concurrent deliveries
+        queue_size: Pending deliveries before fan-out waits
+        timeout: Per-request timeout in seconds
+        max_attempts: Attempts before a delivery is dead-lettered
+        backoff: First retry delay in seconds (doubled per attempt)
+        price_alert_pct: |daily change %| that triggers price_alert
+        transport: httpx transport override (tests)
+
+    Defaults come from WEBHOOK_CONFIG.
+    """
+
+    def __init__(self, store: Optional[WebhookStore] = None, workers: Optional[int] = None,
+                 queue_size: Optional[int] = None, timeout: Optional[float] = None,
+                 max_attempts: Optional[int] = None, backoff: Optional[float] = None,
+                 price_alert_pct: Optional[float] = None, transport=None):
+        def option(value, key, default):
+            return WEBHOOK_CONFIG.get(key, default) if value is None else value
+
+        self.store = store or get_webhook_store()
+        self.workers = option(workers, "WORKERS", 32)
+        self.queue_size = option(queue_size, "QUEUE_SIZE", 10000)
+        self.timeout = option(timeout, "TIMEOUT_SECONDS", 5.0)
+        self.max_attempts = option(max_attempts, "MAX_ATTEMPTS", 4)
+        self.backoff = option(backoff, "BACKOFF_SECONDS", 1.0)
+        self.price_alert_pct = option(price_alert_pct, "PRICE_ALERT_PCT", 5.0)
+        self.transport = transport
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._retry_tasks = set()
+        self._outstanding = 0
+        self.counters = {"notified": 0, "changes": 0, "events": 0, "delivered": 0,
+                         "failed_attempts": 0, "retries": 0, "dead_lettered": 0}
+
+    # ----- lifecycle -----
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._ready.is_set()
+
+    def start(self):
+        """Start the dispatcher thread (no-op if already running)."""
+        if httpx is None:
+            raise RuntimeError("httpx is required for webhook delivery (pip install httpx)")
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="webhook-dispatcher", daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the loop; queued deliveries are dropped (use drain() first to finish them)."""
+        if self._loop is not None and self.running:
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join(timeout)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+            self._ready.clear()
+
+    async def _main(self):
+        self._stop = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._changes: asyncio.Queue = asyncio.Queue()
+        self._deliveries: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        limits = httpx.Limits(max_connections=WEBHOOK_CONFIG.get("MAX_CONNECTIONS", 100),
+                              max_keepalive_connections=WEBHOOK_CONFIG.get("MAX_CONNECTIONS", 100))
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, transport=self.transport) as client:
+            self._client = client
+            tasks = [asyncio.create_task(self._fanout())]
+            tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            self._ready.set()
+            await self._stop.wait()
+            for task in tasks + list(self._retry_tasks):
+                task.cancel()
+            await asyncio.gather(*tasks, *self._retry_tasks, return_exceptions=True)
+
+    # ----- bookkeeping (loop thread only) -----
+
+    def _track(self, delta: int):
+        self._outstanding += delta
+        if self._outstanding:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+    def _enqueue_change(self, state: Dict):
+        self._track(1)
+        self._changes.put_nowait(state)
+
+    # ----- public API (any thread) -----
+
+    def notify(self, ticker: str, computed: Dict) -> bool:
+        """
+        Hand a fresh compute_signal result to the dispatcher without blocking.
+
+        Returns:
+            False when the dispatcher is not running (the result is ignored)
+        """
+        if not self.running:
+            return False
+        self.counters["notified"] += 1
+        self._loop.call_soon_threadsafe(self._enqueue_change, signal_state(ticker, computed))
+        return True
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Wait until every notified signal is diffed and every event delivered or dead-lettered."""
+        if not self.running:
+            return True
+        future = asyncio.run_coroutine_threadsafe(self._idle.wait(), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            future.cancel()
+            return False
+
+    def stats(self) -> Dict:
+        running = self.running
+        return {
+            "running": running,
+            **self.counters,
+            "pending_changes": self._changes.qsize() if running else 0,
+            "pending_deliveries": self._deliveries.qsize() if running else 0,
+            "scheduled_retries": len(self._retry_tasks),
+            "workers": self.workers,
+        }
+
+    # ----- loop tasks -----
+
+    async def _fanout(self):
+        while True:
+            state = await self._changes.get()
+            try:
+                previous = self.store.last_signal(state["ticker"])
+                if previous is None or state["as_of"] >= previous["as_of"]:
+                    self.store.set_last_signal(state["ticker"], state)
+                change = diff_signal(previous, state)
+                if change is None:
+                    continue
+                self.counters["changes"] += 1
+                for subscriber in self.store.subscribers(state["ticker"]):
+                    for event in match_events(change, subscriber, self.price_alert_pct):
+                        self.counters["events"] += 1
+                        self._track(1)
+                        await self._deliveries.put({
+                            "webhook_id": subscriber["id"],
+                            "url": subscriber["url"],
+                            "payload": event_payload(change, subscriber, event),
+                            "attempts": 0,
+                        })
+            except Exception as e:
+                print(f"❌ Webhook fan-out failed for {state['ticker']}: {e}")
+            finally:
+                self._track(-1)
+
+    async def _worker(self):
+        while True:
+            delivery = await self._deliveries.get()
+            try:
+                await self._deliver(delivery)
+            except Exception as e:
+                self._dead_letter(delivery, str(e))
+
+    async def _deliver(self, delivery: Dict):
+        delivery["attempts"] += 1
+        payload = delivery["payload"]
+        try:
+            resp = await self._client.post(delivery["url"], json=payload, headers={
+                "X-Webhook-Id": delivery["webhook_id"],
+                "X-Webhook-Event": payload["event"],
+                "X-Webhook-Attempt": str(delivery["attempts"]),
+            })
+            if resp.status_code < 300:
+                self.counters["delivered"] += 1
+                self._track(-1)
+                return
+            error = f"HTTP {resp.status_code}"
+            # Client errors other than timeouts / rate limits will not fix themselves
+            permanent = 400 <= resp.status_code < 500 and resp.status_code not in (408, 429)
+        except httpx.HTTPError as e:
+            error, permanent = f"{type(e).__name__}: {e}", False
+
+        self.counters["failed_attempts"] += 1
+        if permanent or delivery["attempts"] >= self.max_attempts:
+            self._dead_letter(delivery, error)
+            return
+        self.counters["retries"] += 1
+        task = asyncio.create_task(self._retry(delivery, self.backoff * 2 ** (delivery["attempts"] - 1)))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _retry(self, delivery: Dict, delay: float):
+        await asyncio.sleep(delay)
+        await self._deliveries.put(delivery)
+
+    def _dead_letter(self, delivery: Dict, error: str):
+        try:
+            self.store.add_dead_letter(delivery, error)
+        except Exception as e:
+            print(f"❌ Could not dead-letter webhook delivery {delivery['payload'].get('event_id')}: {e}")
+        self.counters["dead_lettered"] += 1
+        self._track(-1)
+
+
+# ===== PROCESS-WIDE INSTANCES =====
+
+_store: Optional[WebhookStore] = None
+_dispatcher: Optional[WebhookDispatcher] = None
+_singleton_lock = threading.Lock()
+
+
+def get_webhook_store() -> WebhookStore:
+    """Process-wide store at WEBHOOK_CONFIG DB_PATH."""
+    global _store
+    with _singleton_lock:
+        if _store is None:
+            _store = WebhookStore(WEBHOOK_CONFIG.get("DB_PATH"))
+        return _store
+
+
+def get_dispatcher() -> WebhookDispatcher:
+    """Process-wide dispatcher (created stopped; see start_webhook_dispatcher)."""
+    global _dispatcher
+    store = get_webhook_store()
+    with _singleton_lock:
+        if _dispatcher is None:
+            _dispatcher = WebhookDispatcher(store)
+        return _dispatcher
+
+
+def set_webhooks(store: Optional[WebhookStore], dispatcher: Optional[WebhookDispatcher] = None):
+    """Replace the process-wide store and dispatcher (tests, alternate databases)."""
+    global _store, _dispatcher
+    with _singleton_lock:
+        if _dispatcher is not None and _dispatcher is not dispatcher:
+            _dispatcher.stop()
+        _store, _dispatcher = store, dispatcher
+
+
+def start_webhook_dispatcher() -> Optional[WebhookDispatcher]:
+    """Start delivering once per process (no-op when WEBHOOK_CONFIG ENABLED is off)."""
+    if not WEBHOOK_CONFIG.get("ENABLED", True):
+        return None
+    from engine.signal_service import add_signal_listener
+
+    dispatcher = get_dispatcher()
+    dispatcher.start()
+    add_signal_listener(notify_signal)
+    return dispatcher
+
+
+def notify_signal(ticker: str, computed: Dict) -> bool:
+    """Feed a fresh signal to the running dispatcher; no-op when webhooks are not started."""
+    dispatcher = _dispatcher
+    return dispatcher.notify(ticker, computed) if dispatcher is not None else False
@@ -0,0 +1,353 @@
+"""
+Incremental indicator engine for streaming daily bars.
+
+IndicatorState carries the recurrences behind add_indicators (EMA values,
+Wilder averages, rolling windows, running extremes). Feeding it one new
+OHLCV bar produces the same indicator row add_indicators would compute for
+that bar over the full history, in O(1) for the recursive indicators and
+O(window) for the 20-bar rolling statistics.
+
+The state serializes to JSON and is stored next to the price store
+({symbol}.indicators.json), so the end-of-day refresh of the whole universe
+only replays the bars that arrived since the last run.
+"""
+
+import json
+import math
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+EMA_WINDOWS = (20, 50, 100, 200, 252, 630)
+EMA_COLUMNS = {20: "ema20", 50: "ema50", 100: "ema100", 200: "ema200", 252: "ema_252", 630: "ema_630"}
+MACD_FAST, MACD_SLOW, MACD_SIGN = 12, 26, 9
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+BB_WINDOW, BB_DEV = 20, 2
+VOLUME_WINDOW = 20
+RANGE_WINDOW = 252
+
+STATE_VERSION = 1
+
+
+def _div(a, b):
+    """Float division with pandas semantics for a zero divisor (x/0 -> +-inf, 0/0 -> nan)."""
+    if b == 0:
+        return math.nan if a == 0 or math.isnan(a) else math.copysign(math.inf, a)
+    return a / b
+
+
+class _EWM:
+    """ewm(alpha, adjust=False, min_periods) as a running recurrence; NaN inputs before the first value are skipped."""
+
+    __slots__ = ("alpha", "min_periods", "value", "count")
+
+    def __init__(self, alpha, min_periods, value=math.nan, count=0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = value
+        self.count = count
+
+    def update(self, x):
+        if not math.isnan(x):
+            self.value = x if self.count == 0 else (1 - self.alpha) * self.value + self.alpha * x
+            self.count += 1
+        return self.value if self.count >= self.min_periods else math.nan
+
+
+def _span_ewm(span):
+    return _EWM(2.0 / (span + 1), span)
+
+
+class IndicatorState:
+    """
+    Running state of every add_indicators column for one symbol.
+
+    Usage:
+        state = IndicatorState.from_frame(history)   # replay once
+        row = state.update(date, o, h, l, c, v)      # then one bar at a time
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.first_date: Optional[str] = None
+        self.last_date: Optional[str] = None
+        self.prev_close = math.nan
+
+        self.emas = {w: _span_ewm(w) for w in EMA_WINDOWS}
+        self.macd_fast = _span_ewm(MACD_FAST)
+        self.macd_slow = _span_ewm(MACD_SLOW)
+        self.macd_sign = _span_ewm(MACD_SIGN)
+        self.rsi_up = _EWM(1.0 / RSI_WINDOW, RSI_WINDOW)
+        self.rsi_down = _EWM(1.0 / RSI_WINDOW, RSI_WINDOW)
+
+        self.atr = 0.0
+        self.tr_seed = 0.0  # sum of the first ATR_WINDOW true ranges
+
+        self.closes = deque(maxlen=BB_WINDOW)  # also the 20-bar volatility window
+        self.volumes = deque(maxlen=VOLUME_WINDOW)
+        # Monotonic deques of (row number, close) for the 52-week max / min
+        self.range_max = deque()
+        self.range_min = deque()
+        self.all_time_high = -math.inf
+        self.all_time_low = math.inf
+        self.last_row: Optional[Dict] = None
+
+    # ===== UPDATE =====
+
+    def update(self, date, open_, high, low, close, volume=math.nan) -> Dict:
+        """
+        Advance the state by one bar.
+
+        Args:
+            date: Bar date (anything pd.Timestamp accepts)
+            open_, high, low, close, volume: Bar values
+
+        Returns:
+            dict with the bar's OHLCV plus every add_indicators column
+        """
+        date = pd.Timestamp(date)
+        i = self.rows
+        close = float(close)
+        high, low, volume = float(high), float(low), float(volume)
+        prev_close = self.prev_close
+
+        row = {"Open": float(open_), "High": high, "Low": low, "Close": close, "Volume": volume}
+
+        # ----- trend -----
+        for w, ema in self.emas.items():
+            row[EMA_COLUMNS[w]] = ema.update(close)
+
+        # ----- momentum -----
+        diff = close - prev_close
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        ema_up, ema_down = self.rsi_up.update(up), self.rsi_down.update(down)
+        row["rsi"] = 100.0 if ema_down == 0 else 100 - 100 / (1 + _div(ema_up, ema_down))
+        row["rsi_oversold"] = row["rsi"] < 30
+        row["rsi_overbought"] = row["rsi"] > 70
+
+        macd = self.macd_fast.update(close) - self.macd_slow.update(close)
+        row["macd"] = macd
+        row["macd_signal"] = self.macd_sign.update(macd)
+        row["macd_diff"] = macd - row["macd_signal"]
+        row["macd_bullish"] = macd > row["macd_signal"]
+
+        # ----- volatility -----
+        self.closes.append(close)
+        if len(self.closes) == BB_WINDOW:
+            window = np.fromiter(self.closes, dtype=np.float64, count=BB_WINDOW)
+            mean = window.mean()
+            var = float(((window - mean) ** 2).sum())
+            mean, std0, std1 = float(mean), math.sqrt(var / BB_WINDOW), math.sqrt(var / (BB_WINDOW - 1))
+        else:
+            mean = std0 = std1 = math.nan
+        row["bb_upper"] = mean + BB_DEV * std0
+        row["bb_middle"] = mean
+        row["bb_lower"] = mean - BB_DEV * std0
+        row["bb_percent"] = _div(close - row["bb_lower"], row["bb_upper"] - row["bb_lower"])
+
+        tr = high - low
+        if not math.isnan(prev_close):
+            tr = max(tr, abs(high - prev_close), abs(low - prev_close))
+        if i < ATR_WINDOW:
+            self.tr_seed += tr
+            if i == ATR_WINDOW - 1:
+                self.atr = self.tr_seed / ATR_WINDOW
+        else:
+            self.atr = (self.atr * (ATR_WINDOW - 1) + tr) / ATR_WINDOW
+        row["atr"] = self.atr
+        row["volatility"] = std1
+
+        # ----- volume -----
+        self.volumes.append(volume)
+        volume_sma = sum(self.volumes) / VOLUME_WINDOW if len(self.volumes) == VOLUME_WINDOW else math.nan
+        row["volume_sma"] = volume_sma
+        row["volume_ratio"] = _div(volume, volume_sma)
+
+        # ----- support & resistance -----
+        while self.range_max and self.range_max[-1][1] <= close:
+            self.range_max.pop()
+        self.range_max.append((i, close))
+        while self.range_min and self.range_min[-1][1] >= close:
+            self.range_min.pop()
+        self.range_min.append((i, close))
+        for dq in (self.range_max, self.range_min):
+            if dq[0][0] <= i - RANGE_WINDOW:
+                dq.popleft()
+        full = i >= RANGE_WINDOW - 1
+        row["high_52w"] = self.range_max[0][1] if full else math.nan
+        row["low_52w"] = self.range_min[0][1] if full else math.nan
+
+        self.all_time_high = max(self.all_time_high, close)
+        self.all_time_low = min(self.all_time_low, close)
+        row["all_time_high"] = self.all_time_high
+        row["all_time_low"] = self.all_time_low
+        row["distance_to_high_pct"] = float(np.round((row["high_52w"] - close) / close * 100, 2))
+        row["distance_to_low_pct"] = float(np.round((close - row["low_52w"]) / close * 100, 2))
+
+        # ----- trend strength -----
+        # NaN comparisons are False, matching the pandas boolean columns
+        row["trend_ema_alignment"] = (
+            int(close > row["ema20"]) + int(row["ema20"] > row["ema50"]) + int(row["ema50"] > row["ema200"])
+        )
+        row["long_term_trend"] = int(close > row["ema_252"]) + int(row["ema_252"] > row["ema_630"])
+
+        # ----- seasonality -----
+        row["month"] = date.month
+        row["daily_return_pct"] = (close / prev_close - 1) * 100
+
+        self.prev_close = close
+        self.rows += 1
+        self.last_date = date.strftime("%Y-%m-%d")
+        if self.first_date is None:
+            self.first_date = self.last_date
+        self.last_row = row
+        return row
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """Build the state by replaying every bar of an OHLCV frame."""
+        state = cls()
+        state.extend(df)
+        return state
+
+    def extend(self, df: pd.DataFrame) -> Optional[Dict]:
+        """Feed every bar of df in order; returns the last row (None if df is empty)."""
+        volume = df["Volume"].to_numpy(dtype=np.float64) if "Volume" in df.columns else np.full(len(df), np.nan)
+        row = None
+        for date, o, h, l, c, v in zip(df.index, df["Open"].to_numpy(dtype=np.float64),
+                                       df["High"].to_numpy(dtype=np.float64), df["Low"].to_numpy(dtype=np.float64),
+                                       df["Close"].to_numpy(dtype=np.float64), volume):
+            row = self.update(date, o, h, l, c, v)
+        return row
+
+    # ===== SERIALIZATION =====
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable snapshot of the state."""
+        def ewm(e):
+            return [e.value, e.count]
+
+        return {
+            "version": STATE_VERSION,
+            "rows": self.rows,
+            "first_date": self.first_date,
+            "last_date": self.last_date,
+            "prev_close": self.prev_close,
+            "emas": {str(w): ewm(e) for w, e in self.emas.items()},
+            "macd": [ewm(self.macd_fast), ewm(self.macd_slow), ewm(self.macd_sign)],
+            "rsi": [ewm(self.rsi_up), ewm(self.rsi_down)],
+            "atr": [self.atr, self.tr_seed],
+            "closes": list(self.closes),
+            "volumes": list(self.volumes),
+            "range_max": [list(p) for p in self.range_max],
+            "range_min": [list(p) for p in self.range_min],
+            "all_time": [self.all_time_high, self.all_time_low],
+            "last_row": self.last_row,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "IndicatorState":
+        """Restore a state produced by to_dict."""
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {data.get('version')}")
+
+        def restore(e, values):
+            e.value, e.count = values[0], int(values[1])
+
+        state = cls()
+        state.rows = int(data["rows"])
+        state.first_date = data["first_date"]
+        state.last_date = data["last_date"]
+        state.prev_close = data["prev_close"]
+        for w, values in data["emas"].items():
+            restore(state.emas[int(w)], values)
+        for e, values in zip((state.macd_fast, state.macd_slow, state.macd_sign), data["macd"]):
+            restore(e, values)
+        for e, values in zip((state.rsi_up, state.rsi_down), data["rsi"]):
+            restore(e, values)
+        state.atr, state.tr_seed = data["atr"]
+        state.closes.extend(data["closes"])
+        state.volumes.extend(data["volumes"])
+        state.range_max.extend((int(i), v) for i, v in data["range_max"])
+        state.range_min.extend((int(i), v) for i, v in data["range_min"])
+        state.all_time_high, state.all_time_low = data["all_time"]
+        state.last_row = data.get("last_row")
+        return state
+
+
+# ===== PERSISTENCE (NEXT TO THE PRICE STORE) =====
+
+def state_path(store, symbol: str) -> Path:
+    return Path(store.root) / f"{symbol}.indicators.json"
+
+
+def load_state(store, symbol: str) -> Optional[IndicatorState]:
+    """Load the persisted state for a symbol, or None if missing/unreadable."""
+    try:
+        with open(state_path(store, symbol), "r", encoding="utf-8") as f:
+            return IndicatorState.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_state(store, symbol: str, state: IndicatorState):
+    """Persist a state atomically (json allows NaN/Infinity, which the state uses)."""
+    path = state_path(store, symbol)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state.to_dict(), f)
+    os.replace(tmp, path)
+
+
+def update_indicators(store, symbol: str) -> Optional[Dict]:
+    """
+    Bring a symbol's persisted indicator state up to its stored bars.
+
+    Only bars after the state's last date are replayed. The state is rebuilt
+    from scratch when the stored history no longer starts where it did, or
+    when the last processed bar changed (re-seeded / re-adjusted prices).
+
+    Args:
+        store: PriceStore holding the symbol's bars (read locally, no sync)
+        symbol: Store symbol (e.g. "BBCA.JK")
+
+    Returns:
+        Latest indicator row as a dict, or None when the store has no bars
+    """
+    df = store.read(symbol)
+    if df is None or df.empty:
+        return None
+
+    state = load_state(store, symbol)
+    if state is not None and not _state_matches(state, df):
+        state = None
+
+    if state is None:
+        state = IndicatorState()
+        new = df
+    else:
+        new = df.iloc[df.index.searchsorted(pd.Timestamp(state.last_date), side="right"):]
+        if new.empty:
+            return state.last_row
+
+    row = state.extend(new)
+    save_state(store, symbol, state)
+    return row
+
+
+def _state_matches(state: IndicatorState, df: pd.DataFrame) -> bool:
+    if state.first_date != df.index[0].strftime("%Y-%m-%d"):
+        return False
+    last = pd.Timestamp(state.last_date)
+    pos = df.index.searchsorted(last)
+    if pos >= len(df) or df.index[pos] != last or pos + 1 != state.rows:
+        return False
+    return bool(np.isclose(df["Close"].iloc[pos], state.prev_close, rtol=1e-9, atol=0))
+
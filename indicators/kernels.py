@@ -0,0 +1,309 @@
+"""
+Pure-NumPy indicator kernels.
+
+Every kernel takes contiguous float64 arrays shaped (T,) or (T, N) and works
+along axis 0, so the same code scores one ticker's history or a whole
+dates x tickers panel. Results follow the `ta` library conventions that
+add_indicators was originally built on (adjust=False EWMs with min_periods,
+Wilder RSI/ATR, population-std Bollinger Bands).
+
+Leading NaNs are allowed per column (e.g. a ticker listed later in a panel):
+each column's recurrences start at its first valid value.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+EMA_SPANS = {"ema20": 20, "ema50": 50, "ema100": 100, "ema200": 200, "ema_252": 252, "ema_630": 630}
+
+# Largest growth factor (1-alpha)^-k allowed inside one EWM block. Rounding
+# error does not depend on it (each row is rescaled by (1-alpha)^k); the cap
+# only keeps the scaled terms far from float64 overflow.
+_EWM_BLOCK_GROWTH = 1e30
+
+
+# ===== SHAPE HELPERS =====
+
+def _as_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    return (x.reshape(len(x), 1) if x.ndim == 1 else x), x.ndim == 1
+
+
+def _restore(out, squeeze):
+    return out[:, 0] if squeeze else out
+
+
+def _first_valid(x):
+    """Row of the first non-NaN value per column (len(x) for all-NaN columns)."""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x))
+
+
+def _shift(x, fill=np.nan):
+    out = np.empty_like(x)
+    out[:1] = fill
+    out[1:] = x[:-1]
+    return out
+
+
+# ===== EXPONENTIAL AVERAGES =====
+
+def _ewm_scan(x, alpha, init):
+    """
+    y[t] = (1-alpha) * y[t-1] + alpha * x[t] for a (T, N) array, with y[-1] = init.
+
+    Closed form evaluated in blocks: within a block starting at s,
+    y[s+j] = d^j * (d * y[s-1] + alpha * cumsum(d^-k * x[s+k])), d = 1-alpha.
+    Blocks are short enough that d^-k stays below _EWM_BLOCK_GROWTH, so a
+    10-year series needs only a handful of vectorized steps.
+    """
+    T = len(x)
+    out = np.empty_like(x)
+    if T == 0:
+        return out
+    d = 1.0 - alpha
+    block = max(1, min(T, int(np.log(_EWM_BLOCK_GROWTH) / -np.log(d))))
+    k = np.arange(block, dtype=np.float64)[:, None]
+    grow, decay = d ** -k, d ** k
+
+    prev = np.asarray(init, dtype=np.float64)
+    for s in range(0, T, block):
+        n = min(block, T - s)
+        acc = np.cumsum(x[s:s + n] * grow[:n], axis=0)
+        acc *= alpha
+        acc += d * prev
+        acc *= decay[:n]
+        out[s:s + n] = acc
+        prev = acc[-1]
+    return out
+
+
+def ewm(x, alpha, min_periods=0):
+    """
+    ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean() along axis 0.
+
+    Columns with NaNs after their first valid value fall back to pandas, which
+    re-weights around gaps; clean columns use the blocked closed form.
+    """
+    x, squeeze = _as_2d(x)
+    T, N = x.shape
+    start = _first_valid(x)
+    cols = np.arange(N)
+    first = np.where(start < T, x[np.minimum(start, T - 1), cols], np.nan)
+
+    # Leading NaNs take the first value so y[start] == x[start] exactly as a fresh start would
+    rows = np.arange(T)[:, None]
+    filled = np.where(rows < start, first, x)
+    out = _ewm_scan(filled, alpha, first)
+    out[rows < start + max(min_periods, 1) - 1] = np.nan
+
+    gaps = np.isnan(filled).any(axis=0) & (start < T)
+    for c in np.flatnonzero(gaps):
+        out[:, c] = pd.Series(x[:, c]).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy()
+    return _restore(out, squeeze)
+
+
+def ema(x, span):
+    """ta.trend.ema_indicator: span-based EWM, NaN until `span` observations."""
+    return ewm(x, 2.0 / (span + 1), min_periods=span)
+
+
+def rsi(close, window=14):
+    """ta.momentum.rsi (Wilder smoothing, 100 when there are no down moves)."""
+    close, squeeze = _as_2d(close)
+    diff = close - _shift(close)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    lead = np.arange(len(close))[:, None] < _first_valid(close)
+    up[lead] = np.nan
+    down[lead] = np.nan
+
+    ema_up = ewm(up, 1.0 / window, min_periods=window)
+    ema_down = ewm(down, 1.0 / window, min_periods=window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+    return _restore(out, squeeze)
+
+
+def macd(close, fast=12, slow=26, sign=9):
+    """ta.trend.MACD lines: (macd, signal, diff)."""
+    line = ema(close, fast) - ema(close, slow)
+    signal = ema(line, sign)
+    return line, signal, line - signal
+
+
+# ===== TRUE RANGE / ATR =====
+
+def true_range(high, low, close):
+    """max(high-low, |high-prev_close|, |low-prev_close|), ignoring the missing previous close."""
+    prev_close = _shift(np.asarray(close, dtype=np.float64))
+    high, low = np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, window=14):
+    """
+    ta.volatility.average_true_range.
+
+    Seeded with the mean of the first `window` true ranges, Wilder-smoothed
+    after that, and 0 before the seed (as ta reports it).
+    """
+    tr, squeeze = _as_2d(true_range(high, low, close))
+    T, N = tr.shape
+    start = _first_valid(_as_2d(close)[0])
+    seed_row = start + window - 1
+    rows = np.arange(T)[:, None]
+
+    seed = np.full(N, np.nan)
+    for c in np.flatnonzero(seed_row < T):
+        seed[c] = np.nanmean(tr[start[c]:seed_row[c] + 1, c])
+
+    # Rows up to the seed carry the seed itself, so the scan reproduces the Wilder recursion after it
+    z = np.where(rows <= seed_row, seed, tr)
+    out = _ewm_scan(z, 1.0 / window, seed)
+    out[rows < seed_row] = 0.0
+    out[rows < start] = np.nan
+    return _restore(out, squeeze)
+
+
+# ===== ROLLING WINDOWS =====
+
+def _rolling_sum(x, window):
+    """Sum of each trailing window for rows window-1.. (one shifted-slice add per lag; short windows)."""
+    n = len(x) - window + 1
+    acc = x[:n].copy()
+    for k in range(1, window):
+        acc += x[k:k + n]
+    return acc
+
+
+def rolling_mean(x, window):
+    """rolling(window).mean() along axis 0 (NaN until the window is full or if it holds a NaN)."""
+    x, squeeze = _as_2d(x)
+    out = np.full_like(x, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = _rolling_sum(x, window) / window
+    return _restore(out, squeeze)
+
+
+def rolling_mean_sq(x, window):
+    """Rolling mean and sum of squared deviations (two-pass, shared by std with any ddof)."""
+    x, squeeze = _as_2d(x)
+    mean = np.full_like(x, np.nan)
+    sq = np.full_like(x, np.nan)
+    if len(x) >= window:
+        n = len(x) - window + 1
+        m = _rolling_sum(x, window) / window
+        acc = np.zeros_like(m)
+        for k in range(window):
+            dev = x[k:k + n] - m
+            acc += dev * dev
+        mean[window - 1:] = m
+        sq[window - 1:] = acc
+    return _restore(mean, squeeze), _restore(sq, squeeze)
+
+
+def _rolling_extreme(x, window, ufunc):
+    """
+    Rolling max/min in O(1) per element (van Herk / Gil-Werman).
+
+    Rows are cut into blocks of `window`; every window spans the suffix of one
+    block and the prefix of the next, so it is ufunc(suffix_acc, prefix_acc).
+    NaNs propagate through both accumulations, so a window holding a NaN is NaN.
+    """
+    x, squeeze = _as_2d(x)
+    T, N = x.shape
+    out = np.full_like(x, np.nan)
+    if T >= window:
+        blocks = -(-T // window)
+        padded = np.full((blocks * window, N), np.nan)
+        padded[:T] = x
+        padded = padded.reshape(blocks, window, N)
+        prefix = ufunc.accumulate(padded, axis=1).reshape(-1, N)
+        suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1, N)
+        out[window - 1:] = ufunc(suffix[:T - window + 1], prefix[window - 1:T])
+    return _restore(out, squeeze)
+
+
+def rolling_max(x, window):
+    """rolling(window).max() along axis 0."""
+    return _rolling_extreme(x, window, np.maximum)
+
+
+def rolling_min(x, window):
+    """rolling(window).min() along axis 0."""
+    return _rolling_extreme(x, window, np.minimum)
+
+
+# ===== ALL INDICATORS =====
+
+def indicator_columns(high, low, close, volume=None) -> Dict[str, np.ndarray]:
+    """
+    Every add_indicators column except `month`, in add_indicators order.
+
+    EMAs, MACD legs, the 20-bar mean/deviation and the 252-bar windows are each
+    computed once and reused by the indicators that depend on them.
+
+    Args:
+        high, low, close: (T,) or (T, N) float arrays
+        volume: Same shape as close, or None to skip the volume columns
+
+    Returns:
+        dict of column name -> array shaped like close
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    cols: Dict[str, np.ndarray] = {}
+
+    # ----- trend -----
+    for name, span in EMA_SPANS.items():
+        cols[name] = ema(close, span)
+
+    # ----- momentum -----
+    with np.errstate(invalid="ignore"):
+        cols["rsi"] = rsi(close, 14)
+        cols["rsi_oversold"] = cols["rsi"] < 30
+        cols["rsi_overbought"] = cols["rsi"] > 70
+        cols["macd"], cols["macd_signal"], cols["macd_diff"] = macd(close, 12, 26, 9)
+        cols["macd_bullish"] = cols["macd"] > cols["macd_signal"]
+
+    # ----- volatility -----
+    mean20, sq20 = rolling_mean_sq(close, 20)
+    std_pop = np.sqrt(sq20 / 20)
+    cols["bb_upper"] = mean20 + 2 * std_pop
+    cols["bb_middle"] = mean20
+    cols["bb_lower"] = mean20 - 2 * std_pop
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cols["bb_percent"] = (close - cols["bb_lower"]) / (cols["bb_upper"] - cols["bb_lower"])
+    cols["atr"] = atr(high, low, close, 14)
+    cols["volatility"] = np.sqrt(sq20 / 19)
+
+    # ----- volume -----
+    if volume is not None:
+        volume = np.asarray(volume, dtype=np.float64)
+        cols["volume_sma"] = rolling_mean(volume, 20)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cols["volume_ratio"] = volume / cols["volume_sma"]
+
+    # ----- support & resistance -----
+    cols["high_52w"] = rolling_max(close, 252)
+    cols["low_52w"] = rolling_min(close, 252)
+    cols["all_time_high"] = np.fmax.accumulate(close, axis=0)
+    cols["all_time_low"] = np.fmin.accumulate(close, axis=0)
+    cols["distance_to_high_pct"] = np.round((cols["high_52w"] - close) / close * 100, 2)
+    cols["distance_to_low_pct"] = np.round((close - cols["low_52w"]) / close * 100, 2)
+
+    # ----- trend strength (NaN comparisons are False, as in pandas) -----
+    with np.errstate(invalid="ignore"):
+        cols["trend_ema_alignment"] = (
+            (close > cols["ema20"]).astype(np.int64)
+            + (cols["ema20"] > cols["ema50"])
+            + (cols["ema50"] > cols["ema200"])
+        )
+        cols["long_term_trend"] = (close > cols["ema_252"]).astype(np.int64) + (cols["ema_252"] > cols["ema_630"])
+
+    # ----- returns -----
+    cols["daily_return_pct"] = (close / _shift(close) - 1) * 100
+    return cols
+
@@ -1,7 +1,11 @@
-import ta
 import pandas as pd
 import numpy as np
 
+try:
+    from indicators.kernels import indicator_columns
+except ImportError:  # imported as part of the package
+    from .kernels import indicator_columns
+
 
 def add_indicators(df):
     """
@@ -23,70 +27,17 @@ def add_indicators(df):
     if hasattr(close, "ndim") and close.ndim > 1:
         close = close.iloc[:, 0]
     
-    # ===== TREND INDICATORS (MULTI-TIMEFRAME) =====
-    df["ema20"] = ta.trend.ema_indicator(close, window=20)
-    df["ema50"] = ta.trend.ema_indicator(close, window=50)
-    df["ema100"] = ta.trend.ema_indicator(close, window=100)
-    df["ema200"] = ta.trend.ema_indicator(close, window=200)
-    
-    # Long-term EMAs for 5-year pattern recognition
-    df["ema_252"] = ta.trend.ema_indicator(close, window=252)   # 1 year of trading days
-    df["ema_630"] = ta.trend.ema_indicator(close, window=630)   # ~2.5 years
-    
-    # ===== MOMENTUM INDICATORS =====
-    df["rsi"] = ta.momentum.rsi(close, window=14)
-    df["rsi_oversold"] = df["rsi"] < 30
-    df["rsi_overbought"] = df["rsi"] > 70
-    
-    # MACD for trend confirmation
-    macd_obj = ta.trend.MACD(close, window_fast=12, window_slow=26, window_sign=9)
-    df["macd"] = macd_obj.macd()
-    df["macd_signal"] = macd_obj.macd_signal()
-    df["macd_diff"] = macd_obj.macd_diff()
-    df["macd_bullish"] = df["macd"] > df["macd_signal"]
-    
-    # ===== VOLATILITY INDICATORS =====
-    bb = ta.volatility.BollingerBands(close, window=20, window_dev=2)
-    df["bb_upper"] = bb.bollinger_hband()
-    df["bb_middle"] = bb.bollinger_mavg()
-    df["bb_lower"] = bb.bollinger_lband()
-    df["bb_percent"] = (close - df["bb_lower"]) / (df["bb_upper"] - df["bb_lower"])
-    
-    # ATR for volatility-adjusted risk sizing
-    df["atr"] = ta.volatility.average_true_range(
-        df["High"], df["Low"], close, window=14
+    # Trend, momentum, volatility, volume and support/resistance columns in
+    # one pass over float64 arrays (see indicators/kernels.py)
+    columns = indicator_columns(
+        _flat(df["High"]),
+        _flat(df["Low"]),
+        close.to_numpy(dtype=np.float64),
+        _flat(df["Volume"]) if "Volume" in df.columns else None,
     )
-    df["volatility"] = close.rolling(window=20).std()
-    
-    # ===== VOLUME ANALYSIS =====
-    if "Volume" in df.columns:
-        df["volume_sma"] = df["Volume"].rolling(window=20).mean()
-        df["volume_ratio"] = df["Volume"] / df["volume_sma"]
-    
-    # ===== SUPPORT & RESISTANCE (5-YEAR ZONES) =====
-    # 52-week high/low
-    df["high_52w"] = close.rolling(window=252).max()
-    df["low_52w"] = close.rolling(window=252).min()
-    
-    # All-time high/low in dataset (5 years)
-    df["all_time_high"] = close.expanding().max()
-    df["all_time_low"] = close.expanding().min()
-    
-    # Distance to support/resistance (%)
-    df["distance_to_high_pct"] = ((df["high_52w"] - close) / close * 100).round(2)
-    df["distance_to_low_pct"] = ((close - df["low_52w"]) / close * 100).round(2)
-    
-    # ===== TREND STRENGTH =====
-    df["trend_ema_alignment"] = (
-        (close > df["ema20"]).astype(int) +
-        (df["ema20"] > df["ema50"]).astype(int) +
-        (df["ema50"] > df["ema200"]).astype(int)
-    )  # 0-3 score
-    
-    df["long_term_trend"] = (
-        (close > df["ema_252"]).astype(int) +
-        (df["ema_252"] > df["ema_630"]).astype(int)
-    )  # 0-2 score for 1Y+ trend
+    daily_return_pct = columns.pop("daily_return_pct")
+    for name, values in columns.items():
+        df[name] = values
     
     # ===== SEASONALITY (MONTHLY PATTERN) =====
     if not isinstance(df.index, pd.DatetimeIndex):
@@ -96,7 +47,111 @@ def add_indicators(df):
             pass
     
     df["month"] = df.index.month if isinstance(df.index, pd.DatetimeIndex) else 1
-    df["daily_return_pct"] = close.pct_change() * 100
+    df["daily_return_pct"] = daily_return_pct
     
     return df
 
+
+def _flat(col):
+    """Column as a float64 array (first column if yfinance returned a MultiIndex frame)."""
+    if getattr(col, "ndim", 1) > 1:
+        col = col.iloc[:, 0]
+    return col.to_numpy(dtype=np.float64)
+
+
+# ===== PANEL MODE (DATES x TICKERS) =====
+
+PANEL_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def build_panel(frames):
+    """
+    Align per-ticker OHLCV frames into a panel.
+
+    Args:
+        frames: dict of ticker -> OHLCV DataFrame (as returned by fetch_eod / fetch_eod_batch)
+
+    Returns:
+        dict of field ("Open", ..., "Volume") -> DataFrame (dates x tickers) on the
+        union of all dates; a ticker's missing days are NaN
+    """
+    frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+    if not frames:
+        return {}
+    index = None
+    for df in frames.values():
+        index = df.index if index is None else (index if df.index.equals(index) else index.union(df.index))
+
+    # Row positions of each ticker's dates in the shared index, computed once for all fields
+    positions = {t: None if df.index.equals(index) else index.get_indexer(df.index) for t, df in frames.items()}
+    tickers = list(frames)
+    panel = {}
+    for field in PANEL_FIELDS:
+        if not all(field in df.columns for df in frames.values()):
+            continue
+        values = np.full((len(index), len(tickers)), np.nan)
+        for j, t in enumerate(tickers):
+            col = _flat(frames[t][field])
+            if positions[t] is None:
+                values[:, j] = col
+            else:
+                values[positions[t], j] = col
+        panel[field] = pd.DataFrame(values, index=index, columns=tickers, copy=False)
+    return panel
+
+
+def add_indicators_panel(panel):
+    """
+    Panel version of add_indicators: every indicator for every ticker in one vectorized call.
+
+    Each ticker's indicators are exactly what add_indicators computes on that
+    ticker's own frame. Tickers that start later are handled column-wise;
+    tickers with missing days inside their history (suspensions, stale data)
+    are computed on their own bars and scattered back.
+
+    Args:
+        panel: dict with "High", "Low", "Close" (and optionally "Volume", "Open")
+               DataFrames of shape dates x tickers, e.g. from build_panel
+
+    Returns:
+        dict of column name -> DataFrame (dates x tickers) with the input fields
+        plus every add_indicators column
+    """
+    close_df = panel["Close"]
+    index, tickers = close_df.index, close_df.columns
+    close = close_df.to_numpy(dtype=np.float64)
+    high = panel["High"].to_numpy(dtype=np.float64)
+    low = panel["Low"].to_numpy(dtype=np.float64)
+    volume = panel["Volume"].to_numpy(dtype=np.float64) if "Volume" in panel else None
+
+    # Columns with NaNs after their first bar cannot share the aligned recurrences
+    valid = ~np.isnan(close)
+    started = np.maximum.accumulate(valid, axis=0)
+    gapped = (started & ~valid).any(axis=0)
+    dense = np.flatnonzero(~gapped)
+
+    columns = indicator_columns(
+        high[:, dense], low[:, dense], close[:, dense], volume[:, dense] if volume is not None else None
+    )
+    if gapped.any():
+        full = {}
+        for name, values in columns.items():
+            fill = np.nan if values.dtype.kind == "f" else 0
+            out = np.full(close.shape, fill, dtype=values.dtype)
+            out[:, dense] = values
+            full[name] = out
+        for j in np.flatnonzero(gapped):
+            rows = valid[:, j]
+            single = indicator_columns(high[rows, j], low[rows, j], close[rows, j],
+                                       volume[rows, j] if volume is not None else None)
+            for name, values in single.items():
+                full[name][rows, j] = values
+        columns = full
+
+    out = {field: df for field, df in panel.items()}
+    for name, values in columns.items():
+        out[name] = pd.DataFrame(values, index=index, columns=tickers, copy=False)
+    month = index.month if isinstance(index, pd.DatetimeIndex) else np.ones(len(index), dtype=int)
+    out["month"] = pd.DataFrame(np.repeat(np.asarray(month)[:, None], len(tickers), axis=1),
+                                index=index, columns=tickers, copy=False)
+    return out
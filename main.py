@@ -7,60 +7,67 @@ Usage:
     uvicorn app:app --reload --host 0.0.0.0 --port 8000
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 import sys
-import os
 from pathlib import Path
-import json
 import pandas as pd
 
-# Add parent directory to path
-current_dir = Path(__file__).parent
-parent_dir = current_dir.parent
-sys.path.insert(0, str(current_dir))
-sys.path.insert(0, str(parent_dir))
-
-# Change to current directory for relative imports
-os.chdir(str(current_dir))
+# Make the package root importable (e.g. `uvicorn main:app` from another directory)
+current_dir = str(Path(__file__).parent)
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
 
 # Import with error reporting
 try:
-    from data.fetcher import fetch_eod
-    from indicators.technical import add_indicators
-    from engine.decision import decision_engine
-    from config import SIGNAL_CONFIG, BACKTEST_THRESHOLDS, SUPPORTED_STOCKS
-    from backtest.simple_backtest import backtest
+    from data.fetcher import fetch_eod, fetch_eod_batch
+    from data.market_context import MarketDataContext
+    from indicators.technical import add_indicators, add_indicators_panel, build_panel
+    from engine.decision import decision_engine, decision_engine_series, decision_engine_panel
+    from config import SIGNAL_CONFIG, BACKTEST_THRESHOLDS, SUPPORTED_STOCKS, SCREENER_CONFIG
+    from engine.screener import get_signal_table
+    from engine.eod_pipeline import get_eod_pipeline, start_eod_scheduler
+    from engine.signal_service import cached_signal, get_signal_cache, latest_signal
+    from engine.singleflight import flight_stats
+    from engine.webhooks import get_dispatcher
+    from engine.broadcast import get_hub
+    from api.streaming import setup_stream_routes
+    from api.responses import FastJSONResponse, dumps, fast_route
+    from backtest.vector_backtest import vector_backtest
     from backtest.report import summarize
-    from data.fundamentals import fetch_fundamentals
+    from data.fundamentals import fetch_fundamentals_many
     from engine.ai_summary import summarize_analysis
     from data.fetchers.yahoo_fundamentals import fetch_fundamentals_yahoo, auto_fetch_and_cache_portfolio
+    from data.fetchers.fundamentals_refresher import refresh_fundamentals
     from engine.ai_agent import generate_layout, synthesize_recommendation
-    print("✅ All imports successful from relative paths")
 except ImportError as e:
     print(f"❌ Import error: {e}")
-    print(f"Current dir: {os.getcwd()}")
     print(f"sys.path: {sys.path[:3]}")
     raise
 
 
 # ===== Helpers: saving results =====
 RESULTS_DIR = Path(__file__).parent / "results"
-RESULTS_DIR.mkdir(exist_ok=True)
+
+
+def _results_path(filename: str) -> Path:
+    """Path under results/, created on the first save (not at import)."""
+    RESULTS_DIR.mkdir(exist_ok=True)
+    return RESULTS_DIR / filename
+
 
 def _save_json(obj, filename: str):
-    path = RESULTS_DIR / filename
+    path = _results_path(filename)
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+        f.write(dumps(obj, indent=True))
     return str(path)
 
 
 def _save_trades_csv(trades, filename: str):
-    path = RESULTS_DIR / filename
+    path = _results_path(filename)
     try:
         df = pd.DataFrame(trades)
         df.to_csv(path, index=False)
@@ -71,25 +78,6 @@ def _save_trades_csv(trades, filename: str):
         return str(path) + ".json"
 
 
-def _convert_numpy_types(obj):
-    """Recursively convert numpy types to native Python types for JSON serialization."""
-    import numpy as np
-    
-    if isinstance(obj, dict):
-        return {k: _convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [_convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, (np.integer, np.int32, np.int64)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float32, np.float64)):
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    else:
-        return obj
-
 # ===== API MODELS =====
 
 class SignalResponse(BaseModel):
@@ -147,16 +135,12 @@ class BacktestResponse(BaseModel):
     report: dict
 
 
-# ===== FASTAPI APP =====
+# ===== ROUTES =====
 
-app = FastAPI(
-    title="Stock AI Engine API",
-    description="Institutional trading signals & backtesting",
-    version="1.0.0"
-)
+router = APIRouter()
 
 
-@app.get("/")
+@router.get("/")
 def root():
     """API health check"""
     return {
@@ -166,7 +150,7 @@ def root():
     }
 
 
-@app.get("/signal/{ticker}")
+@router.get("/signal/{ticker}")
 def get_signal(ticker: str) -> SignalResponse:
     """
     Get current buy/sell/hold signal for a ticker
@@ -181,12 +165,11 @@ def get_signal(ticker: str) -> SignalResponse:
         GET /signal/BBCA
     """
     try:
-        df = fetch_eod(ticker)
-        if df is None or df.empty:
+        computed = latest_signal(ticker)
+        if computed is None:
             raise HTTPException(status_code=404, detail=f"No data for {ticker}")
         
-        df = add_indicators(df)
-        decision = decision_engine(df)
+        decision = computed["decision"]
         
         return SignalResponse(
             ticker=ticker,
@@ -202,7 +185,7 @@ def get_signal(ticker: str) -> SignalResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/backtest")
+@fast_route(router.post("/backtest"))
 def run_backtest(request: BacktestRequest):
     """
     Run backtest for one or more symbols
@@ -221,52 +204,26 @@ def run_backtest(request: BacktestRequest):
         }
     """
     results = []
+    frames, fetch_errors = fetch_eod_batch(request.symbols)
 
     for symbol in request.symbols:
         try:
-            df = fetch_eod(symbol)
+            df = frames.get(symbol)
             if df is None or df.empty:
-                results.append({"symbol": symbol, "error": "no data"})
+                results.append({"symbol": symbol, "error": fetch_errors.get(symbol, "no data")})
                 continue
 
             df = add_indicators(df)
 
-            # Prepare backtest data
-            records = []
-            for i in range(len(df)):
-                if i < 50:  # Warmup period
-                    records.append({
-                        "signal": None, "score": None, "confidence": None,
-                        "reasons": None, "meta": None
-                    })
-                else:
-                    temp_df = df.iloc[:i+1]
-                    decision = decision_engine(temp_df)
-                    records.append(decision)
-
-            # Safe extract signals (some decisions may be missing keys)
-            df["signal"] = [r.get("signal") if isinstance(r, dict) else None for r in records]
-
-            # Run backtest (may raise) and summarize
-            trades = backtest(df)
-            report = summarize(trades)
-
-            # Ensure report contains only JSON-serializable native types
-            try:
-                report_clean = jsonable_encoder(report)
-            except Exception:
-                # Fallback: convert numpy scalars to native Python types
-                import numpy as _np
-                report_clean = {}
-                for k, v in (report or {}).items():
-                    if isinstance(v, (_np.integer,)):
-                        report_clean[k] = int(v)
-                    elif isinstance(v, (_np.floating,)):
-                        report_clean[k] = float(v)
-                    elif isinstance(v, (_np.bool_,)):
-                        report_clean[k] = bool(v)
-                    else:
-                        report_clean[k] = v
+            # Score every bar in one vectorized pass (first 50 bars are warmup)
+            signals = decision_engine_series(df, reasons=False)["signal"].tolist()
+            warmup = min(50, len(signals))
+            df["signal"] = [None] * warmup + signals[warmup:]
+
+            # Run backtest (may raise) and summarize straight from the trade ledger
+            ledger, curve = vector_backtest(df, as_ledger=True, equity=True)
+            report = summarize(ledger)
+            report["equity"] = curve.metrics()  # bar-level, annualized, net of transaction costs
 
             # Save results if requested
             saved_paths = {}
@@ -274,20 +231,20 @@ def run_backtest(request: BacktestRequest):
                 ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                 # save trades
                 try:
-                    trades_path = _save_trades_csv(trades, f"trades_{symbol}_{ts}.csv")
+                    trades_path = _save_trades_csv(ledger.to_trades(), f"trades_{symbol}_{ts}.csv")
                     saved_paths['trades'] = trades_path
                 except Exception:
                     pass
                 # save report
                 try:
-                    report_path = _save_json(report_clean, f"report_{symbol}_{ts}.json")
+                    report_path = _save_json(report, f"report_{symbol}_{ts}.json")
                     saved_paths['report'] = report_path
                 except Exception:
                     pass
 
             results.append({
                 "symbol": symbol,
-                "report": report_clean,
+                "report": report,
                 "saved": saved_paths
             })
 
@@ -299,7 +256,7 @@ def run_backtest(request: BacktestRequest):
     return {"ok": True, "results": results, "timestamp": datetime.now().isoformat()}
 
 
-@app.get("/portfolio")
+@fast_route(router.get("/portfolio"))
 def get_portfolio_signals(symbols: str) -> dict:
     """
     Get signals for entire portfolio at once
@@ -312,20 +269,36 @@ def get_portfolio_signals(symbols: str) -> dict:
     """
     ticker_list = [s.strip() for s in symbols.split(",")]
     signals = {}
+
+    # Tickers already scored for their latest bar come straight from the signal cache
+    cached = {}
+    for ticker in ticker_list:
+        hit = cached_signal(ticker)
+        if hit is not None:
+            cached[ticker] = hit["decision"]
+    missing = [t for t in ticker_list if t not in cached]
+    frames, fetch_errors = fetch_eod_batch(missing) if missing else ({}, {})
+    
+    # Score the whole portfolio in one panel pass instead of one frame per ticker
+    try:
+        decisions = decision_engine_panel(add_indicators_panel(build_panel(frames))) if frames else None
+    except Exception as e:
+        decisions = None
+        fetch_errors = {**{t: str(e) for t in frames}, **fetch_errors}
     
     for ticker in ticker_list:
-        try:
-            df = fetch_eod(ticker)
-            if df is not None and not df.empty:
-                df = add_indicators(df)
-                decision = decision_engine(df)
-                signals[ticker] = {
-                    "signal": decision["signal"],
-                    "score": decision["score"],
-                    "confidence": decision["confidence"]
-                }
-        except Exception as e:
-            signals[ticker] = {"error": str(e)}
+        if ticker in fetch_errors:
+            signals[ticker] = {"error": fetch_errors[ticker]}
+            continue
+        decision = cached.get(ticker)
+        if decision is None and decisions is not None and ticker in decisions.index:
+            decision = decisions.loc[ticker]
+        if decision is not None:
+            signals[ticker] = {
+                "signal": decision["signal"],
+                "score": decision["score"],
+                "confidence": decision["confidence"]
+            }
     
     return {
         "portfolio": ticker_list,
@@ -334,33 +307,29 @@ def get_portfolio_signals(symbols: str) -> dict:
     }
 
 
-@app.post("/analysis")
+@fast_route(router.post("/analysis"))
 def run_analysis(request: AnalysisRequest):
     """Run combined analysis (technical + fundamental) with 5-year patterns and AI insights."""
     results = []
+    # One fundamentals-store query for the whole request
+    funds = fetch_fundamentals_many(request.symbols) if request.mode in ("fundamental", "both") else {}
     for symbol in request.symbols:
         tech = None
         fund = None
         tech_data_5y = None
         try:
-            # Technical analysis (1-year by default)
-            df = fetch_eod(symbol)
-            if df is not None and not df.empty and request.mode in ("technical", "both"):
-                df = add_indicators(df)
-                tech = decision_engine(df)
-            
-            # 5-year technical data for pattern recognition
+            # One fetch + one indicator pass serves both the lookback and 5-year windows
+            market = MarketDataContext(symbol)
             if request.mode in ("technical", "both"):
-                try:
-                    df_5y = fetch_eod(symbol, use_5y=True)
-                    if df_5y is not None and not df_5y.empty:
-                        tech_data_5y = add_indicators(df_5y)
-                except:
-                    pass  # Fallback to 1-year if 5-year fails
+                df = market.frame()
+                if df is not None and not df.empty:
+                    tech = decision_engine(df)
+                    # 5-year technical data for pattern recognition
+                    tech_data_5y = market.frame("5y")
             
             # Fundamentals
             if request.mode in ("fundamental", "both"):
-                fund = fetch_fundamentals(symbol)
+                fund = funds[symbol]
 
             # AI summary with 5-year pattern analysis
             summary = summarize_analysis(tech, fund, mode=request.mode or "both", tech_data=tech_data_5y)
@@ -382,10 +351,10 @@ def run_analysis(request: AnalysisRequest):
 
             results.append({
                 "symbol": symbol,
-                "technical": jsonable_encoder(tech),
-                "fundamental": jsonable_encoder(fund),
-                "summary": jsonable_encoder(summary),
-                "pattern_analysis": jsonable_encoder(summary.get("pattern_analysis", {})),
+                "technical": tech,
+                "fundamental": fund,
+                "summary": summary,
+                "pattern_analysis": summary.get("pattern_analysis", {}),
                 "saved": saved_paths
             })
 
@@ -397,7 +366,7 @@ def run_analysis(request: AnalysisRequest):
     return {"ok": True, "results": results, "timestamp": datetime.now().isoformat()}
 
 
-@app.get("/config")
+@router.get("/config")
 def get_config():
     """Get current signal configuration (for transparency)"""
     return {
@@ -407,7 +376,7 @@ def get_config():
     }
 
 
-@app.get("/fundamental/refresh")
+@router.get("/fundamental/refresh")
 def refresh_fundamental(symbol: str):
     """
     Manually fetch and cache latest fundamental data from Yahoo Finance.
@@ -437,44 +406,76 @@ def refresh_fundamental(symbol: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/fundamental/refresh-portfolio")
-def refresh_portfolio(request: FundamentalRefreshRequest):
+def _refresh_entry(data: dict) -> dict:
+    """Latest fundamentals period and source, or the error, for one refreshed symbol."""
+    if "error" in data:
+        return {"error": data["error"]}
+    return {
+        "fundamentals": data.get("fundamentals", [])[:1],  # Latest only
+        "source": data.get("source", "unknown")
+    }
+
+
+def _refresh_stream(symbols: List[str]):
+    """NDJSON lines: one per symbol as it completes, then a summary line."""
+    started = datetime.now()
+    counts = {"ok": 0, "cached": 0, "error": 0}
+    for item in refresh_fundamentals(symbols):
+        counts[item["status"]] += 1
+        line = {"symbol": item["symbol"], "status": item["status"], "attempts": item["attempts"],
+                "seconds": item["seconds"], **_refresh_entry(item["data"])}
+        yield dumps(line) + "\n"
+    yield dumps({
+        "done": True,
+        "count": sum(counts.values()),
+        **counts,
+        "seconds": round((datetime.now() - started).total_seconds(), 3),
+        "updated_at": datetime.now().isoformat()
+    }) + "\n"
+
+
+@router.post("/fundamental/refresh-portfolio")
+def refresh_portfolio(request: FundamentalRefreshRequest, stream: bool = False):
     """
     Batch fetch fundamentals for multiple symbols.
-    
+
+    Symbols are fetched concurrently (DATA_CONFIG FUNDAMENTALS_REFRESH_WORKERS),
+    rate limited and retried with backoff.
+
     Args:
         symbols: List of symbols
-    
+        stream: Return NDJSON, one line per symbol as it completes
+            ({symbol, status, attempts, seconds, fundamentals|error}) then a
+            {"done": true, ...} summary line
+
     Returns:
         Dict of symbol -> fundamental data
-    
+
     Example:
         POST /fundamental/refresh-portfolio
         {"symbols": ["BBCA", "BBRI", "BMRI"]}
+
+        POST /fundamental/refresh-portfolio?stream=true
     """
+    symbols = request.symbols
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+    if stream:
+        return StreamingResponse(_refresh_stream(symbols), media_type="application/x-ndjson")
+
     try:
-        symbols = request.symbols
-        if not symbols:
-            raise HTTPException(status_code=400, detail="No symbols provided")
-        
         results = auto_fetch_and_cache_portfolio(symbols)
         return {
             "ok": True,
             "count": len(results),
-            "results": {
-                sym: {
-                    "fundamentals": data.get("fundamentals", [])[:1],  # Latest only
-                    "source": data.get("source", "unknown")
-                } if "error" not in data else {"error": data["error"]}
-                for sym, data in results.items()
-            },
+            "results": {sym: _refresh_entry(data) for sym, data in results.items()},
             "updated_at": datetime.now().isoformat()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/agent/analyze")
+@fast_route(router.post("/agent/analyze"))
 def agent_analyze(request: AgentAnalysisRequest):
     """
     Analyze symbols with a trading-style AI agent and return customized layouts.
@@ -489,6 +490,7 @@ def agent_analyze(request: AgentAnalysisRequest):
     }
     """
     results = []
+    funds = fetch_fundamentals_many([s for s in request.symbols if s in SUPPORTED_STOCKS])
     for symbol in request.symbols:
         try:
             # Check if symbol is supported
@@ -504,8 +506,9 @@ def agent_analyze(request: AgentAnalysisRequest):
             stock_info = SUPPORTED_STOCKS[symbol]
             is_us = stock_info.get("is_us", False)
             
-            # Fetch technical (1y) and 5y for patterns
-            df = fetch_eod(symbol, is_us=is_us)
+            # Fetch once; the lookback and 5y pattern windows are tail slices of the same data
+            market = MarketDataContext(symbol, is_us=is_us)
+            df = market.prices()
             
             # Handle missing data gracefully
             if df is None or df.empty:
@@ -521,8 +524,7 @@ def agent_analyze(request: AgentAnalysisRequest):
             tech = None
             tech_data_5y = None
             try:
-                df = add_indicators(df)
-                tech = decision_engine(df)
+                tech = decision_engine(market.frame())
             except Exception as e:
                 results.append({
                     "symbol": symbol,
@@ -532,38 +534,29 @@ def agent_analyze(request: AgentAnalysisRequest):
                 })
                 continue
 
-            try:
-                df5 = fetch_eod(symbol, use_5y=True, is_us=is_us)
-                if df5 is not None and not df5.empty:
-                    tech_data_5y = add_indicators(df5)
-            except:
-                tech_data_5y = None
+            tech_data_5y = market.frame("5y")
 
-            # Fundamentals (prefer cached recent or local file)
-            fund = fetch_fundamentals(symbol)
+            # Fundamentals (prefetched for the whole request from the fundamentals store)
+            fund = funds[symbol]
 
             # Generate layout and recommendation
             layout = generate_layout(request.trading_style or "swing", request.risk_level or "moderate", symbol)
             summary = summarize_analysis(tech, fund, mode=request.mode or "both", tech_data=tech_data_5y)
             recommendation_text = synthesize_recommendation(summary.get("technical_score", 0), summary.get("fundamental_score", 0), layout, symbol)
 
-            # Convert numpy types in layout and summary
-            layout_clean = _convert_numpy_types(layout)
-            summary_clean = _convert_numpy_types(summary)
-
             # Optional save
             saved = {}
             if getattr(request, 'save', False):
                 ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                 try:
-                    saved['layout'] = _save_json(layout_clean, f"agent_layout_{symbol}_{ts}.json")
+                    saved['layout'] = _save_json(layout, f"agent_layout_{symbol}_{ts}.json")
                 except Exception:
                     pass
 
             results.append({
                 "symbol": symbol,
-                "layout": jsonable_encoder(layout_clean),
-                "summary": jsonable_encoder(summary_clean),
+                "layout": layout,
+                "summary": summary,
                 "recommendation": recommendation_text,
                 "saved": saved
             })
@@ -575,15 +568,120 @@ def agent_analyze(request: AgentAnalysisRequest):
     return {"ok": True, "results": results, "timestamp": datetime.now().isoformat()}
 
 
+# ===== SCREENER =====
+
+@fast_route(router.get("/screener"))
+def screener(
+    signal: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    sector: Optional[str] = None,
+    sort: str = "score",
+    order: str = "desc",
+    limit: Optional[int] = None,
+):
+    """
+    Screen the whole supported universe from the precomputed signal table.
+    
+    The table holds the latest decision_engine output per ticker and is rebuilt
+    by a background job after market close, so no data is fetched here.
+    
+    Args:
+        signal: Filter by signal, comma-separated (e.g. "BUY" or "BUY,HOLD")
+        min_score / max_score: Inclusive score range
+        sector: Filter by sector, comma-separated (e.g. "Banking,Mining")
+        sort: score | confidence | symbol | sector | close | change_pct | rsi | volume_ratio
+        order: asc | desc
+        limit: Maximum rows (default SCREENER_CONFIG DEFAULT_LIMIT)
+    
+    Example:
+        GET /screener?signal=BUY&sector=Banking&sort=confidence
+    """
+    try:
+        return get_signal_table().query(
+            signal=signal, min_score=min_score, max_score=max_score, sector=sector,
+            sort=sort, order=order,
+            limit=limit if limit is not None else SCREENER_CONFIG.get("DEFAULT_LIMIT", 50),
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ===== EOD SNAPSHOT =====
+
+@router.get("/eod/status")
+def eod_status():
+    """
+    Latest end-of-day pipeline run: snapshot version, as-of date and per-stage
+    durations, counts and errors.
+    """
+    return get_eod_pipeline().status()
+
+
+@fast_route(router.get("/eod/signals"))
+def eod_signals(symbols: Optional[str] = None):
+    """
+    Signals precomputed by the last end-of-day run (memory lookup).
+
+    Args:
+        symbols: Comma-separated symbols (default: every symbol in the snapshot)
+
+    Example:
+        GET /eod/signals?symbols=BBCA,BBRI
+    """
+    snap = get_eod_pipeline().snapshot
+    if snap is None:
+        raise HTTPException(status_code=503, detail="EOD snapshot has not been built yet")
+    wanted = [s.strip().upper() for s in symbols.split(",") if s.strip()] if symbols else list(snap["signals"])
+    return {
+        "version": snap["version"],
+        "as_of": snap["as_of"],
+        "generated_at": snap["generated_at"],
+        "signals": {s: snap["signals"][s] for s in wanted if s in snap["signals"]},
+        "missing": [s for s in wanted if s not in snap["signals"]],
+    }
+
+
+def start_eod_refresh():
+    """Run the end-of-day pipeline (incl. the screener table) after each market close (see EOD_CONFIG)."""
+    start_eod_scheduler()
+
+
 # ===== HEALTH CHECK =====
 
-@app.get("/health")
+@router.get("/health")
 def health_check():
     """Kubernetes-style health check"""
     return {"status": "healthy"}
 
 
-@app.get("/stocks")
+@router.get("/metrics")
+def metrics():
+    """
+    Request coalescing and signal cache counters.
+
+    single_flight: per group, how many calls arrived, how many actually ran
+    and how many were served by an identical in-flight computation.
+    signal_cache: hits (memory / disk), misses, evictions, expirations and size.
+    eod: version and stage durations of the last end-of-day run.
+    webhooks: signals diffed, events fanned out, deliveries, retries and dead letters.
+    stream: WebSocket/SSE subscribers, broadcast messages and per-client drops.
+    """
+    cache = get_signal_cache()
+    eod = get_eod_pipeline().status()
+    return {
+        "single_flight": flight_stats(),
+        "signal_cache": cache.stats() if cache is not None else {"enabled": False},
+        "eod": {k: v for k, v in eod.items() if k != "errors"},
+        "webhooks": get_dispatcher().stats(),
+        "stream": get_hub().stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@fast_route(router.get("/stocks"))
 def list_stocks():
     """
     List all supported stocks with details.
@@ -620,7 +718,6 @@ def list_stocks():
 
 # ===== ERROR HANDLERS =====
 
-@app.exception_handler(Exception)
 async def exception_handler(request: Request, exc: Exception):
     """Global exception handler that returns JSONResponse"""
     # Ensure we return a proper Response object with JSON serializable content
@@ -628,6 +725,32 @@ async def exception_handler(request: Request, exc: Exception):
     return JSONResponse(status_code=500, content=content)
 
 
+# ===== FASTAPI APP =====
+
+def create_app() -> FastAPI:
+    """
+    Build the API application.
+
+    Everything with side effects (the EOD scheduler thread, background
+    refreshers) is started by the startup hook, not when this module is imported.
+    """
+    app = FastAPI(
+        title="Stock AI Engine API",
+        description="Institutional trading signals & backtesting",
+        version="1.0.0",
+        default_response_class=FastJSONResponse
+    )
+    app.include_router(router)
+    # Pushed signal updates: /ws/signals and /stream/signals
+    setup_stream_routes(app)
+    app.add_exception_handler(Exception, exception_handler)
+    app.router.add_event_handler("startup", start_eod_refresh)
+    return app
+
+
+app = create_app()
+
+
 # ===== DEPLOYMENT INSTRUCTIONS =====
 
 if __name__ == "__main__":
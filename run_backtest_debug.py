@@ -1,8 +1,10 @@
 from main import run_backtest, BacktestRequest
-import json, traceback
+from api.responses import dumps
+import traceback
 req = BacktestRequest(symbols=["BBCA","BBRI"], lookback_period="6mo")
 try:
     res = run_backtest(req)
-    print(json.dumps(res, indent=2, ensure_ascii=False))
+    # Reports carry numpy scalars; dumps is the API's encoder
+    print(dumps(res, indent=True))
 except Exception:
     traceback.print_exc()
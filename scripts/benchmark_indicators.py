@@ -0,0 +1,156 @@
+"""
+Benchmark add_indicators (NumPy kernels) against the previous `ta`-based implementation.
+
+Usage:
+    python scripts/benchmark_indicators.py                 # all SUPPORTED_STOCKS, 10y from the price store
+    python scripts/benchmark_indicators.py --synthetic     # offline: random-walk frames of the same length
+    python scripts/benchmark_indicators.py --symbols BBCA BBRI --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from config import SUPPORTED_STOCKS
+from indicators.technical import add_indicators
+
+try:
+    import ta
+except ImportError:  # reference implementation is optional
+    ta = None
+
+
+def add_indicators_ta(df):
+    """The pre-kernel add_indicators, kept here as the reference implementation."""
+    close = df["Close"]
+    df["ema20"] = ta.trend.ema_indicator(close, window=20)
+    df["ema50"] = ta.trend.ema_indicator(close, window=50)
+    df["ema100"] = ta.trend.ema_indicator(close, window=100)
+    df["ema200"] = ta.trend.ema_indicator(close, window=200)
+    df["ema_252"] = ta.trend.ema_indicator(close, window=252)
+    df["ema_630"] = ta.trend.ema_indicator(close, window=630)
+    df["rsi"] = ta.momentum.rsi(close, window=14)
+    df["rsi_oversold"] = df["rsi"] < 30
+    df["rsi_overbought"] = df["rsi"] > 70
+    macd_obj = ta.trend.MACD(close, window_fast=12, window_slow=26, window_sign=9)
+    df["macd"] = macd_obj.macd()
+    df["macd_signal"] = macd_obj.macd_signal()
+    df["macd_diff"] = macd_obj.macd_diff()
+    df["macd_bullish"] = df["macd"] > df["macd_signal"]
+    bb = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+    df["bb_upper"] = bb.bollinger_hband()
+    df["bb_middle"] = bb.bollinger_mavg()
+    df["bb_lower"] = bb.bollinger_lband()
+    df["bb_percent"] = (close - df["bb_lower"]) / (df["bb_upper"] - df["bb_lower"])
+    df["atr"] = ta.volatility.average_true_range(df["High"], df["Low"], close, window=14)
+    df["volatility"] = close.rolling(window=20).std()
+    if "Volume" in df.columns:
+        df["volume_sma"] = df["Volume"].rolling(window=20).mean()
+        df["volume_ratio"] = df["Volume"] / df["volume_sma"]
+    df["high_52w"] = close.rolling(window=252).max()
+    df["low_52w"] = close.rolling(window=252).min()
+    df["all_time_high"] = close.expanding().max()
+    df["all_time_low"] = close.expanding().min()
+    df["distance_to_high_pct"] = ((df["high_52w"] - close) / close * 100).round(2)
+    df["distance_to_low_pct"] = ((close - df["low_52w"]) / close * 100).round(2)
+    df["trend_ema_alignment"] = (
+        (close > df["ema20"]).astype(int) +
+        (df["ema20"] > df["ema50"]).astype(int) +
+        (df["ema50"] > df["ema200"]).astype(int)
+    )
+    df["long_term_trend"] = (close > df["ema_252"]).astype(int) + (df["ema_252"] > df["ema_630"]).astype(int)
+    df["month"] = df.index.month
+    df["daily_return_pct"] = close.pct_change() * 100
+    return df
+
+
+def synthetic_frame(n=2520, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 5000 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n)))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.005, n)),
+        "High": close * (1 + np.abs(rng.normal(0, 0.01, n))),
+        "Low": close * (1 - np.abs(rng.normal(0, 0.01, n))),
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 50_000_000, n).astype(float),
+    }, index=pd.bdate_range("2016-01-01", periods=n, name="Date"))
+
+
+def load_frames(symbols, period, synthetic):
+    if synthetic:
+        return {s: synthetic_frame(seed=i) for i, s in enumerate(symbols)}
+
+    from data.fetcher import fetch_eod_batch
+
+    frames = {}
+    for is_us in (False, True):
+        group = [s for s in symbols if SUPPORTED_STOCKS.get(s, {}).get("is_us", False) == is_us]
+        if group:
+            got, errors = fetch_eod_batch(group, is_us=is_us, period=period)
+            frames.update(got)
+            for s, reason in errors.items():
+                print(f"⚠️  {s}: {reason}, skipped")
+    return frames
+
+
+def time_it(fn, frames, repeat):
+    """Best-of-`repeat` wall time (seconds) to run fn over every frame."""
+    best = float("inf")
+    for _ in range(repeat):
+        copies = [df.copy() for df in frames.values()]
+        start = time.perf_counter()
+        for df in copies:
+            fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def max_abs_diff(frames):
+    """Largest absolute difference per column between the two implementations."""
+    diffs = {}
+    for df in frames.values():
+        new, ref = add_indicators(df.copy()), add_indicators_ta(df.copy())
+        for col in ref.columns:
+            a, b = new[col].to_numpy(dtype=np.float64), ref[col].to_numpy(dtype=np.float64)
+            both = ~(np.isnan(a) & np.isnan(b))
+            diff = float(np.max(np.abs(a[both] - b[both]), initial=0.0))
+            diffs[col] = max(diffs.get(col, 0.0), diff)
+    return diffs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", nargs="+", help="Symbols to benchmark (default: all SUPPORTED_STOCKS)")
+    parser.add_argument("--period", default="10y", help="History length per symbol")
+    parser.add_argument("--synthetic", action="store_true", help="Use random-walk frames instead of market data")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    symbols = args.symbols or list(SUPPORTED_STOCKS)
+    frames = {s: df for s, df in load_frames(symbols, args.period, args.synthetic).items() if len(df) >= 14}
+    if not frames:
+        print("❌ No data to benchmark")
+        sys.exit(1)
+
+    bars = sum(len(df) for df in frames.values())
+    print(f"\n📊 {len(frames)} symbols, {bars:,} bars ({bars / len(frames):.0f} per symbol)")
+
+    kernel_time = time_it(add_indicators, frames, args.repeat)
+    print(f"  kernels : {kernel_time * 1000:8.1f} ms total, {kernel_time / len(frames) * 1000:6.2f} ms/symbol")
+
+    if ta is None:
+        print("  ta      : not installed, skipping reference timing")
+        sys.exit(0)
+
+    ta_time = time_it(add_indicators_ta, frames, args.repeat)
+    print(f"  ta      : {ta_time * 1000:8.1f} ms total, {ta_time / len(frames) * 1000:6.2f} ms/symbol")
+    print(f"  speedup : {ta_time / kernel_time:.1f}x")
+
+    worst = sorted(max_abs_diff(frames).items(), key=lambda kv: -kv[1])[:5]
+    print("  max |diff| vs ta: " + ", ".join(f"{col}={diff:.2e}" for col, diff in worst))
@@ -1,16 +1,21 @@
 import argparse
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data.fetcher import fetch_eod
+from config import BACKTEST_THRESHOLDS
+from data.fetcher import fetch_eod, fetch_eod_batch
 from indicators.technical import add_indicators
-from engine.decision import decision_engine
-from backtest.simple_backtest import backtest
+from engine.decision import decision_engine_series
+from backtest.vector_backtest import vector_backtest
 from backtest.report import summarize
+from backtest.portfolio import portfolio_backtest
 import pandas as pd
 
 
@@ -22,41 +27,107 @@ DEFAULT_IHSG = [
 
 
 def prepare_backtest(df, warmup=50):
-    """Runs decision_engine on rolling historical slices and returns df with signal and metadata columns."""
-    records = []
+    """Scores every bar with decision_engine_series and returns df with signal and metadata columns."""
+    decisions = decision_engine_series(df, meta=True)
+    warmup = min(warmup, len(df))
 
-    for i in range(len(df)):
-        if i < warmup:
-            records.append({"signal": None, "score": None, "confidence": None, "reasons": None, "meta": None})
-        else:
-            temp_df = df.iloc[:i+1]
-            decision = decision_engine(temp_df)
-            records.append(decision)
+    def _after_warmup(values):
+        return [None] * warmup + list(values)[warmup:]
 
     df = df.copy()
-    df["signal"] = [r["signal"] for r in records]
-    df["signal_score"] = [r.get("score") for r in records]
-    df["signal_confidence"] = [r.get("confidence") for r in records]
-    df["signal_reasons"] = [json.dumps(r.get("reasons")) if r.get("reasons") is not None else None for r in records]
-    df["signal_meta"] = [json.dumps(r.get("meta")) if r.get("meta") is not None else None for r in records]
+    df["signal"] = _after_warmup(decisions["signal"])
+    df["signal_score"] = _after_warmup(decisions["score"].tolist())
+    df["signal_confidence"] = _after_warmup(decisions["confidence"].tolist())
+    df["signal_reasons"] = _after_warmup(json.dumps(r) for r in decisions["reasons"])
+    df["signal_meta"] = _after_warmup(json.dumps(m) for m in decisions["meta"])
     return df
 
 
-def run_for_symbol(symbol, save_trades=False):
+def backtest_symbol(symbol, df):
+    """
+    Indicators -> decisions -> backtest -> summarize for one symbol's OHLCV frame.
+
+    Safe to run in a worker process: never raises, and returns a compact picklable
+    record {"symbol", "trades", "report", "seconds", "error"}.
+    """
+    started = time.perf_counter()
+    try:
+        df = prepare_backtest(add_indicators(df))
+        ledger, curve = vector_backtest(df, as_ledger=True, equity=True)
+        report = summarize(ledger)
+        report["equity"] = curve.metrics()
+        if BACKTEST_THRESHOLDS.get("SHORT_SIGNAL_ENABLED", False):
+            # Headline stays on the long book (as /backtest and the sweep); shorts only appear here
+            both = summarize(vector_backtest(df, as_ledger=True, short=True))
+            if "by_direction" in both:
+                report["by_direction"] = both["by_direction"]
+        trades = ledger.to_trades()
+        error = None
+    except Exception as e:
+        trades, report, error = [], {}, f"{type(e).__name__}: {e}"
+    return {
+        "symbol": symbol,
+        "trades": trades,
+        "report": report,
+        "seconds": round(time.perf_counter() - started, 3),
+        "error": error,
+    }
+
+
+def backtest_many(frames, symbols, workers=1):
+    """
+    Run backtest_symbol for every symbol with data, optionally across a process pool.
+
+    Args:
+        frames: {symbol: OHLCV DataFrame}
+        symbols: Symbols in the order results should be returned
+        workers: Worker processes (1 = in-process, <= 0 = one per CPU)
+
+    Returns:
+        List of backtest_symbol records in `symbols` order (symbols without data are left out)
+    """
+    symbols = [s for s in symbols if s in frames]
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(symbols)) or 1
+
+    if workers == 1:
+        records = {s: backtest_symbol(s, frames[s]) for s in symbols}
+    else:
+        records = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(backtest_symbol, s, frames[s]): s for s in symbols}
+            for done, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                records[record["symbol"]] = record
+                status = "❌" if record["error"] else "✅"
+                print(f"  {status} [{done}/{len(symbols)}] {record['symbol']} ({record['seconds']:.2f}s)")
+    return [records[s] for s in symbols]
+
+
+def _print_header(symbol):
     print(f"\n{'='*70}")
     print(f"ANALYZING: {symbol}")
     print(f"{'='*70}")
-    
-    df = fetch_eod(symbol)
+
+
+def run_for_symbol(symbol, save_trades=False, df=None):
+    if df is None:
+        df = fetch_eod(symbol)
     if df is None or df.empty:
+        _print_header(symbol)
         print(f"❌ No data for {symbol}, skipping.")
         return None
+    return report_symbol(backtest_symbol(symbol, df), save_trades=save_trades)
 
-    df = add_indicators(df)
-    df = prepare_backtest(df)
 
-    trades = backtest(df)
-    report = summarize(trades)
+def report_symbol(record, save_trades=False):
+    """Print one backtest_symbol record (and optionally export its trades)."""
+    symbol, trades, report = record["symbol"], record["trades"], record["report"]
+    _print_header(symbol)
+    if record["error"]:
+        print(f"❌ Backtest failed for {symbol}: {record['error']}")
+        return None
 
     # ===== INSTITUTIONAL-READY OUTPUT =====
     print(f"\n📊 BACKTEST REPORT: {symbol}")
@@ -86,6 +157,31 @@ def run_for_symbol(symbol, save_trades=False):
     print(f"Max Consecutive Loss: {report.get('max_consecutive_losses')}")
     print(f"Expectancy:           {report.get('expectancy')}%")
     print(f"Total Profit:         {report.get('total_profit_pct')}%")
+
+    # Long and short books side by side (SHORT_SIGNAL_ENABLED); the metrics above are the long book
+    by_direction = report.get("by_direction")
+    if by_direction:
+        short_target = BACKTEST_THRESHOLDS.get("SHORT_WIN_RATE_TARGET", 0.5) * 100
+        print(f"\n↕️  BY DIRECTION:")
+        for direction, side in by_direction.items():
+            if side.get("total_trades") == 0:
+                print(f"{direction:<6} no trades")
+                continue
+            line = (f"{direction:<6} {side['total_trades']:>4} trades | Win Rate {side['win_rate']}% | "
+                    f"Avg {side['avg_return_pct']}% | Profit Factor {side['profit_factor']} | "
+                    f"Total {side['total_profit_pct']}%")
+            if direction == "SHORT":
+                line += f" | {'✅' if side['win_rate'] >= short_target else '🔄'} target {short_target:.0f}%"
+            print(line)
+
+    # Bar-level equity curve (compounded, net of transaction costs)
+    equity = report.get("equity")
+    if equity:
+        print(f"\n⏱️  EQUITY CURVE (net of {equity['cost_pct']}% per fill):")
+        print(f"Total / Annual Return: {equity['total_return_pct']}% / {equity['annual_return_pct']}%")
+        print(f"Sharpe / Sortino:     {equity['sharpe_ratio']} / {equity['sortino_ratio']} (annualized)")
+        print(f"Max Drawdown:         {equity['max_drawdown_pct']}% ({equity['max_drawdown_bars']} bars underwater)")
+        print(f"Exposure / Turnover:  {equity['exposure_pct']}% / {equity['turnover_per_year']} fills per year")
     
     # Institutional readiness
     institution_ready = report.get('institution_ready')
@@ -115,7 +211,7 @@ def run_for_symbol(symbol, save_trades=False):
                 writer.writerows(trades)
         print(f"\n💾 Trades exported to: results/trades_{symbol}.csv")
 
-    return {"symbol": symbol, "trades": trades, "report": report}
+    return {"symbol": symbol, "trades": trades, "report": report, "seconds": record["seconds"]}
 
 
 if __name__ == "__main__":
@@ -123,6 +219,8 @@ if __name__ == "__main__":
     p.add_argument("symbols", nargs="*", help="Symbols to test (overrides defaults)")
     p.add_argument("--all", action="store_true", help="Run through full IHSG default list")
     p.add_argument("--save", action="store_true", help="Save trades to CSV per symbol")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Worker processes for the per-symbol backtests (0 = one per CPU)")
     args = p.parse_args()
 
     if args.all:
@@ -132,9 +230,21 @@ if __name__ == "__main__":
     else:
         symbols = ["BBCA"]  # conservative default
 
+    # One grouped download for the whole universe, then per-symbol backtests run locally
+    frames, fetch_errors = fetch_eod_batch(symbols)
+    for s, reason in fetch_errors.items():
+        print(f"❌ No data for {s} ({reason}), skipping.")
+
+    started = time.perf_counter()
+    if args.workers != 1:
+        print(f"\n⚙️  Backtesting {len(frames)} symbols on {args.workers if args.workers > 0 else os.cpu_count()} workers")
+    records = backtest_many(frames, symbols, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    # Reports are printed after the pool finishes, in symbol order, so output is deterministic
     results = []
-    for s in symbols:
-        res = run_for_symbol(s, save_trades=args.save)
+    for record in records:
+        res = report_symbol(record, save_trades=args.save)
         if res:
             results.append(res)
 
@@ -152,15 +262,25 @@ if __name__ == "__main__":
         avg_sharpe = sum(r["report"].get("sharpe_ratio", 0) for r in results) / len(results)
         avg_recovery = sum(r["report"].get("recovery_factor", 0) for r in results) / len(results)
         
-        portfolio_return = sum(r["report"].get("total_profit_pct", 0) for r in results)
-        
         print(f"\nSymbols Tested:       {len(results)}")
         print(f"Total Trades:         {total_trades}")
         print(f"Portfolio Win/Loss:   {total_wins} / {total_losses}")
         print(f"\nAverage Win Rate:     {round(avg_win_rate, 2)}%")
         print(f"Avg Sharpe Ratio:     {round(avg_sharpe, 2)}")
         print(f"Avg Recovery Factor:  {round(avg_recovery, 2)}")
-        print(f"Total Return Pct:     {round(portfolio_return, 2)}%")
+        
+        # One account trading every symbol under RISK_CONFIG (not a sum of per-symbol returns)
+        portfolio = portfolio_backtest({r["symbol"]: frames[r["symbol"]] for r in results})["report"]
+        equity = portfolio["equity"]
+        print(f"\n🏦 SIMULATED PORTFOLIO (RISK_CONFIG limits, shared capital)")
+        print(f"Total Return Pct:     {equity['total_return_pct']}%")
+        print(f"Annual Return Pct:    {equity['annual_return_pct']}%")
+        print(f"Sharpe / Sortino:     {equity['sharpe_ratio']} / {equity['sortino_ratio']}")
+        print(f"Max Drawdown Pct:     {equity['max_drawdown_pct']}% ({equity['max_drawdown_bars']} bars)")
+        print(f"Exposure Pct:         {equity['exposure_pct']}%")
+        print(f"Trades:               {portfolio['total_trades']} ({portfolio['open_positions']} still open)")
+        print(f"Avg / Max Positions:  {portfolio['avg_concurrent_positions']} / {portfolio['max_concurrent_positions']}")
+        print(f"Breaker Days:         {portfolio['halted_days']}")
         
         # Overall readiness
         ready_count = sum(1 for r in results if r["report"].get("institution_ready"))
@@ -171,3 +291,13 @@ if __name__ == "__main__":
             print(f"   {', '.join(ready_symbols)}")
         
         print(f"{'='*70}")
+
+    # Per-symbol wall time and failures
+    if records:
+        print(f"\n⏱️  PER-SYMBOL TIMING ({elapsed:.2f}s wall, {sum(r['seconds'] for r in records):.2f}s total)")
+        for record in sorted(records, key=lambda r: -r["seconds"]):
+            status = f"❌ {record['error']}" if record["error"] else f"{len(record['trades'])} trades"
+            print(f"  {record['symbol']:<8} {record['seconds']:7.2f}s  {status}")
+    failed = [r["symbol"] for r in records if r["error"]] + list(fetch_errors)
+    if failed:
+        print(f"\n⚠️  FAILED: {', '.join(failed)}")
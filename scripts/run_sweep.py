@@ -0,0 +1,77 @@
+"""
+Rank signal thresholds and stop/target levels over historical data.
+
+Usage:
+    python scripts/run_sweep.py                        # DEFAULT_IHSG, SWEEP_CONFIG grid, all cores
+    python scripts/run_sweep.py BBCA BBRI --workers 2
+    python scripts/run_sweep.py --buy 4 5 6 --sell -1 -0.5 --stop 0.05 --target 0.1 0.15
+    python scripts/run_sweep.py --rank-by expectancy --top 20 --out results/sweep.csv
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import SWEEP_CONFIG
+from data.fetcher import fetch_eod_batch
+from backtest.sweep import RANK_FIELDS, default_grid, run_sweep
+from scripts.run_backtest import DEFAULT_IHSG
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("symbols", nargs="*", help="Symbols to sweep (default: IHSG default list)")
+    p.add_argument("--period", default=SWEEP_CONFIG.get("PERIOD", "10y"), help="History length per symbol")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    p.add_argument("--buy", type=float, nargs="+", help="BUY thresholds (default: SWEEP_CONFIG + styles)")
+    p.add_argument("--sell", type=float, nargs="+", help="SELL thresholds")
+    p.add_argument("--short", type=float, nargs="+", help="SHORT thresholds")
+    p.add_argument("--stop", type=float, nargs="+", help="Stop loss fractions (0.05 = -5%%)")
+    p.add_argument("--target", type=float, nargs="+", help="Profit target fractions (0.10 = +10%%)")
+    p.add_argument("--rank-by", choices=RANK_FIELDS, default=SWEEP_CONFIG.get("RANK_BY", "sharpe_ratio"))
+    p.add_argument("--min-trades", type=int, default=None, help="Rank grid points with fewer trades last")
+    p.add_argument("--top", type=int, default=10, help="Rows printed to the console")
+    p.add_argument("--out", help="CSV path (default: results/sweep_<timestamp>.csv)")
+    args = p.parse_args()
+
+    symbols = args.symbols or DEFAULT_IHSG
+    grid = default_grid()
+    for key, values in (("buy_threshold", args.buy), ("sell_threshold", args.sell),
+                        ("short_threshold", args.short), ("stop_pct", args.stop),
+                        ("target_pct", args.target)):
+        if values:
+            grid[key] = sorted(set(values))
+
+    frames, fetch_errors = fetch_eod_batch(symbols, period=args.period)
+    for s, reason in fetch_errors.items():
+        print(f"❌ No data for {s} ({reason}), skipping.")
+    if not frames:
+        print("❌ No data to sweep")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    table = run_sweep(frames, grid, workers=args.workers, rank_by=args.rank_by, min_trades=args.min_trades)
+    elapsed = time.perf_counter() - started
+
+    results_dir = Path(__file__).parent.parent / "results"
+    out = Path(args.out) if args.out else results_dir / f"sweep_{datetime.now():%Y%m%d_%H%M%S}.csv"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(out, index=False)
+
+    print(f"\n{'='*70}")
+    print(f"📊 TOP {min(args.top, len(table))} BY {args.rank_by.upper()} ({len(table)} grid points, {elapsed:.1f}s)")
+    print(f"{'='*70}")
+    columns = ["rank", "buy_threshold", "sell_threshold", "short_threshold", "stop_pct", "target_pct",
+               "total_trades", "win_rate", "avg_return_pct", "sharpe_ratio", "profit_factor", "styles"]
+    print(table[columns].head(args.top).to_string(index=False))
+
+    configured = table[table["styles"] != ""]
+    if not configured.empty:
+        print(f"\n⚙️  CONFIGURED THRESHOLDS")
+        print(configured[columns].to_string(index=False))
+
+    print(f"\n💾 Results exported to: {out}")
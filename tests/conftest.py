@@ -0,0 +1,57 @@
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def make_ohlcv(n=600, seed=0, start="2015-01-01"):
+    """Synthetic random-walk OHLCV frame shaped like fetch_eod output (no network)."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=n, name="Date")
+    close = 5000 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n)))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.005, n)),
+        "High": close * (1 + np.abs(rng.normal(0, 0.01, n))),
+        "Low": close * (1 - np.abs(rng.normal(0, 0.01, n))),
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 50_000_000, n).astype(float),
+    }, index=index)
+
+
+@pytest.fixture
+def ohlcv():
+    """Factory fixture: ohlcv(n=..., seed=...) -> synthetic OHLCV DataFrame."""
+    return make_ohlcv
+
+
+
+def _use_fundamentals_db(path):
+    import data.fundamentals_store as fundamentals_store
+    fundamentals_store.set_fundamentals_store(fundamentals_store.FundamentalsStore(path))
+
+
+def pytest_configure(config):
+    # Some test modules call the API at import time, before any fixture runs
+    config._fundamentals_tmp = tempfile.mkdtemp(prefix="fundamentals-")
+    _use_fundamentals_db(Path(config._fundamentals_tmp) / "fundamentals.db")
+
+
+def pytest_unconfigure(config):
+    import data.fundamentals_store as fundamentals_store
+    fundamentals_store.set_fundamentals_store(None)
+    shutil.rmtree(getattr(config, "_fundamentals_tmp", ""), ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def fundamentals_db(tmp_path):
+    """Keep every test's fundamentals store out of the checkout (no data/fundamentals.db)."""
+    _use_fundamentals_db(tmp_path / "db" / "fundamentals.db")
+    yield
+    # Fixtures that swap the store reset it to None; background threads may still read it
+    _use_fundamentals_db(tmp_path / "db" / "fundamentals.db")
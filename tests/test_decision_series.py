@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+
+from engine.decision import decision_engine, decision_engine_series
+from indicators.technical import add_indicators
+
+
+def _assert_parity(df, start=0):
+    series = decision_engine_series(df, meta=True)
+    for i in range(start, len(df)):
+        expected = decision_engine(df.iloc[:i + 1])
+        row = series.iloc[i]
+        assert row["signal"] == expected["signal"], i
+        assert row["score"] == expected["score"], i
+        assert row["confidence"] == expected["confidence"], i
+        assert row["reasons"] == expected["reasons"], i
+        # json.dumps keeps key order and makes NaN comparable
+        assert json.dumps(row["meta"]) == json.dumps(expected["meta"]), i
+
+
+def test_series_matches_scalar_engine_on_every_bar(ohlcv):
+    _assert_parity(add_indicators(ohlcv(n=400, seed=1)))
+
+
+def test_series_matches_scalar_engine_with_gaps_and_missing_columns(ohlcv):
+    df = add_indicators(ohlcv(n=300, seed=2))
+    df.loc[df.index[100:110], ["rsi", "macd_signal"]] = np.nan
+    df.loc[df.index[150], "macd_signal"] = 0.0
+    _assert_parity(df.drop(columns=["volume_ratio", "bb_upper"]), start=90)
+
+
+def test_series_can_skip_reasons(ohlcv):
+    df = add_indicators(ohlcv(n=120))
+    out = decision_engine_series(df, reasons=False)
+    assert list(out.columns) == ["signal", "score", "confidence"]
+    assert set(out["signal"]) <= {"BUY", "SELL", "HOLD", "SHORT"}
+
+
+def test_series_matches_scalar_engine_on_short_signals(ohlcv, monkeypatch):
+    from engine import decision
+    monkeypatch.setitem(decision.SIGNAL_CONFIG, "SHORT_THRESHOLD", -3.0)
+    df = add_indicators(ohlcv(n=300, seed=3))
+    assert (decision_engine_series(df)["signal"] == "SHORT").any()
+    _assert_parity(df, start=200)
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from data import fetcher
+from data.price_store import FrameSource, PriceStore
+from engine import eod_pipeline, screener, signal_service
+from engine.cache import TieredCache
+from engine.decision import decision_engine
+from indicators.technical import add_indicators
+
+UNIVERSE = {
+    "BBCA": {"is_us": False, "name": "Bank Central Asia", "sector": "Banking"},
+    "ANTM": {"is_us": False, "name": "Aneka Tambang", "sector": "Mining"},
+    "NVDA": {"is_us": True, "name": "NVIDIA", "sector": "Technology"},
+    "GONE": {"is_us": False, "name": "Delisted", "sector": "Other"},
+}
+
+
+@pytest.fixture
+def pipeline(tmp_path, ohlcv, monkeypatch):
+    frames = {"BBCA.JK": ohlcv(n=400, seed=1), "ANTM.JK": ohlcv(n=400, seed=2), "NVDA": ohlcv(n=400, seed=3)}
+    store = PriceStore(root=tmp_path / "store", source=FrameSource(frames))
+    monkeypatch.setattr(fetcher, "_store", store)
+    signal_service.set_signal_cache(TieredCache())
+    table = screener.SignalTable(path=tmp_path / "table.json",
+                                 builder=lambda: screener.build_signal_table(UNIVERSE, period="1y"))
+    p = eod_pipeline.EODPipeline(universe=UNIVERSE, period="1y", table=table,
+                                 path=tmp_path / "snapshot.json", refresh_fundamentals=False)
+    eod_pipeline.set_eod_pipeline(p)
+    yield p, frames, store
+    eod_pipeline.set_eod_pipeline(None)
+    signal_service.set_signal_cache(None)
+
+
+def test_run_publishes_versioned_snapshot(pipeline, tmp_path):
+    p, frames, store = pipeline
+    snap = p.refresh()
+
+    assert snap["version"] == 1
+    assert [s["stage"] for s in snap["stages"]] == ["prices", "signals", "screener"]
+    assert all(s["ok"] and s["seconds"] >= 0 for s in snap["stages"])
+    assert sorted(snap["signals"]) == ["ANTM", "BBCA", "NVDA"]
+    assert set(snap["errors"]["GONE"]) >= {"prices", "signals"}
+
+    expected = decision_engine(add_indicators(store.read("BBCA.JK", "1y")))
+    assert (p.signal("BBCA")["signal"], p.signal("BBCA")["score"]) == (expected["signal"], expected["score"])
+    assert store.last_date("BBCA.JK") == snap["as_of"] == p.table.snapshot["as_of"]
+
+    # Signals were cached on the way: the request path is a lookup
+    assert signal_service.cached_signal("BBCA", period="1y") is not None
+
+    assert p.refresh()["version"] == 2
+    reloaded = eod_pipeline.EODPipeline(universe=UNIVERSE, path=tmp_path / "snapshot.json")
+    assert reloaded.snapshot["version"] == 2
+
+
+def test_eod_endpoints(pipeline):
+    p, _, _ = pipeline
+    client = TestClient(main.app)
+    assert client.get("/eod/signals").status_code == 503
+
+    p.refresh()
+    status = client.get("/eod/status").json()
+    assert status["version"] == 1 and status["signals"] == 3
+
+    body = client.get("/eod/signals?symbols=bbca,GONE").json()
+    assert list(body["signals"]) == ["BBCA"] and body["missing"] == ["GONE"]
+    assert client.get("/metrics").json()["eod"]["version"] == 1
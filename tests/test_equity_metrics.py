@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from backtest.metrics import bar_returns, equity_curve, equity_metrics, longest_run
+from backtest.vector_backtest import vector_backtest
+from config import INSTITUTIONAL_CONFIG
+from indicators.technical import add_indicators
+from scripts.run_backtest import prepare_backtest
+
+
+def test_equity_curve_marks_to_market_with_costs():
+    prices = [100.0, 110.0, 99.0, np.nan, 108.9, 100.0]
+    curve = equity_curve(prices, entries=[0], exits=[2], cost_pct=0.0)
+    assert curve.exposure.tolist() == [0, 1, 1, 0, 0, 0]
+    assert np.allclose(curve.equity, [1.0, 1.1, 0.99, 0.99, 0.99, 0.99])
+    assert bar_returns(prices)[3] == 0.0  # NaN close carries the last price
+
+    m = equity_metrics(curve, periods_per_year=252)
+    assert m["max_drawdown_pct"] == -10.0
+    assert m["max_drawdown_bars"] == 4
+    assert m["exposure_pct"] == round(2 / 6 * 100, 2)
+    assert m["fills"] == 2
+
+    charged = equity_curve(prices, [0], [2], cost_pct=1.0)
+    assert charged.equity[-1] == pytest.approx(0.99 * 0.99 * 0.99)
+
+
+def test_backtest_emits_equity_consistent_with_ledger(ohlcv):
+    df = prepare_backtest(add_indicators(ohlcv(n=1500, seed=8)))
+    ledger, curve = vector_backtest(df, as_ledger=True, equity=True, cost_pct=0.0)
+    assert len(curve) == len(df) and curve.fills.sum() == 2 * len(ledger)
+    # Between trades the account is flat; over a trade it compounds the trade's return
+    assert curve.equity[-1] == pytest.approx(np.prod(1 + ledger.return_pct / 100), rel=1e-3)
+
+    _, net = vector_backtest(df, equity=True)
+    assert net.cost_pct == INSTITUTIONAL_CONFIG["TRANSACTION_COST_PCT"]
+    assert net.equity[-1] == pytest.approx(curve.equity[-1] * (1 - net.cost_pct / 100) ** (2 * len(ledger)))
+    m = net.metrics()
+    assert m["sharpe_ratio"] != 0 and 0 < m["exposure_pct"] < 100
+    assert m["turnover_per_year"] == pytest.approx(2 * len(ledger) / (len(df) / 252), abs=0.01)
+
+
+def test_longest_run():
+    assert longest_run(np.array([True, True, False, True, True, True, False])) == 3
+    assert longest_run(np.zeros(4, dtype=bool)) == 0
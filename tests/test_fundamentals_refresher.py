@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import data.fundamentals_store as fundamentals_store
+from data.fetchers import fundamentals_refresher, yahoo_fundamentals
+from data.fetchers.fundamentals_refresher import TokenBucket, refresh_fundamentals
+from data.fundamentals_store import LIVE_PERIOD, FundamentalsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FundamentalsStore(tmp_path / "fundamentals.db")
+    fundamentals_store.set_fundamentals_store(store)
+    yield store
+    fundamentals_store.set_fundamentals_store(None)
+
+
+@pytest.fixture
+def fake_yahoo(monkeypatch):
+    """Slow fetcher: FLAKY fails once, BAD always fails; tracks peak concurrency."""
+    state = {"calls": {}, "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fetch(symbol, use_cache=True):
+        with lock:
+            state["calls"][symbol] = state["calls"].get(symbol, 0) + 1
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            calls = state["calls"][symbol]
+        time.sleep(0.2)
+        with lock:
+            state["active"] -= 1
+        if symbol == "BAD" or (symbol == "FLAKY" and calls == 1):
+            return {"error": "HTTP 429", "symbol": symbol}
+        return {"symbol": symbol, "fundamentals": [{"pe_ratio": 10.0}], "source": "fake"}
+
+    monkeypatch.setattr(yahoo_fundamentals, "fetch_fundamentals_yahoo", fetch)
+    return state
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, burst=2)
+    started = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    # 2 from the burst, 4 more at 20/s
+    assert time.perf_counter() - started >= 0.18
+
+
+def test_refresh_concurrent_with_retries(store, fake_yahoo):
+    store.put("CACHED", LIVE_PERIOD, {"symbol": "CACHED", "fundamentals": [], "source": "yahoo"})
+    symbols = ["CACHED", "FLAKY", "BAD"] + [f"S{i}" for i in range(8)]
+
+    started = time.perf_counter()
+    items = list(refresh_fundamentals(symbols, workers=8, limiter=TokenBucket(1000, 100),
+                                      retries=1, backoff=0.01))
+    elapsed = time.perf_counter() - started
+
+    by_symbol = {item["symbol"]: item for item in items}
+    assert items[0]["symbol"] == "CACHED" and items[0]["status"] == "cached"
+    assert set(by_symbol) == set(symbols)
+    assert by_symbol["FLAKY"]["status"] == "ok" and by_symbol["FLAKY"]["attempts"] == 2
+    assert by_symbol["BAD"]["status"] == "error" and by_symbol["BAD"]["attempts"] == 2
+    assert "CACHED" not in fake_yahoo["calls"]
+    assert fake_yahoo["peak"] > 1
+    assert elapsed < 1.5  # sequential would be >= 12 * 0.2s
+
+
+def test_refresh_portfolio_streams_ndjson(store, fake_yahoo, monkeypatch):
+    import main
+
+    monkeypatch.setattr(fundamentals_refresher, "get_rate_limiter", lambda: TokenBucket(1000, 100))
+    monkeypatch.setitem(fundamentals_refresher.DATA_CONFIG, "FUNDAMENTALS_BACKOFF_SECONDS", 0.01)
+    client = TestClient(main.app)
+
+    resp = client.post("/fundamental/refresh-portfolio?stream=true", json={"symbols": ["S1", "BAD", "S2"]})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert {line["symbol"] for line in lines[:-1]} == {"S1", "BAD", "S2"}
+    assert lines[-1]["done"] is True and lines[-1]["error"] == 1 and lines[-1]["ok"] == 2
+
+    resp = client.post("/fundamental/refresh-portfolio", json={"symbols": ["S1", "BAD"]})
+    body = resp.json()
+    assert list(body["results"]) == ["S1", "BAD"]
+    assert body["results"]["S1"]["source"] == "fake"
+    assert "error" in body["results"]["BAD"]
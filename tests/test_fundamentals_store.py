@@ -0,0 +1,98 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import data.fundamentals as fundamentals
+import data.fundamentals_store as fundamentals_store
+from data.fetchers import yahoo_fundamentals
+from data.fundamentals_store import LIVE_PERIOD, FundamentalsStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    curated = tmp_path / "fund_data"
+    curated.mkdir()
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    monkeypatch.setattr(fundamentals, "CURATED_DIR", curated)
+    monkeypatch.setattr(fundamentals_store, "YAHOO_CACHE_DIR", legacy)
+    store = FundamentalsStore(tmp_path / "fundamentals.db")
+    fundamentals_store.set_fundamentals_store(store)
+    yield store, curated, legacy
+    fundamentals_store.set_fundamentals_store(None)
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_bulk_read_is_one_query(store):
+    store, _, _ = store
+    store.put_many([(f"S{i}", LIVE_PERIOD, {"symbol": f"S{i}", "pe": i}, None, "test") for i in range(50)])
+
+    queries = []
+    store._conn().set_trace_callback(queries.append)
+    got = store.get_many([f"S{i}" for i in range(50)] + ["NOPE"], [LIVE_PERIOD])
+    store._conn().set_trace_callback(None)
+
+    assert len(queries) == 1
+    assert len(got) == 50 and got["S7"][LIVE_PERIOD]["pe"] == 7
+    assert "_cached_at" in got["S7"][LIVE_PERIOD]
+
+    store.put("OLD", LIVE_PERIOD, {"pe": 1}, cached_at=(datetime.now() - timedelta(days=3)).isoformat())
+    assert store.get("OLD", LIVE_PERIOD, since=datetime.now() - timedelta(days=1)) is None
+    assert store.get("OLD", LIVE_PERIOD)["pe"] == 1
+
+
+def test_curated_files_precedence_and_pickup(store):
+    store, curated, _ = store
+    _write(curated / "BBCA.json", {"symbol": "BBCA", "fundamentals": [{"year": 2024}]})
+    _write(curated / "BBCA_2025Q2.json", {"symbol": "BBCA", "fundamentals": [{"year": 2025}]})
+    _write(curated / "BBRI.json", {"symbol": "BBRI", "fundamentals": [{"year": 2023}]})
+
+    funds = fundamentals.fetch_fundamentals_many(["BBCA", "BBRI", "TLKM"])
+    assert funds["BBCA"]["fundamentals"][0]["year"] == 2025
+    assert funds["BBRI"]["fundamentals"][0]["year"] == 2023
+    assert funds["TLKM"]["note"].startswith("mocked")
+    assert "_cached_at" not in funds["BBCA"]
+
+    # Unchanged files: no re-import; new files are picked up
+    assert store.import_json_dir(curated) == 0
+    _write(curated / "TLKM_2025Q2.json", {"symbol": "TLKM", "fundamentals": [{"year": 2025}]})
+    assert fundamentals.fetch_fundamentals("TLKM")["fundamentals"][0]["year"] == 2025
+
+    # An in-place edit leaves the directory mtime alone but is still re-imported (and only that file)
+    directory_mtime = os.stat(curated).st_mtime_ns
+    path = curated / "BBRI.json"
+    _write(path, {"symbol": "BBRI", "fundamentals": [{"year": 2024}]})
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    os.utime(curated, ns=(0, directory_mtime))
+    assert store.import_json_dir(curated) == 1
+    assert fundamentals.fetch_fundamentals("BBRI")["fundamentals"][0]["year"] == 2024
+
+    # Deleted files take their snapshots with them
+    (curated / "BBCA_2025Q2.json").unlink()
+    assert fundamentals.fetch_fundamentals("BBCA")["fundamentals"][0]["year"] == 2024
+    assert store.get("BBCA", "2025Q2") is None
+
+
+def test_legacy_yahoo_cache_is_migrated_once(store):
+    store, _, legacy = store
+    fresh = datetime.now().isoformat()
+    _write(legacy / "BBCA_cache.json", {"symbol": "BBCA", "source": "Yahoo Finance", "_cached_at": fresh})
+    _write(legacy / "BBRI_cache.json", {"symbol": "BBRI", "_cached_at": "2020-01-01T00:00:00"})
+
+    assert store.migrate() == 2
+    assert store.migrate() == 0
+
+    assert yahoo_fundamentals._get_cached_data("BBCA")["_cached_at"] == fresh
+    assert yahoo_fundamentals._get_cached_data("BBRI") is None  # older than CACHE_AGE_HOURS
+
+    result = {"symbol": "TLKM", "fundamentals": []}
+    yahoo_fundamentals._save_cached_data("TLKM", result)
+    assert yahoo_fundamentals.auto_fetch_and_cache_portfolio(["TLKM", "BBCA"]) == {
+        "TLKM": result, "BBCA": yahoo_fundamentals._get_cached_data("BBCA"),
+    }
@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Import cost of the app's own modules, excluding fastapi itself (microseconds).
+# Before lazy imports this was ~1.5 s (pandas, yfinance, bcrypt hash at import).
+OWN_IMPORT_BUDGET_US = 400_000
+
+HEAVY = ["yfinance", "ta", "jose", "passlib", "pandas", "numpy"]
+
+
+def _import(module, tmp_path):
+    code = (
+        "import json, os, sys\n"
+        f"import {module}\n"
+        f"print(json.dumps({{'cwd': os.getcwd(), 'loaded': [m for m in {HEAVY!r} if m in sys.modules]}}))\n"
+    )
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=tmp_path,
+                          env={"PYTHONPATH": str(ROOT), "PATH": ""}, capture_output=True, text=True,
+                          timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line.split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), cumulative
+
+
+def test_b2c_app_import_is_light(tmp_path):
+    state, cumulative = _import("app_b2c", tmp_path)
+    assert state["cwd"] == str(tmp_path)  # no os.chdir at import
+    assert state["loaded"] == []
+    own = cumulative["app_b2c"] - cumulative.get("fastapi", 0)
+    assert own < OWN_IMPORT_BUDGET_US, f"app_b2c own import time {own / 1000:.0f} ms"
+
+
+def test_main_import_has_no_side_effects(tmp_path):
+    state, _ = _import("main", tmp_path)
+    assert state["cwd"] == str(tmp_path)
+    assert not {"yfinance", "ta", "jose", "passlib"} & set(state["loaded"])
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from data.price_store import FrameSource, PriceStore
+from indicators.incremental import IndicatorState, load_state, update_indicators
+from indicators.technical import add_indicators
+
+
+def _assert_row_matches(row, expected):
+    for col, want in expected.items():
+        got = row[col]
+        if isinstance(want, (bool, np.bool_)):
+            assert got == bool(want), col
+        else:
+            np.testing.assert_allclose(float(got), float(want), rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=col)
+
+
+def test_streaming_updates_match_batch(ohlcv):
+    df = ohlcv(n=800)
+    df.iloc[300:330, df.columns.get_loc("Volume")] = 0.0  # zero-volume stretch (suspension)
+    batch = add_indicators(df.copy())
+
+    state = IndicatorState.from_frame(df.iloc[:650])
+    _assert_row_matches(state.last_row, batch.iloc[649])
+
+    for i in range(650, len(df)):
+        # round-trip through JSON as the daily job would
+        state = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+        bar = df.iloc[i]
+        row = state.update(df.index[i], bar["Open"], bar["High"], bar["Low"], bar["Close"], bar["Volume"])
+        _assert_row_matches(row, batch.iloc[i])
+
+
+def test_short_history_warmup_matches_batch(ohlcv):
+    df = ohlcv(n=40, seed=3)
+    batch = add_indicators(df.copy())
+    state = IndicatorState()
+    for i in range(len(df)):
+        bar = df.iloc[i]
+        row = state.update(df.index[i], bar["Open"], bar["High"], bar["Low"], bar["Close"], bar["Volume"])
+        _assert_row_matches(row, batch.iloc[i])
+
+
+def test_update_indicators_replays_only_new_bars(tmp_path, ohlcv):
+    full = ohlcv(n=700, seed=5)
+    source = FrameSource({"BBCA.JK": full.iloc[:690]})
+    store = PriceStore(root=tmp_path, source=source, refresh_minutes=0)
+    store.get("BBCA.JK")
+
+    update_indicators(store, "BBCA.JK")
+    assert load_state(store, "BBCA.JK").rows == 690
+
+    source.frames["BBCA.JK"] = full
+    store.get("BBCA.JK")
+    row = update_indicators(store, "BBCA.JK")
+
+    assert load_state(store, "BBCA.JK").rows == 700
+    _assert_row_matches(row, add_indicators(full.copy()).iloc[-1])
+
+    # A re-adjusted history invalidates the persisted state
+    adjusted = full.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.95
+    store.write("BBCA.JK", adjusted)
+    row = update_indicators(store, "BBCA.JK")
+    assert row["Close"] == adjusted["Close"].iloc[-1]
+    _assert_row_matches(row, add_indicators(adjusted.copy()).iloc[-1])
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from indicators import kernels
+from indicators.technical import add_indicators
+
+
+def test_add_indicators_matches_ta_reference(ohlcv):
+    pytest.importorskip("ta")
+    from scripts.benchmark_indicators import add_indicators_ta
+
+    df = ohlcv(n=1500, seed=2)
+    df.iloc[100:120, df.columns.get_loc("Volume")] = 0.0
+    new, ref = add_indicators(df.copy()), add_indicators_ta(df.copy())
+
+    assert list(new.columns) == list(ref.columns)
+    for col in ref.columns:
+        if ref[col].dtype == bool or ref[col].dtype.kind == "i":
+            assert (new[col].to_numpy() == ref[col].to_numpy()).all(), col
+        else:
+            np.testing.assert_allclose(new[col], ref[col], rtol=1e-9, atol=1e-8, err_msg=col)
+
+
+def test_panel_columns_match_single_series(ohlcv):
+    frames = [ohlcv(n=900, seed=s) for s in range(3)]
+    high, low, close, volume = (np.column_stack([f[c].to_numpy() for f in frames])
+                                for c in ("High", "Low", "Close", "Volume"))
+    # Third ticker lists 300 bars later
+    for arr in (high, low, close, volume):
+        arr[:300, 2] = np.nan
+
+    panel = kernels.indicator_columns(high, low, close, volume)
+    for j in range(3):
+        lead = 300 if j == 2 else 0
+        single = kernels.indicator_columns(high[lead:, j], low[lead:, j], close[lead:, j], volume[lead:, j])
+        for col, values in single.items():
+            np.testing.assert_allclose(panel[col][lead:, j].astype(float), values.astype(float),
+                                       rtol=1e-12, atol=1e-9, err_msg=f"{col}[{j}]")
+
+
+def test_ewm_gap_falls_back_to_pandas():
+    import pandas as pd
+
+    x = np.linspace(1.0, 2.0, 60)
+    x[[0, 1, 30]] = np.nan
+    expected = pd.Series(x).ewm(span=10, adjust=False, min_periods=10).mean().to_numpy()
+    np.testing.assert_allclose(kernels.ema(x, 10), expected, rtol=1e-12)
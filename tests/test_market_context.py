@@ -0,0 +1,27 @@
+from data import fetcher, market_context
+from data.price_store import FrameSource, PriceStore
+from indicators.technical import add_indicators
+
+
+def test_context_fetches_and_computes_indicators_once(tmp_path, ohlcv, monkeypatch):
+    source = FrameSource({"BBCA.JK": ohlcv(n=2600)})
+    monkeypatch.setattr(fetcher, "_store", PriceStore(root=tmp_path, source=source))
+    passes = []
+    monkeypatch.setattr(market_context, "add_indicators", lambda df: passes.append(1) or add_indicators(df))
+    monkeypatch.setitem(market_context.DATA_CONFIG, "LOOKBACK_PERIOD", "1y")
+
+    market = market_context.MarketDataContext("BBCA")
+    lookback = market.frame()
+    pattern = market.frame("5y")
+
+    assert len(source.calls) == 1 and len(passes) == 1
+    assert market.longest == "5y"
+    assert len(lookback) < len(pattern)
+    assert lookback.index[-1] == pattern.index[-1]
+    assert "ema200" in lookback.columns and "ema200" not in market.prices().columns
+
+
+def test_context_without_data_returns_none(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetcher, "_store", PriceStore(root=tmp_path, source=FrameSource()))
+    market = market_context.MarketDataContext("NODATA")
+    assert market.prices() is None and market.frame("5y") is None
@@ -0,0 +1,37 @@
+import numpy as np
+
+from engine.decision import decision_engine, decision_engine_panel
+from indicators.technical import add_indicators, add_indicators_panel, build_panel
+
+
+def test_panel_decisions_match_per_ticker_engine(ohlcv):
+    frames = {
+        "BBCA": ohlcv(n=900, seed=1),
+        "BBRI": ohlcv(n=700, seed=2, start="2015-10-01"),   # lists later
+        "TLKM": ohlcv(n=900, seed=3).iloc[:-2],             # stale by two bars
+    }
+    gappy = ohlcv(n=900, seed=4)
+    frames["ANTM"] = gappy.drop(gappy.index[400:410])       # suspension inside history
+
+    panel = add_indicators_panel(build_panel(frames))
+    decisions = decision_engine_panel(panel, reasons=True, meta=True)
+
+    assert sorted(decisions.index) == sorted(frames)
+    for ticker, df in frames.items():
+        expected = decision_engine(add_indicators(df.copy()))
+        row = decisions.loc[ticker]
+        assert row["date"] == df.index[-1]
+        assert (row["signal"], row["score"], row["confidence"]) == (
+            expected["signal"], expected["score"], expected["confidence"])
+        assert row["reasons"] == expected["reasons"]
+        assert row["meta"] == expected["meta"]
+
+
+def test_panel_columns_align_with_add_indicators(ohlcv):
+    frames = {"A": ohlcv(n=300, seed=5), "B": ohlcv(n=300, seed=6)}
+    panel = add_indicators_panel(build_panel(frames))
+    single = add_indicators(frames["B"].copy())
+
+    for col in single.columns:
+        np.testing.assert_allclose(panel[col]["B"].astype(float), single[col].astype(float),
+                                   rtol=1e-12, err_msg=col)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from backtest.portfolio import portfolio_backtest, simulate_portfolio
+from backtest.vector_backtest import BUY, OTHER
+
+
+def _book(risk):
+    # Three symbols, ATR 1: B stops out on day 1, A (entered day 1) hits its target on day 2
+    close = np.array([[10.0, 10.0, 10.0], [10.0, 8.0, 10.0], [13.0, 8.0, 10.0]])
+    codes = np.full(close.shape, OTHER, dtype=np.int8)
+    codes[0] = BUY
+    codes[1, :2] = BUY
+    score = np.array([[5.0, 7.0, 6.0]] * 3)
+    return simulate_portfolio(close, np.ones_like(close), codes, score, initial_capital=100,
+                              cost_pct=0.0, risk={"MAX_CONCURRENT_POSITIONS": 2, "MAX_POSITION_SIZE_PCT": 50,
+                                                  **risk})
+
+
+def test_slots_sizing_and_atr_exits():
+    sim = _book({"MAX_DAILY_LOSS_PCT": 50})
+    # Day 0: two slots go to the best scores (B, C); A waits for the slot B frees
+    assert sim["column"].tolist() == [1, 0]
+    assert sim["entry_idx"].tolist() == [0, 1] and sim["exit_idx"].tolist() == [1, 2]
+    assert sim["exit_price"].tolist() == [8.0, 13.0]
+    # A's budget is 50% of equity (45) but only the 40 of cash left by B's exit is available
+    assert sim["equity"].tolist() == [100.0, 90.0, 52.0 + 50.0]
+    assert sim["positions"].tolist() == [2, 2, 1] and sim["open"].tolist() == [2]
+
+
+def test_daily_loss_breaker_blocks_entries():
+    sim = _book({"MAX_DAILY_LOSS_PCT": 2})
+    assert sim["halted"].tolist() == [False, True, False]
+    assert sim["column"].tolist() == [1]
+    assert sim["equity"][-1] == 90.0
+
+
+def test_portfolio_backtest_respects_limits(ohlcv):
+    frames = {f"S{i}": ohlcv(n=800, seed=i) for i in range(6)}
+    frames["LATE"] = ohlcv(n=400, seed=9, start="2016-06-01")
+    result = portfolio_backtest(frames, risk={"MAX_CONCURRENT_POSITIONS": 3})
+    ledger, report = result["ledger"], result["report"]
+
+    assert len(ledger) > 0 and set(ledger.symbols) <= set(frames)
+    assert result["positions"].max() <= 3 == report["max_concurrent_positions"]
+    assert (ledger.holding_bars > 0).all()
+    late = ledger.symbols == "LATE"
+    assert (ledger.entry_dates[late] > frames["LATE"].index[50]).all()
+    # One position per symbol at a time
+    for symbol in set(ledger.symbols):
+        own = np.flatnonzero(ledger.symbols == symbol)
+        assert (ledger.entry_idx[own][1:] >= ledger.exit_idx[own][:-1]).all()
+    assert result["curve"].equity[-1] * 100_000_000 == pytest.approx(report["final_equity"])
+    assert 0 < report["equity"]["exposure_pct"] <= 3 * 5.0 + 0.5
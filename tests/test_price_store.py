@@ -0,0 +1,84 @@
+import time
+
+import pandas as pd
+
+from data import fetcher
+from data.price_store import FrameSource, PriceStore, slice_period
+
+
+def _store(tmp_path, frames, **kwargs):
+    source = FrameSource(frames)
+    return PriceStore(root=tmp_path, source=source, history_period="10y", **kwargs), source
+
+
+def test_seed_once_then_serve_lookbacks_locally(tmp_path, ohlcv):
+    full = ohlcv(n=2600)
+    store, source = _store(tmp_path, {"BBCA.JK": full})
+
+    df_10y = store.get("BBCA.JK", "10y")
+    df_1y = store.get("BBCA.JK", "1y")
+    df_5y = store.get("BBCA.JK", "5y")
+
+    assert len(source.calls) == 1 and source.calls[0]["period"] == "10y"
+    assert df_1y.index[-1] == df_10y.index[-1] == full.index[-1]
+    assert len(df_1y) < len(df_5y) < len(df_10y)
+    pd.testing.assert_frame_equal(df_5y, slice_period(df_10y, "5y"))
+    assert df_10y["Close"].equals(slice_period(full, "10y")["Close"])
+
+
+def test_stale_symbol_fetches_only_new_bars(tmp_path, ohlcv):
+    full = ohlcv(n=800)
+    store, source = _store(tmp_path, {"BBRI.JK": full.iloc[:700]}, refresh_minutes=0)
+    store.get("BBRI.JK", "10y")
+
+    source.frames["BBRI.JK"] = full
+    df = store.get("BBRI.JK", "10y")
+
+    assert source.calls[-1]["start"] == full.index[699]
+    assert len(df) == 800
+    assert store.last_date("BBRI.JK") == full.index[-1].strftime("%Y-%m-%d")
+
+
+def test_readjusted_history_triggers_reseed(tmp_path, ohlcv):
+    full = ohlcv(n=500)
+    store, source = _store(tmp_path, {"TLKM.JK": full.iloc[:400]}, refresh_minutes=0)
+    store.get("TLKM.JK")
+
+    adjusted = full.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.97  # e.g. dividend adjustment upstream
+    source.frames["TLKM.JK"] = adjusted
+    df = store.get("TLKM.JK")
+
+    assert source.calls[-1]["period"] == "10y"
+    assert df["Close"].iloc[0] == adjusted["Close"].iloc[0]
+
+
+def test_fetch_eod_uses_pluggable_store(tmp_path, ohlcv, monkeypatch):
+    store, source = _store(tmp_path, {"BBCA.JK": ohlcv(n=300), "COIN": ohlcv(n=300, seed=4)})
+    monkeypatch.setattr(fetcher, "_store", store)
+
+    assert len(fetcher.fetch_eod("BBCA")) > 0
+    assert len(fetcher.fetch_eod("COIN", is_us=True)) > 0
+    assert fetcher.fetch_eod("MISSING") is None
+
+    start = time.perf_counter()
+    fetcher.fetch_eod("BBCA", use_5y=True)
+    assert time.perf_counter() - start < 0.05
+    assert [c["symbol"] for c in source.calls] == ["BBCA.JK", "COIN", "MISSING.JK"]
+
+
+def test_fetch_eod_batch_groups_upstream_requests(tmp_path, ohlcv, monkeypatch):
+    frames = {f"{t}.JK": ohlcv(n=300, seed=i) for i, t in enumerate(["BBCA", "BBRI", "BMRI"])}
+    store, source = _store(tmp_path, frames)
+    monkeypatch.setattr(fetcher, "_store", store)
+
+    got, errors = fetcher.fetch_eod_batch(["BBCA", "BBRI", "BMRI", "MISSING"], period="10y")
+
+    assert sorted(got) == ["BBCA", "BBRI", "BMRI"]
+    assert list(errors) == ["MISSING"]
+    assert len(source.batches) == 1 and len(source.batches[0]["symbols"]) == 4
+    assert got["BBRI"]["Close"].equals(frames["BBRI.JK"]["Close"])
+
+    # Second call is served entirely from the store
+    fetcher.fetch_eod_batch(["BBCA", "BMRI"])
+    assert len(source.batches) == 1
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from api.responses import FastJSONResponse, dumps, fast_route
+
+
+def test_dumps_numpy_pandas_and_nan():
+    payload = {
+        "int32": np.int32(7),
+        "float": np.float64(1.5),
+        "bool": np.bool_(True),
+        "array": np.arange(3),
+        "when": pd.Timestamp("2026-01-05"),
+        "missing": pd.NaT,
+        "nested": [{"nan": float("nan"), "inf": np.float32("inf")}],
+        np.int64(3): "numpy key",
+    }
+    assert json.loads(dumps(payload)) == {
+        "int32": 7, "float": 1.5, "bool": True, "array": [0, 1, 2],
+        "when": "2026-01-05T00:00:00", "missing": None,
+        "nested": [{"nan": None, "inf": None}], "3": "numpy key",
+    }
+
+
+def test_endpoint_returns_fast_response():
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/report")
+    def report():
+        # numpy.int32 used to break jsonable_encoder in /analysis
+        return FastJSONResponse({"trades": np.int32(12), "returns": np.array([0.1, np.nan])})
+
+    resp = TestClient(app).get("/report")
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == {"trades": 12, "returns": [0.1, None]}
+
+
+def test_fast_route_keeps_the_function_a_plain_payload():
+    router = APIRouter()
+
+    @fast_route(router.get("/trades/{symbol}"))
+    def trades(symbol: str, limit: int = 2):
+        return {"symbol": symbol, "pnl": np.arange(limit) * 1.5}
+
+    app = FastAPI()
+    app.include_router(router)
+    resp = TestClient(app).get("/trades/BBCA?limit=3")
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == {"symbol": "BBCA", "pnl": [0.0, 1.5, 3.0]}
+    # Direct callers (app_b2c V1 routes, scripts) still get the dict
+    assert json.loads(dumps(trades("BBRI"))) == {"symbol": "BBRI", "pnl": [0.0, 1.5]}
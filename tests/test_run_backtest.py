@@ -0,0 +1,42 @@
+import pandas as pd
+
+from backtest.report import summarize
+from backtest.vector_backtest import vector_backtest
+from engine import decision
+from indicators.technical import add_indicators
+
+from scripts.run_backtest import backtest_many, backtest_symbol, prepare_backtest, report_symbol
+
+
+def test_parallel_records_match_sequential_in_symbol_order(ohlcv):
+    frames = {f"S{i}": ohlcv(n=900, seed=20 + i) for i in range(4)}
+    symbols = ["S3", "MISSING", "S1", "S0", "S2"]
+    serial = backtest_many(frames, symbols, workers=1)
+    parallel = backtest_many(frames, symbols, workers=3)
+
+    assert [r["symbol"] for r in parallel] == ["S3", "S1", "S0", "S2"]
+    for a, b in zip(serial, parallel):
+        assert a["trades"] == b["trades"]
+        assert a["report"] == b["report"]
+        assert a["error"] is None and b["seconds"] >= 0
+
+
+def test_failures_come_back_as_records(capsys):
+    record = backtest_symbol("BAD", pd.DataFrame({"Close": [1.0, 2.0]}))
+    assert record["symbol"] == "BAD" and record["trades"] == []
+    assert record["error"].startswith("KeyError")
+    assert report_symbol(record) is None
+    assert "Backtest failed for BAD" in capsys.readouterr().out
+
+
+def test_headline_is_the_long_book_with_shorts_beside_it(ohlcv, monkeypatch):
+    monkeypatch.setitem(decision.SIGNAL_CONFIG, "SHORT_THRESHOLD", -4.0)  # make shorts fire
+    df = ohlcv(n=1200, seed=5)
+    record = backtest_symbol("S", df)
+    longs = vector_backtest(prepare_backtest(add_indicators(df)))
+
+    report = record["report"]
+    assert record["trades"] == longs
+    assert {k: v for k, v in report.items() if k not in ("equity", "by_direction")} == summarize(longs)
+    assert report["by_direction"]["LONG"]["total_trades"] == len(longs)
+    assert report["by_direction"]["SHORT"]["total_trades"] > 0
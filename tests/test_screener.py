@@ -0,0 +1,100 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from data import fetcher
+from data.price_store import FrameSource, PriceStore
+from engine import screener
+from engine.decision import decision_engine
+from indicators.technical import add_indicators
+
+UNIVERSE = {
+    "BBCA": {"is_us": False, "name": "Bank Central Asia", "sector": "Banking"},
+    "BBRI": {"is_us": False, "name": "Bank Rakyat Indonesia", "sector": "Banking"},
+    "ANTM": {"is_us": False, "name": "Aneka Tambang", "sector": "Mining"},
+    "NVDA": {"is_us": True, "name": "NVIDIA", "sector": "Technology"},
+    "GONE": {"is_us": False, "name": "Delisted", "sector": "Other"},
+}
+
+
+@pytest.fixture
+def table(tmp_path, ohlcv, monkeypatch):
+    frames = {"BBCA.JK": ohlcv(n=800, seed=1), "BBRI.JK": ohlcv(n=800, seed=2),
+              "ANTM.JK": ohlcv(n=800, seed=3), "NVDA": ohlcv(n=800, seed=4)}
+    source = FrameSource(frames)
+    monkeypatch.setattr(fetcher, "_store", PriceStore(root=tmp_path / "store", source=source))
+    t = screener.SignalTable(path=tmp_path / "table.json",
+                             builder=lambda: screener.build_signal_table(UNIVERSE, period="10y"))
+    t.refresh()
+    return t, frames, source
+
+
+def test_table_rows_match_decision_engine(table):
+    t, frames, source = table
+    snap = t.snapshot
+    assert [r["symbol"] for r in snap["rows"]] == ["ANTM", "BBCA", "BBRI", "NVDA"]
+    assert list(snap["errors"]) == ["GONE"]
+    assert len(source.batches) == 2  # one grouped fetch per market
+
+    for row in snap["rows"]:
+        key = row["symbol"] if row["is_us"] else f"{row['symbol']}.JK"
+        expected = decision_engine(add_indicators(frames[key].copy()))
+        assert (row["signal"], row["score"], row["confidence"]) == (
+            expected["signal"], expected["score"], expected["confidence"])
+
+
+def test_query_filters_and_sorts(table):
+    t, _, _ = table
+    rows = t.snapshot["rows"]
+
+    banking = t.query(sector="banking", sort="symbol", order="asc")
+    assert [r["symbol"] for r in banking["results"]] == ["BBCA", "BBRI"]
+
+    by_score = t.query(sort="score", order="desc")["results"]
+    assert [r["score"] for r in by_score] == sorted((r["score"] for r in rows), reverse=True)
+
+    some_signal = rows[0]["signal"]
+    assert all(r["signal"] == some_signal for r in t.query(signal=some_signal.lower())["results"])
+
+    lo = min(r["score"] for r in rows)
+    assert t.query(min_score=lo, max_score=lo)["count"] == sum(r["score"] == lo for r in rows)
+    assert t.query(limit=2)["count"] == 2
+
+    with pytest.raises(ValueError):
+        t.query(sort="volume")
+
+
+def test_table_survives_restart_and_failed_refresh(table, tmp_path):
+    t, _, _ = table
+    reloaded = screener.SignalTable(path=t.path, builder=lambda: ([], {"BBCA": "timeout"}))
+    assert reloaded.snapshot["rows"] == t.snapshot["rows"]
+    reloaded.refresh()  # empty build keeps the previous table
+    assert reloaded.query()["total"] == 4
+
+
+def test_screener_endpoint(table, monkeypatch):
+    t, _, _ = table
+    monkeypatch.setattr(main, "get_signal_table", lambda: t)
+    client = TestClient(main.app)
+
+    resp = client.get("/screener", params={"sector": "Banking", "sort": "confidence"})
+    assert resp.status_code == 200
+    assert {r["symbol"] for r in resp.json()["results"]} == {"BBCA", "BBRI"}
+    assert client.get("/screener", params={"order": "sideways"}).status_code == 400
+
+    empty = screener.SignalTable(path=t.path.with_name("missing.json"))
+    monkeypatch.setattr(main, "get_signal_table", lambda: empty)
+    assert client.get("/screener").status_code == 503
+
+
+def test_refresh_schedule_skips_weekends():
+    jkt = ZoneInfo("Asia/Jakarta")
+    friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=jkt)
+    assert screener.next_refresh_time(friday_evening, "16:30", "Asia/Jakarta") == \
+        datetime(2026, 10, 19, 16, 30, tzinfo=jkt)
+    sunday = datetime(2026, 10, 18, 12, 0, tzinfo=jkt)
+    assert screener.last_refresh_time(sunday, "16:30", "Asia/Jakarta") == \
+        datetime(2026, 10, 16, 16, 30, tzinfo=jkt)
@@ -0,0 +1,109 @@
+import time
+
+import numpy as np
+import pytest
+
+import engine.signal_service as signal_service
+from engine.cache import TieredCache
+
+
+def test_lru_eviction_by_bytes_and_ttl():
+    cache = TieredCache(max_bytes=3000, ttl=0.2)
+    for key in "abc":
+        cache.put(key, np.zeros(100))  # 800 bytes each
+    assert cache.get("a") is not None  # a is now most recently used
+    cache.put("d", np.zeros(100))
+    assert cache.get("b") is None and cache.get("a") is not None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 3 and stats["bytes"] == 2400
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+    time.sleep(0.25)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+    cache.put("big", np.zeros(1000))  # larger than the whole budget: not kept
+    assert cache.get("big") is None
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    first = TieredCache(max_bytes=10_000, ttl=60, disk_dir=tmp_path)
+    first.put(("BBCA", False, "10y", "2026-01-02"), {"signal": "BUY"})
+
+    second = TieredCache(max_bytes=10_000, ttl=60, disk_dir=tmp_path)
+    assert second.get(("BBCA", False, "10y", "2026-01-02")) == {"signal": "BUY"}
+    assert second.stats()["disk_hits"] == 1
+    assert second.get(("BBCA", False, "10y", "2026-01-02")) == {"signal": "BUY"}
+    assert second.stats()["hits"] == 1  # promoted to memory
+
+    second.pop(("BBCA", False, "10y", "2026-01-02"))
+    assert TieredCache(disk_dir=tmp_path, ttl=60).get(("BBCA", False, "10y", "2026-01-02")) is None
+
+
+@pytest.fixture
+def service(monkeypatch, ohlcv):
+    """signal_service wired to a fake store whose last bar the test controls."""
+    frame = ohlcv(n=400, seed=9)
+    state = {"frame": frame.iloc[:-1], "fetches": 0, "upstream": None, "syncs": 0}
+
+    class Store:
+        def last_date(self, symbol):
+            return state["frame"].index[-1].strftime("%Y-%m-%d")
+
+        def needs_sync(self, symbol, period=None):
+            return state["upstream"] is not None
+
+        def sync_many(self, symbols, period=None):
+            state["syncs"] += 1
+            state["frame"], state["upstream"] = state["upstream"], None
+            return {}
+
+    def fake_fetch_eod(ticker, use_5y=False, is_us=False, period=None):
+        state["fetches"] += 1
+        return state["frame"].copy()
+
+    monkeypatch.setattr(signal_service, "get_price_store", lambda: Store())
+    monkeypatch.setattr(signal_service, "fetch_eod", fake_fetch_eod)
+    signal_service.set_signal_cache(TieredCache(max_bytes=64 * 1024 * 1024, ttl=60))
+    yield state, frame
+    signal_service.set_signal_cache(None)
+
+
+def test_repeat_requests_skip_pandas(service, monkeypatch):
+    state, _ = service
+    first = signal_service.latest_signal("BBCA")
+    assert state["fetches"] == 1
+
+    def no_pandas(*args, **kwargs):
+        raise AssertionError("cache hit should not recompute")
+
+    monkeypatch.setattr(signal_service, "add_indicators", no_pandas)
+    monkeypatch.setattr(signal_service, "fetch_eod", no_pandas)
+    assert signal_service.latest_signal("BBCA") is first
+    assert signal_service.cached_signal("BBCA") is first
+    assert signal_service.get_signal_cache().stats()["hits"] == 2
+
+
+def test_new_bar_invalidates(service):
+    state, frame = service
+    old = signal_service.latest_signal("BBCA")
+    state["frame"] = frame  # a new bar lands in the store
+    assert signal_service.cached_signal("BBCA") is None
+
+    new = signal_service.latest_signal("BBCA")
+    assert state["fetches"] == 2
+    assert new["as_of"] == frame.index[-1].strftime("%Y-%m-%d") != old["as_of"]
+    assert new["close"] == pytest.approx(frame["Close"].iloc[-1])
+    assert len(signal_service.get_signal_cache()) == 1  # the superseded entry was dropped
+
+
+def test_hit_syncs_the_store_before_keying(service):
+    state, frame = service
+    old = signal_service.latest_signal("BBCA")
+    assert signal_service.latest_signal("BBCA") is old and state["syncs"] == 0
+
+    state["upstream"] = frame  # upstream has a new bar the store has not fetched yet
+    new = signal_service.latest_signal("BBCA")
+    assert state["syncs"] == 1 and state["fetches"] == 2
+    assert new["as_of"] == frame.index[-1].strftime("%Y-%m-%d") != old["as_of"]
@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import engine.signal_service as signal_service
+from engine.singleflight import SingleFlight, flight_stats, get_group
+
+
+def _run_concurrently(n, fn):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(fn) for _ in range(n)]
+        return [f.result() for f in futures]
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    runs = []
+
+    def work():
+        runs.append(1)
+        time.sleep(0.2)
+        return {"value": 42}
+
+    results = _run_concurrently(8, lambda: flight.do("BBCA", work))
+    assert len(runs) == 1
+    assert all(r is results[0] for r in results)
+    stats = flight.stats()
+    assert stats["calls"] == 8 and stats["executions"] == 1 and stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+
+    # Nothing is cached once the flight lands
+    flight.do("BBCA", work)
+    assert len(runs) == 2
+
+
+def test_errors_reach_every_waiter_and_keys_are_independent():
+    flight = SingleFlight("errors")
+    started = threading.Event()
+
+    def boom():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    def call():
+        try:
+            flight.do("X", boom)
+        except RuntimeError as e:
+            return str(e)
+
+    assert _run_concurrently(4, call) == ["upstream down"] * 4
+    assert flight.stats()["errors"] == 1
+
+    assert flight.do("A", lambda: "a") == "a"
+    assert flight.do("B", lambda: "b") == "b"
+
+
+def test_latest_signal_coalesces_fetch_and_indicators(monkeypatch, ohlcv):
+    frame = ohlcv(n=300, seed=7)
+    fetches = []
+
+    def slow_fetch_eod(ticker, use_5y=False, is_us=False, period=None):
+        fetches.append(ticker)
+        time.sleep(0.2)
+        return frame.copy()
+
+    monkeypatch.setattr(signal_service, "fetch_eod", slow_fetch_eod)
+    before = get_group(signal_service.SIGNAL_GROUP).stats()
+
+    results = _run_concurrently(10, lambda: signal_service.latest_signal("ZZZZ"))
+    assert fetches == ["ZZZZ"]
+    assert all(r["decision"] is results[0]["decision"] for r in results)
+    assert results[0]["as_of"] == frame.index[-1].strftime("%Y-%m-%d")
+
+    stats = flight_stats()[signal_service.SIGNAL_GROUP]
+    assert stats["coalesced"] - before["coalesced"] == 9
+
+
+def test_key_includes_as_of_bar(monkeypatch):
+    store = type("Store", (), {"last_date": lambda self, symbol: "2026-01-02"})()
+    monkeypatch.setattr(signal_service, "get_price_store", lambda: store)
+    assert signal_service.signal_key("BBCA") == ("BBCA", False, "1y", "2026-01-02")
+    assert signal_service.signal_key("COIN", is_us=True, period="5y")[:3] == ("COIN", True, "5y")
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import api.b2c_endpoints as b2c
+import data.enhanced_fundamentals as enhanced_fundamentals
+import engine.signal_service as signal_service
+from config import API_CONFIG
+
+
+@pytest.fixture
+def app(monkeypatch, ohlcv):
+    frame = ohlcv(n=300, seed=5)
+
+    def slow_fetch_eod(ticker, use_5y=False, is_us=False, period=None):
+        time.sleep(0.3)  # a blocking Yahoo round trip
+        return frame.copy()
+
+    monkeypatch.setattr(signal_service, "fetch_eod", slow_fetch_eod)
+    monkeypatch.setattr(enhanced_fundamentals, "fetch_fundamental_data", lambda ticker: None)
+    app = FastAPI()
+    b2c.setup_b2c_routes(app)
+    return app
+
+
+def _post_many(app, n):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/api/v2/stock/info", json={"ticker": "BBCA"}) for _ in range(n)
+            ))
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_do_not_serialize_on_the_event_loop(app):
+    started = time.perf_counter()
+    responses = _post_many(app, 8)
+    elapsed = time.perf_counter() - started
+
+    assert all(r.status_code == 200 for r in responses)
+    assert responses[0].json()["trading_signal"]["signal"] in ("BUY", "SELL", "HOLD", "SHORT")
+    # Blocking in the event loop would take 8 x 0.3s
+    assert elapsed < 1.5
+
+
+def test_slow_leg_returns_partial_result(app, monkeypatch):
+    release = threading.Event()
+
+    def stuck_fundamentals(ticker):
+        release.wait(5)
+        return None
+
+    monkeypatch.setattr(enhanced_fundamentals, "fetch_fundamental_data", stuck_fundamentals)
+    monkeypatch.setitem(API_CONFIG, "FUNDAMENTAL_TIMEOUT_SECONDS", 0.5)
+    try:
+        started = time.perf_counter()
+        (response,) = _post_many(app, 1)
+        elapsed = time.perf_counter() - started
+    finally:
+        release.set()
+
+    body = response.json()
+    assert response.status_code == 200 and elapsed < 2
+    assert body["technical_analysis"] is not None
+    assert body["fundamental_analysis"] is None
+    assert body["metadata"]["partial"] is True
+    assert body["metadata"]["unavailable"] == {"fundamental": "timeout"}
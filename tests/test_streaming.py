@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.streaming import seed_from_snapshot, setup_stream_routes, sse_stream
+from engine import broadcast, eod_pipeline, signal_service
+from engine.broadcast import BroadcastHub
+
+
+def _state(signal="HOLD", score=1.0, close=100.0, as_of="2026-01-05"):
+    return {"signal": signal, "score": score, "confidence": 0.55, "close": close,
+            "prev_close": 98.0, "as_of": as_of}
+
+
+@pytest.fixture
+def hub(tmp_path):
+    hub = BroadcastHub(queue_size=4)
+    broadcast.set_hub(hub)
+    eod_pipeline.set_eod_pipeline(eod_pipeline.EODPipeline(universe={}, path=tmp_path / "snapshot.json"))
+    yield hub
+    broadcast.set_hub(None)
+    eod_pipeline.set_eod_pipeline(None)
+
+
+def test_websocket_pushes_changes_only(hub):
+    app = FastAPI()
+    setup_stream_routes(app)
+    hub.publish("BBCA", _state())
+
+    with TestClient(app).websocket_connect("/ws/signals?tickers=bbca") as ws:
+        assert ws.receive_json()["ticker"] == "BBCA"  # latest state on subscribe
+        assert ws.receive_json() == {"type": "subscribed", "tickers": ["BBCA"]}
+
+        assert hub.publish("BBCA", _state()) is False  # unchanged: nothing sent
+        hub.publish("BBRI", _state("BUY"))              # not subscribed
+        hub.publish("BBCA", _state("BUY", score=4.5, close=103.0))
+        update = ws.receive_json()
+        assert (update["signal"], update["close"], update["change_pct"]) == ("BUY", 103.0, 5.1)
+
+        ws.send_json({"action": "subscribe", "tickers": ["BBRI"]})
+        assert ws.receive_json()["ticker"] == "BBRI"
+        assert ws.receive_json()["tickers"] == ["BBCA", "BBRI"]
+
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_signal_listener_and_sse_serialize_once(hub):
+    async def run():
+        disconnected = asyncio.Event()
+        streams = [sse_stream(["BBCA"], lambda: _is_set(disconnected), hub=hub, heartbeat=1.0)
+                   for _ in range(3)]
+        first = [asyncio.ensure_future(s.__anext__()) for s in streams]
+        await asyncio.sleep(0.01)
+        assert not any(f.done() for f in first)  # subscribed, nothing to send yet
+
+        computed = {"as_of": "2026-01-05", "close": 101.0, "prev_close": 100.0,
+                    "decision": {"signal": "BUY", "score": 5.0, "confidence": 0.75}}
+        signal_service._notify_listeners("BBCA", computed)
+        frames = [await f for f in first]
+        disconnected.set()
+        for s in streams:
+            await s.aclose()
+        return frames
+
+    frames = asyncio.run(run())
+    assert frames[0].startswith("event: signal\ndata: ")
+    assert json.loads(frames[0].split("data: ", 1)[1])["signal"] == "BUY"
+    assert frames[0] is frames[1] is frames[2]  # one serialized message shared by every client
+    assert hub.stats()["subscribers"] == 0
+
+
+async def _is_set(event):
+    return event.is_set()
+
+
+def test_slow_subscriber_drops_oldest(hub):
+    async def run():
+        sub = hub.subscribe(["BBCA"])
+        for i in range(10):
+            hub.publish("BBCA", _state(score=float(i)))
+        await asyncio.sleep(0)  # let the loop run the delivery callbacks
+        got = [sub.queue.get_nowait().data["score"] for _ in range(sub.queue.qsize())]
+        hub.unsubscribe(sub)
+        return got, sub.dropped
+
+    got, dropped = asyncio.run(run())
+    assert got == [6.0, 7.0, 8.0, 9.0] and dropped == 6
+
+
+def test_snapshot_seed_is_dated_and_deduplicated(hub):
+    eod_pipeline.get_eod_pipeline()._snapshot = {"signals": {"BBCA": {
+        "signal": "BUY", "score": 5.0, "confidence": 0.75, "reasons": [], "meta": {},
+        "date": "2026-01-05", "close": 101.0, "prev_close": 100.0,
+    }}}
+    seed_from_snapshot(hub, ["BBCA", "BBRI"])
+    seeded = hub._last["BBCA"].data
+    assert seeded["as_of"] == "2026-01-05" and "BBRI" not in hub._last
+
+    # The live recompute of the same bar is not re-pushed; an older bar is ignored
+    computed = {"as_of": "2026-01-05", "close": 101.0, "prev_close": 100.0,
+                "decision": {"signal": "BUY", "score": 5.0, "confidence": 0.75}}
+    hub.publish_signal("BBCA", computed)
+    assert hub.publish("BBCA", _state(as_of="2026-01-02")) is False
+    assert hub.stats()["published"] == 1
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from backtest.report import summarize
+from backtest.sweep import (GRID_KEYS, classify_codes, default_grid, grid_points, rank_results,
+                            run_sweep, style_labels)
+from backtest.vector_backtest import SKIP, encode_signals, vector_backtest
+from config import SIGNAL_CONFIG
+from engine.decision import decision_scores
+from indicators.technical import add_indicators
+from scripts.run_backtest import prepare_backtest
+
+
+def test_classify_codes_matches_engine_signals(ohlcv):
+    df = prepare_backtest(add_indicators(ohlcv(n=900, seed=3)))
+    codes = classify_codes(decision_scores(df), SIGNAL_CONFIG["BUY_THRESHOLD"],
+                           SIGNAL_CONFIG["SELL_THRESHOLD"], SIGNAL_CONFIG["SHORT_THRESHOLD"], warmup=50)
+    # Warmup rows are SKIP here; no position can be open before the first BUY either way
+    assert (codes[:50] == SKIP).all()
+    assert np.array_equal(codes[50:], encode_signals(df["signal"])[50:])
+
+
+def test_default_grid_point_matches_run_backtest(ohlcv):
+    frames = {f"S{i}": ohlcv(n=1500, seed=i) for i in range(3)}
+    grid = {"buy_threshold": [4.0, 5.0], "sell_threshold": [-0.5], "short_threshold": [-7.0],
+            "stop_pct": [0.05], "target_pct": [0.10]}
+    table = run_sweep(frames, grid, workers=1, min_trades=0)
+    row = table[(table["buy_threshold"] == 4.0)].iloc[0]
+    assert "default" in row["styles"]
+
+    trades = []
+    for df in frames.values():
+        trades += vector_backtest(prepare_backtest(add_indicators(df.copy())))
+    report = summarize(trades)
+    assert row["total_trades"] == report["total_trades"]
+    assert row["win_rate"] == report["win_rate"]
+    assert row["avg_return_pct"] == pytest.approx(report["avg_return_pct"], abs=0.01)
+    assert row["total_return_pct"] == pytest.approx(report["total_profit_pct"], abs=0.01)
+    assert row["sharpe_ratio"] == pytest.approx(report["sharpe_ratio"], abs=0.01)
+    assert row["profit_factor"] == pytest.approx(report["profit_factor"], abs=0.01)
+    # bar-level equity columns are per-symbol averages of the single-backtest metrics
+    equity = [vector_backtest(prepare_backtest(add_indicators(df.copy())), equity=True)[1].metrics()
+              for df in frames.values()]
+    assert row["avg_exposure_pct"] == pytest.approx(np.mean([m["exposure_pct"] for m in equity]), abs=0.01)
+    assert row["worst_equity_drawdown_pct"] == min(m["max_drawdown_pct"] for m in equity)
+
+
+def test_parallel_matches_in_process(ohlcv):
+    frames = {f"S{i}": ohlcv(n=800, seed=10 + i) for i in range(3)}
+    grid = {"buy_threshold": [3.0, 4.0], "sell_threshold": [-1.0, -0.5], "short_threshold": [-7.0],
+            "stop_pct": [0.05, 0.08], "target_pct": [0.10]}
+    serial = run_sweep(frames, grid, workers=1)
+    parallel = run_sweep(frames, grid, workers=2)
+    assert serial.equals(parallel)
+    assert len(serial) == 8 and serial["rank"].tolist() == list(range(1, 9))
+
+
+def test_grid_and_ranking():
+    grid = default_grid()
+    assert SIGNAL_CONFIG["BUY_THRESHOLD"] in grid["buy_threshold"]
+    assert -0.75 in grid["sell_threshold"]  # swing_trader
+    points = grid_points(grid)
+    assert all(short < sell < buy for buy, sell, short, _, _ in points)
+    assert style_labels(6.5, -0.75, SIGNAL_CONFIG["SHORT_THRESHOLD"]) == "swing_trader"
+
+    import pandas as pd
+    table = pd.DataFrame([(4.0, -0.5, -7.0, 0.05, 0.1, 5, 2.0), (5.0, -0.5, -7.0, 0.05, 0.1, 50, 1.0),
+                          (6.0, -0.5, -7.0, 0.05, 0.1, 40, 1.5)],
+                         columns=GRID_KEYS + ["total_trades", "sharpe_ratio"])
+    ranked = rank_results(table, "sharpe_ratio", min_trades=20)
+    assert ranked["buy_threshold"].tolist() == [6.0, 5.0, 4.0]
+    with pytest.raises(ValueError):
+        rank_results(table, "nope")
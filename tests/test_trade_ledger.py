@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from backtest.ledger import TradeLedger
+from backtest.report import RunningSummary, summarize
+from backtest.simple_backtest import backtest
+from backtest.vector_backtest import vector_backtest
+from indicators.technical import add_indicators
+from scripts.run_backtest import prepare_backtest
+
+
+def test_ledger_matches_trade_dicts(ohlcv):
+    df = prepare_backtest(add_indicators(ohlcv(n=1500, seed=4)))
+    ledger = vector_backtest(df, as_ledger=True)
+    trades = backtest(df)
+
+    assert len(ledger) == len(trades) > 0
+    assert ledger.to_trades() == trades
+    assert (ledger.holding_bars > 0).all()
+    assert summarize(ledger) == summarize(trades)
+
+    pooled = TradeLedger.concat([ledger, TradeLedger.from_trades(trades)])
+    assert len(pooled) == 2 * len(trades)
+    assert pooled.to_trades() == trades + trades
+
+
+def test_summarize_metrics():
+    report = summarize(np.array([2.0, -1.0, -1.5, -0.5, 4.0, -2.0, 3.0]))
+    assert (report["total_trades"], report["wins"], report["losses"]) == (7, 3, 4)
+    assert report["max_consecutive_losses"] == 3
+    assert report["total_profit_pct"] == 4.0
+    # cumulative pnl peaks at 2.0, then falls to -1.0
+    assert report["recovery_factor"] == round(4.0 / 3.0, 2)
+    assert report["profit_factor"] == round(9.0 / 5.0, 2)
+    assert summarize([])["message"] == "No trades generated"
+
+
+def test_running_summary_tracks_batch_report():
+    rng = np.random.default_rng(7)
+    returns = np.round(rng.normal(0.3, 4.0, 500), 2)
+    running = RunningSummary()
+    for i, ret in enumerate(returns, 1):
+        running.update(ret)
+        if i in (1, 2, 50, 500):
+            online, batch = running.summary(), summarize(returns[:i])
+            assert online.keys() == batch.keys()
+            for key, value in batch.items():
+                assert online[key] == pytest.approx(value, abs=0.011), key
+    assert RunningSummary().summary() == summarize([])
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.ledger import LONG_SIDE, SHORT_SIDE
+from backtest.metrics import exposure_series
+from backtest.report import summarize
+from backtest.simple_backtest import backtest
+from backtest.vector_backtest import (BUY, OTHER, SELL, SHORT, SKIP, backtest_arrays, backtest_ledger,
+                                     encode_signals, vector_backtest)
+from scripts.run_backtest import prepare_backtest
+from indicators.technical import add_indicators
+
+
+def _assert_same_trades(df):
+    expected = backtest(df)
+    got = vector_backtest(df)
+    assert len(got) == len(expected)
+    for a, b in zip(got, expected):
+        assert a.keys() == b.keys()
+        for key in b:
+            if isinstance(b[key], float) and np.isnan(b[key]):
+                assert np.isnan(a[key]), key
+            else:
+                assert a[key] == b[key], (key, a, b)
+    return got
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_parity_on_engine_signals(ohlcv, seed):
+    df = prepare_backtest(add_indicators(ohlcv(n=1200, seed=seed)))
+    trades = _assert_same_trades(df)
+    assert trades  # the fixture produces real trades
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_parity_on_random_signals(seed):
+    rng = np.random.default_rng(seed)
+    n = 3000
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.03, n)))
+    signals = rng.choice(np.array(["BUY", "SELL", "HOLD", "SHORT", None], dtype=object), n,
+                         p=[0.05, 0.02, 0.8, 0.03, 0.1])
+    df = pd.DataFrame({"Close": close, "signal": signals}, index=pd.bdate_range("2010-01-01", periods=n))
+    _assert_same_trades(df)
+
+
+def test_edge_cases():
+    index = pd.RangeIndex(12)
+    # exact -5% and +10% boundaries, a BUY on the exit bar (no same-bar re-entry),
+    # NaN signal rows (count as "other"), None rows (skipped) and an open trade at the end
+    close = [100, 100, 95, 95, 100, 110, 110, 50, 100, np.nan, 120, 130]
+    signal = ["BUY", "HOLD", "BUY", "BUY", None, np.nan, "BUY", None, "HOLD", "BUY", "SELL", "BUY"]
+    df = pd.DataFrame({"Close": close, "signal": pd.Series(signal, dtype=object)}, index=index)
+    trades = _assert_same_trades(df)
+    assert [(t["entry_date"], t["exit_date"]) for t in trades] == [(0, 2), (3, 5), (6, 8), (9, 10)]
+
+
+def test_list_cells_and_nan_prices():
+    df = pd.DataFrame({
+        "Close": [10.0, np.nan, 10.5, 12.0, 9.0, 9.0],
+        "signal": [["HOLD", "BUY"], "HOLD", np.array(["SELL"]), "BUY", (), "SELL"],
+    })
+    _assert_same_trades(df)
+
+
+def test_encode_signals():
+    codes = encode_signals(["BUY", "SELL", "HOLD", None, np.nan, ["x", "BUY"], "SHORT"])
+    assert codes.tolist() == [BUY, SELL, OTHER, SKIP, OTHER, BUY, SHORT]
+
+
+def test_custom_stop_and_target():
+    codes = np.array([BUY, OTHER, OTHER, OTHER], dtype=np.int8)
+    prices = np.array([100.0, 97.0, 103.0, 90.0])
+    assert backtest_arrays(codes, prices, stop_pct=0.02)[0]["exit_date"] == 1
+    assert backtest_arrays(codes, prices, stop_pct=0.2, target_pct=0.03)[0]["exit_date"] == 2
+
+
+def test_short_book_mirrors_the_long_rules():
+    codes = np.array([SHORT, OTHER, OTHER, SHORT, BUY, OTHER, OTHER, SHORT, OTHER], dtype=np.int8)
+    prices = np.array([100.0, 97.0, 89.0, 95.0, 100.0, 106.0, 90.0, 100.0, 105.0])
+    ledger = backtest_ledger(codes, prices, short=True)
+    # short target (-11%), BUY covers the second short and opens a long, short stop (+5%)
+    assert list(zip(ledger.entry_idx, ledger.exit_idx)) == [(0, 2), (3, 4), (4, 6), (7, 8)]
+    assert [t["direction"] for t in ledger.to_trades()] == ["SHORT", "SHORT", "LONG", "SHORT"]
+    assert ledger.return_pct.tolist() == [11.0, -5.26, -10.0, -5.0]
+    # Without the -11% target the first short runs until the BUY on bar 4 covers it
+    assert backtest_ledger(codes, prices, short=True, short_target_pct=0.2).exit_idx[0] == 4
+
+    report = summarize(ledger)
+    assert report["by_direction"]["SHORT"]["total_trades"] == 3
+    assert report["by_direction"]["LONG"]["total_profit_pct"] == -10.0
+    assert summarize(ledger.to_trades()) == report
+
+
+def test_short_book_leaves_long_trades_unchanged():
+    rng = np.random.default_rng(3)
+    n = 3000
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.03, n)))
+    signals = rng.choice(np.array(["BUY", "SELL", "HOLD", "SHORT", None], dtype=object), n,
+                         p=[0.05, 0.02, 0.8, 0.03, 0.1])
+    df = pd.DataFrame({"Close": close, "signal": signals}, index=pd.bdate_range("2010-01-01", periods=n))
+
+    ledger, curve = vector_backtest(df, as_ledger=True, equity=True, short=True, cost_pct=0.0)
+    longs, shorts = ledger.side(LONG_SIDE), ledger.side(SHORT_SIDE)
+    assert len(shorts) > 0
+    assert [{k: v for k, v in t.items() if k != "direction"} for t in longs.to_trades()] == backtest(df)
+    # Shorts are marked as -1 exposure while open (netted against an open long)
+    expected = (exposure_series(n, longs.entry_idx, longs.exit_idx)
+                - exposure_series(n, shorts.entry_idx, shorts.exit_idx))
+    assert np.array_equal(curve.exposure, expected)
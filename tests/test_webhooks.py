@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import api.b2c_endpoints as b2c
+from engine import webhooks
+from engine.webhooks import WebhookDispatcher, WebhookStore, diff_signal, match_events
+
+
+@pytest.fixture
+def receiver():
+    """Stand-in subscriber: /ok accepts, /flaky fails twice, /down always returns 503."""
+    received, hits, lock = [], {}, threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is exercised
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                hits[self.path] = hits.get(self.path, 0) + 1
+                count = hits[self.path]
+            ok = self.path == "/ok" or (self.path == "/flaky" and count > 2)
+            if ok:
+                with lock:
+                    received.append((self.path, body))
+            self.send_response(200 if ok else 503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", received, hits
+    server.shutdown()
+
+
+@pytest.fixture
+def dispatcher(tmp_path):
+    store = WebhookStore(tmp_path / "webhooks.db")
+    d = WebhookDispatcher(store, workers=8, max_attempts=3, backoff=0.01, price_alert_pct=5.0)
+    webhooks.set_webhooks(store, d)
+    d.start()
+    yield d
+    webhooks.set_webhooks(None)
+
+
+def _computed(signal, confidence, as_of, close=100.0, prev_close=100.0):
+    return {"as_of": as_of, "close": close, "prev_close": prev_close,
+            "decision": {"signal": signal, "score": 1.0, "confidence": confidence}}
+
+
+def _state(signal, confidence, as_of, close=100.0, prev_close=100.0):
+    return webhooks.signal_state("BBCA", _computed(signal, confidence, as_of, close, prev_close))
+
+
+def test_diff_and_match():
+    assert diff_signal(None, _state("HOLD", 0.5, "2026-01-02")) is None
+    assert diff_signal(_state("HOLD", 0.5, "2026-01-02"), _state("BUY", 0.8, "2026-01-01")) is None  # stale
+    assert diff_signal(_state("HOLD", 0.5, "2026-01-02"), _state("HOLD", 0.5, "2026-01-02")) is None
+
+    change = diff_signal(_state("HOLD", 0.6, "2026-01-02"), _state("BUY", 0.8, "2026-01-05", close=107))
+    sub = {"id": "wh_1", "conditions": ["signal_change", "price_alert", "min_confidence"], "min_confidence": 70}
+    assert match_events(change, sub, 5.0) == ["signal_change", "price_alert", "min_confidence"]
+    # Below the subscriber's confidence bar: only the price move is reported
+    assert match_events(change, {**sub, "min_confidence": 90}, 5.0) == ["price_alert"]
+
+
+def test_fanout_delivery_retry_and_dead_letter(dispatcher, receiver):
+    url, received, hits = receiver
+    store = dispatcher.store
+    subs = [store.register(f"{url}/ok", ["BBCA"], ["signal_change"]) for _ in range(200)]
+    flaky = store.register(f"{url}/flaky", ["bbca"], ["signal_change"])
+    down = store.register(f"{url}/down", ["BBCA"], ["signal_change"])
+    store.register(f"{url}/ok", ["BBRI"], ["signal_change"])
+
+    webhooks.notify_signal("BBCA", _computed("HOLD", 0.5, "2026-01-02"))  # first sighting: baseline only
+    webhooks.notify_signal("BBCA", _computed("BUY", 0.7, "2026-01-05"))
+    assert dispatcher.drain(30)
+
+    assert len([r for r in received if r[0] == "/ok"]) == len(subs)
+    assert hits["/flaky"] == 3 and any(r[0] == "/flaky" for r in received)
+    assert hits["/down"] == 3
+    payload = received[0][1]
+    assert (payload["event"], payload["old_signal"], payload["new_signal"]) == ("signal_change", "HOLD", "BUY")
+    assert payload["confidence"] == 70.0
+
+    dead = store.dead_letters()
+    assert [d["webhook_id"] for d in dead] == [down["id"]] and dead[0]["error"] == "HTTP 503"
+    stats = dispatcher.stats()
+    assert stats["delivered"] == len(subs) + 1 and stats["dead_lettered"] == 1
+    assert store.last_signal("BBCA")["signal"] == "BUY"
+    assert flaky["tickers"] == ["BBCA"]
+
+
+def test_register_endpoint_persists(dispatcher):
+    app = FastAPI()
+    b2c.setup_b2c_routes(app)
+    transport = httpx.ASGITransport(app=app)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            bad = await client.post("/api/v2/webhook/register", json={
+                "webhook_url": "http://example.invalid/hook", "tickers": ["BBCA"], "alert_conditions": ["moon"]})
+            created = (await client.post("/api/v2/webhook/register", json={
+                "webhook_url": "http://example.invalid/hook", "tickers": ["bbca", "BBRI"]})).json()
+            fetched = (await client.get(f"/api/v2/webhook/{created['webhook_id']}")).json()
+            deleted = await client.delete(f"/api/v2/webhook/{created['webhook_id']}")
+            missing = await client.get(f"/api/v2/webhook/{created['webhook_id']}")
+            return bad, created, fetched, deleted, missing
+
+    bad, created, fetched, deleted, missing = asyncio.run(run())
+    assert bad.status_code == 400
+    assert created["monitored_tickers"] == ["BBCA", "BBRI"]
+    assert fetched["conditions"] == ["signal_change", "price_alert"] and fetched["dead_letters"] == []
+    assert deleted.status_code == 200 and missing.status_code == 404
+    assert dispatcher.store.subscribers("BBCA") == []